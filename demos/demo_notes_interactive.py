@@ -13,12 +13,18 @@ Fecha: 2025
 
 import sqlite3
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from notes_index import ensure_notes_fts, search_notes
+
 class NotesDemo:
     def __init__(self):
         self.conn = sqlite3.connect('angie_data.db')
         self.cursor = self.conn.cursor()
+        ensure_notes_fts(self.conn)
         
     def display_menu(self):
         """Mostrar menú principal"""
@@ -109,14 +115,7 @@ class NotesDemo:
             print("⚠️ Término de búsqueda vacío")
             return
             
-        self.cursor.execute('''
-            SELECT id, title, content, created_date 
-            FROM notes 
-            WHERE title LIKE ? OR content LIKE ?
-            ORDER BY modified_date DESC
-        ''', (f'%{search_term}%', f'%{search_term}%'))
-        
-        results = self.cursor.fetchall()
+        results = [row[:4] for row in search_notes(self.conn, search_term)]
         
         if not results:
             print(f"❌ No se encontraron notas con '{search_term}'")
@@ -202,11 +201,7 @@ class NotesDemo:
             search_term = command.replace("buscar nota", "").strip()
             if search_term:
                 print(f"🔍 Buscando: {search_term}")
-                self.cursor.execute('''
-                    SELECT title, content FROM notes 
-                    WHERE title LIKE ? OR content LIKE ?
-                ''', (f'%{search_term}%', f'%{search_term}%'))
-                results = self.cursor.fetchall()
+                results = [row[1:3] for row in search_notes(self.conn, search_term)]
                 
                 if results:
                     print(f"✅ {len(results)} resultado(s) encontrado(s)")
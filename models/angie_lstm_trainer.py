@@ -9,7 +9,6 @@ import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout, Embedding
 from tensorflow.keras.preprocessing.text import Tokenizer
-from tensorflow.keras.preprocessing.sequence import pad_sequences
 from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
 import pickle
 import json
@@ -18,19 +17,37 @@ from datetime import datetime
 import sqlite3
 import re
 from collections import Counter
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from command_journal import iter_batches, training_entries
+from database import get_database
+from fast_classifier import HashedNaiveBayes, load_fast_classifier
+from incremental_training import (advance_state, drift_report, full_retrain_reason, load_training_state,
+                                  new_state, save_training_state)
+from text_vectorizer import TextVectorizer
+from training_shards import ShardCache, bucketed_batches, iter_interaction_chunks
+
+JOURNAL_PATH = os.path.join(PROJECT_ROOT, 'data', 'command_journal.jsonl')
+
 class AngieLSTMTrainer:
-    def __init__(self, db_path='angie_data.db', max_words=1000, max_len=50):
+    def __init__(self, db_path='angie_data.db', max_words=1000, max_len=50, oov_buckets=64):
         self.db_path = db_path
         self.max_words = max_words
         self.max_len = max_len
+        # Índices reservados para palabras nuevas: el ajuste incremental no necesita rehacer el vocabulario
+        self.oov_buckets = oov_buckets
         self.tokenizer = Tokenizer(num_words=max_words, oov_token='<OOV>')
         self.label_encoder = LabelEncoder()
         self.scaler = StandardScaler()
         self.model = None
         self.history = None
+        # Copia en NumPy del tokenizer para codificar sin Keras; se rehace al ajustar o cargar
+        self._vectorizer = None
         
         # Configurar matplotlib para mejor visualización
         plt.style.use('seaborn-v0_8')
@@ -57,6 +74,9 @@ class AngieLSTMTrainer:
             df = pd.read_sql_query("SELECT * FROM interactions", conn)
             conn.close()
             
+            if df.empty:
+                df = self.load_journal_data()
+            
             if df.empty:
                 print("No hay datos de interacciones. Generando datos de ejemplo...")
                 df = self.generate_sample_data()
@@ -67,6 +87,21 @@ class AngieLSTMTrainer:
             print(f"Error cargando datos: {e}")
             return self.generate_sample_data()
     
+    def load_journal_data(self, journal_path=JOURNAL_PATH):
+        """Cargar comandos etiquetados del diario de comandos, por lotes"""
+        frames = []
+        for batch in iter_batches(e for e in training_entries(journal_path) if e.get('intent')):
+            frames.append(pd.DataFrame({
+                'user_input': [e['command'] for e in batch],
+                'assistant_response': [e['response'] for e in batch],
+                'command_type': [e['intent'] for e in batch],
+                'timestamp': [e['ts'] for e in batch],
+            }))
+        if not frames:
+            return pd.DataFrame()
+        print(f"📒 Usando el diario de comandos ({sum(len(f) for f in frames)} entradas)")
+        return pd.concat(frames, ignore_index=True)
+    
     def generate_sample_data(self):
         """Generar datos de ejemplo para demostración"""
         sample_data = {
@@ -122,16 +157,30 @@ class AngieLSTMTrainer:
         # Limpiar texto
         df['user_input_clean'] = df['user_input'].apply(self.clean_text)
         
-        # Tokenizar texto
+        # Tokenizar texto con un vocabulario nuevo: el de load_model ya tiene contadas las filas antiguas
+        self.tokenizer = Tokenizer(num_words=self.max_words, oov_token='<OOV>')
         self.tokenizer.fit_on_texts(df['user_input_clean'])
-        sequences = self.tokenizer.texts_to_sequences(df['user_input_clean'])
-        X = pad_sequences(sequences, maxlen=self.max_len)
+        self._vectorizer = None
+        X = self.encode_texts(df['user_input'].tolist())
         
         # Codificar etiquetas
         y = self.label_encoder.fit_transform(df['command_type'])
         
         return X, y, df['command_type'].unique()
     
+    def train_fast_classifier(self, df, filename='angie_fast_classifier.npz'):
+        """Entrenar y guardar el clasificador rápido (nivel previo al LSTM); devuelve su precisión"""
+        texts = df['user_input'].tolist()
+        labels = df['command_type'].astype(str).tolist()
+        if len(texts) >= 10:
+            X_train, X_test, y_train, y_test = train_test_split(texts, labels, test_size=0.2, random_state=42)
+            accuracy = HashedNaiveBayes().fit(X_train, y_train).accuracy(X_test, y_test)
+        else:
+            accuracy = HashedNaiveBayes().fit(texts, labels).accuracy(texts, labels)
+        # El modelo guardado usa todos los datos
+        HashedNaiveBayes().fit(texts, labels).save(filename)
+        return accuracy
+    
     def clean_text(self, text):
         """Limpiar y normalizar texto"""
         text = text.lower()
@@ -139,10 +188,14 @@ class AngieLSTMTrainer:
         text = re.sub(r'\s+', ' ', text).strip()
         return text
     
-    def create_lstm_model(self, num_classes, vocab_size):
-        """Crear modelo LSTM con 2-3 capas"""
+    def create_lstm_model(self, num_classes, vocab_size, input_length='max_len'):
+        """Crear modelo LSTM con 2-3 capas (input_length=None admite lotes de longitud variable)"""
+        if input_length == 'max_len':
+            input_length = self.max_len
         model = Sequential([
-            Embedding(vocab_size, 128, input_length=self.max_len),
+            # Con la máscara el relleno no cuenta: da igual rellenar hasta el máximo del lote
+            # (entrenamiento por cubos) que hasta max_len (inferencia)
+            Embedding(vocab_size, 128, input_length=input_length, mask_zero=True),
             LSTM(128, return_sequences=True, dropout=0.2),
             LSTM(64, return_sequences=True, dropout=0.2),
             LSTM(32, dropout=0.2),
@@ -167,7 +220,7 @@ class AngieLSTMTrainer:
         )
         
         # Crear modelo
-        vocab_size = len(self.tokenizer.word_index) + 1
+        vocab_size = self.vectorizer.vocab_size
         num_classes = len(np.unique(y))
         self.model = self.create_lstm_model(num_classes, vocab_size)
         
@@ -378,6 +431,9 @@ class AngieLSTMTrainer:
     def save_model(self, filename='angie_lstm_model'):
         """Guardar modelo entrenado"""
         if self.model is not None:
+            # El .tflite anterior no corresponde al vocabulario nuevo: fuera antes de reescribirlo,
+            # para que el servidor no los combine (export_tflite escribe el nuevo después)
+            self.remove_tflite(filename)
             # Guardar modelo
             self.model.save(f'{filename}.h5')
             
@@ -387,9 +443,73 @@ class AngieLSTMTrainer:
             
             with open(f'{filename}_label_encoder.pkl', 'wb') as f:
                 pickle.dump(self.label_encoder, f)
+            self.export_vocabulary(filename)
             
             print(f"Modelo guardado como {filename}.h5")
     
+    def export_vocabulary(self, filename='angie_lstm_model'):
+        """Guardar tokenizer y etiquetas en JSON para predecir sin Keras"""
+        self.vectorizer.save(f'{filename}_vocab.json',
+                             classes=[str(c) for c in self.label_encoder.classes_])
+    
+    def export_tflite(self, filename='angie_lstm_model', quantize=False):
+        """Exportar el modelo a TensorFlow Lite (con quantize, pesos en int8) junto a su vocabulario"""
+        if self.model is None:
+            raise RuntimeError("No hay modelo entrenado para exportar")
+        # Si la conversión o la comprobación fallan no queda un .tflite viejo: el servidor usa Keras
+        self.remove_tflite(filename)
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        if quantize:
+            # Cuantización de rango dinámico: pesos int8, entradas/salidas en float
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        tflite_model = converter.convert()
+        self.check_tflite_parity(tflite_model, tolerance=0.1 if quantize else 1e-3)
+        # Primero el vocabulario y luego el modelo, cada uno con os.replace: el .tflite solo
+        # aparece cuando su vocabulario ya está completo en disco
+        self.export_vocabulary(filename)
+        tmp = f'{filename}.tflite.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(tflite_model)
+        os.replace(tmp, f'{filename}.tflite')
+        print(f"Modelo exportado como {filename}.tflite ({len(tflite_model) / 1024:.0f} KB)")
+    
+    def remove_tflite(self, filename='angie_lstm_model'):
+        if os.path.exists(f'{filename}.tflite'):
+            os.remove(f'{filename}.tflite')
+    
+    def check_tflite_parity(self, tflite_model, samples=32, tolerance=1e-3, seed=0):
+        """Comparar el modelo convertido con el de Keras en secuencias de longitudes variadas;
+        si la conversión perdió la máscara, las cortas (mucho relleno) no coinciden"""
+        rng = np.random.default_rng(seed)
+        vocab_size = self.model.layers[0].input_dim
+        X = np.zeros((samples, self.max_len), dtype=np.int32)
+        for row, length in enumerate(rng.integers(1, self.max_len + 1, size=samples)):
+            X[row, self.max_len - length:] = rng.integers(1, vocab_size, size=length)
+        expected = np.asarray(self.model.predict_on_batch(X))
+        interpreter = tf.lite.Interpreter(model_content=tflite_model)
+        input_details = interpreter.get_input_details()[0]
+        interpreter.resize_tensor_input(input_details['index'], X.shape)
+        interpreter.allocate_tensors()
+        interpreter.set_tensor(input_details['index'], X.astype(input_details['dtype']))
+        interpreter.invoke()
+        got = interpreter.get_tensor(interpreter.get_output_details()[0]['index'])
+        difference = float(np.abs(got - expected).max())
+        if difference > tolerance:
+            raise RuntimeError(f"El modelo TFLite no coincide con el de Keras (diferencia {difference:.3f})")
+        return difference
+    
+    def load_vocabulary(self, filename='angie_lstm_model'):
+        """Cargar solo el tokenizer guardado junto al modelo; False si no hay"""
+        try:
+            with open(f'{filename}_tokenizer.pkl', 'rb') as f:
+                self.tokenizer = pickle.load(f)
+        except (OSError, pickle.UnpicklingError):
+            return False
+        vocab_path = f'{filename}_vocab.json'
+        self.oov_buckets = TextVectorizer.load(vocab_path).oov_buckets if os.path.exists(vocab_path) else 0
+        self._vectorizer = None
+        return True
+    
     def load_model(self, filename='angie_lstm_model'):
         """Cargar modelo entrenado"""
         try:
@@ -397,6 +517,10 @@ class AngieLSTMTrainer:
             
             with open(f'{filename}_tokenizer.pkl', 'rb') as f:
                 self.tokenizer = pickle.load(f)
+            self._vectorizer = None
+            # Los modelos anteriores a los cubos OOV no tienen vocabulario JSON
+            vocab_path = f'{filename}_vocab.json'
+            self.oov_buckets = TextVectorizer.load(vocab_path).oov_buckets if os.path.exists(vocab_path) else 0
             
             with open(f'{filename}_label_encoder.pkl', 'rb') as f:
                 self.label_encoder = pickle.load(f)
@@ -407,15 +531,24 @@ class AngieLSTMTrainer:
             print(f"Error cargando modelo: {e}")
             return False
     
+    @property
+    def vectorizer(self):
+        if self._vectorizer is None:
+            self._vectorizer = TextVectorizer.from_keras(self.tokenizer, self.max_len, clean=True,
+                                                         oov_buckets=self.oov_buckets)
+        return self._vectorizer
+    
+    def encode_texts(self, texts):
+        """Limpiar, tokenizar y rellenar un lote de textos (en NumPy, sin Keras)"""
+        return self.vectorizer.encode(texts)
+    
     def predict_command_type(self, text):
         """Predecir tipo de comando para nuevo texto"""
         if self.model is None:
             return "Modelo no entrenado"
         
         # Preprocesar texto
-        clean_text = self.clean_text(text)
-        sequence = self.tokenizer.texts_to_sequences([clean_text])
-        padded = pad_sequences(sequence, maxlen=self.max_len)
+        padded = self.encode_texts([text])
         
         # Predecir
         prediction = self.model.predict(padded)
@@ -428,7 +561,7 @@ class AngieLSTMTrainer:
             'all_probabilities': dict(zip(self.label_encoder.classes_, prediction[0]))
         }
     
-    def run_full_training(self):
+    def run_full_training(self, filename='angie_lstm_model', fast_path='angie_fast_classifier.npz'):
         """Ejecutar entrenamiento completo con visualizaciones"""
         print("🚀 Iniciando entrenamiento LSTM para Angie...")
         
@@ -442,6 +575,11 @@ class AngieLSTMTrainer:
         X, y, unique_commands = self.preprocess_data(df)
         print(f"✅ Datos preprocesados. Comandos únicos: {unique_commands}")
         
+        # Clasificador rápido
+        print("⚡ Entrenando clasificador rápido...")
+        fast_accuracy = self.train_fast_classifier(df, fast_path)
+        print(f"✅ Clasificador rápido entrenado. Precisión: {fast_accuracy:.4f}")
+        
         # Entrenar
         print("🧠 Entrenando modelo LSTM...")
         X_test, y_test, y_pred, accuracy = self.train_model(X, y)
@@ -450,10 +588,19 @@ class AngieLSTMTrainer:
         # Generar visualizaciones
         print("📈 Generando visualizaciones...")
         results = self.generate_training_visualizations(X_test, y_test, y_pred, accuracy, df)
+        results['fast_accuracy'] = fast_accuracy
         
         # Guardar modelo
         print("💾 Guardando modelo...")
-        self.save_model()
+        self.save_model(filename)
+        try:
+            self.export_tflite(filename, quantize=True)
+        except Exception as e:
+            print(f"⚠️ No se pudo exportar a TensorFlow Lite: {e}")
+        
+        # Marca de agua para los siguientes entrenamientos incrementales
+        last_id = int(df['id'].max()) if 'id' in df.columns and len(df) else 0
+        save_training_state(filename, new_state(last_id, df['command_type'].tolist()))
         
         print("🎉 ¡Entrenamiento completado exitosamente!")
         print(f"📁 Visualizaciones guardadas en: training_plots/")
@@ -461,7 +608,142 @@ class AngieLSTMTrainer:
         
         return results
 
+    def load_new_interactions(self, last_id):
+        """Interacciones con id mayor que la marca de agua"""
+        rows = get_database(self.db_path).query(
+            "SELECT id, user_input, command_type FROM interactions WHERE id > ? ORDER BY id", (last_id,))
+        return pd.DataFrame(rows, columns=['id', 'user_input', 'command_type'])
+    
+    def load_replay_sample(self, last_id, size, seed=None):
+        """Muestra aleatoria de interacciones ya vistas (por id, sin recorrer la tabla)"""
+        if last_id <= 0 or size <= 0:
+            return pd.DataFrame(columns=['id', 'user_input', 'command_type'])
+        rng = np.random.default_rng(seed)
+        # Sin materializar todos los ids: choice sobre un entero muestrea de range(last_id)
+        ids = (rng.choice(last_id, size=min(size, last_id), replace=False) + 1).tolist()
+        db = get_database(self.db_path)
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows += db.query(f"SELECT id, user_input, command_type FROM interactions "
+                             f"WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+        return pd.DataFrame(rows, columns=['id', 'user_input', 'command_type'])
+    
+    def run_incremental_training(self, filename='angie_lstm_model', min_new_rows=50, epochs=5,
+                                 replay_ratio=1.0, fast_path='angie_fast_classifier.npz'):
+        """Ajustar el modelo guardado solo con las interacciones nuevas; reentrena desde cero
+        si no hay modelo previo o las métricas de deriva lo piden"""
+        state = load_training_state(filename)
+        if state is None or not self.load_model(filename):
+            print("🔁 Sin modelo o estado previo: entrenamiento completo")
+            return dict(self.run_full_training(filename, fast_path), mode='full', reason='sin modelo previo')
+        
+        new_rows = self.load_new_interactions(state['last_id'])
+        if len(new_rows) < min_new_rows:
+            print(f"⏭️ Solo {len(new_rows)} interacciones nuevas: no se reentrena")
+            return {'mode': 'skipped', 'new_rows': len(new_rows)}
+        
+        texts = new_rows['user_input'].tolist()
+        labels = new_rows['command_type'].astype(str).tolist()
+        report = drift_report(state, texts, labels, self.vectorizer, self.label_encoder.classes_)
+        reason = full_retrain_reason(report)
+        print(f"📐 Deriva: {report}")
+        if reason:
+            print(f"🔁 Entrenamiento completo: {reason}")
+            return dict(self.run_full_training(filename, fast_path), mode='full', reason=reason, drift=report)
+        
+        # Filas nuevas más una muestra igual de antiguas para no olvidar lo aprendido
+        replay = self.load_replay_sample(state['last_id'], int(len(new_rows) * replay_ratio))
+        replay = replay[replay['command_type'].astype(str).isin(self.label_encoder.classes_)]
+        batch = pd.concat([new_rows, replay], ignore_index=True)
+        X = self.encode_texts(batch['user_input'].tolist())
+        y = self.label_encoder.transform(batch['command_type'].astype(str))
+        print(f"🧠 Ajuste incremental con {len(new_rows)} filas nuevas y {len(replay)} de repaso...")
+        self.history = self.model.fit(X, y, epochs=epochs, batch_size=32, verbose=0)
+        accuracy = float(self.history.history['accuracy'][-1])
+        
+        self.save_model(filename)
+        try:
+            self.export_tflite(filename, quantize=True)
+        except Exception as e:
+            print(f"⚠️ No se pudo exportar a TensorFlow Lite: {e}")
+        fast = load_fast_classifier(fast_path)
+        if fast is not None:
+            fast.partial_fit(texts, labels).save(fast_path)
+        
+        save_training_state(filename, advance_state(state, new_rows['id'].max(), labels))
+        print(f"✅ Ajuste incremental completado. Precisión: {accuracy:.2%}")
+        return {'mode': 'incremental', 'accuracy': accuracy, 'new_rows': len(new_rows), 'drift': report}
+
+    def make_dataset(self, cache, subset, batch_size=64, shuffle_buffer=10000):
+        """tf.data a partir de los fragmentos: lotes por longitud, relleno dinámico y prefetch"""
+        def batches():
+            return bucketed_batches(cache.iter_examples(subset), batch_size,
+                                    shuffle_buffer=shuffle_buffer if subset == 'train' else 0)
+        dataset = tf.data.Dataset.from_generator(batches, output_signature=(
+            tf.TensorSpec(shape=(None, None), dtype=tf.int32),
+            tf.TensorSpec(shape=(None,), dtype=tf.int32),
+        ))
+        return dataset.prefetch(tf.data.AUTOTUNE)
+    
+    def run_streaming_training(self, epochs=20, batch_size=64, chunk_size=5000, workers=None,
+                               cache_dir='training_cache', filename='angie_lstm_model', rebuild_vocabulary=False):
+        """Entrenamiento completo con memoria acotada: interactions por trozos, fragmentos
+        codificados en disco y tf.data en lugar de DataFrames y matrices completas.
+        Se reutiliza el vocabulario guardado (las palabras nuevas van a los cubos OOV) para que los
+        fragmentos ya codificados sigan valiendo; rebuild_vocabulary=True lo vuelve a ajustar"""
+        db = get_database(self.db_path)
+        classes = [row[0] for row in db.query(
+            "SELECT DISTINCT command_type FROM interactions WHERE command_type IS NOT NULL ORDER BY command_type")]
+        if len(classes) < 2:
+            print("⚠️ Se necesitan al menos dos tipos de comando; se usa el entrenamiento completo")
+            return self.run_full_training(filename)
+        self.label_encoder.fit(classes)
+        
+        if rebuild_vocabulary or not self.load_vocabulary(filename):
+            print("🔤 Construyendo vocabulario por trozos...")
+            self.tokenizer = Tokenizer(num_words=self.max_words, oov_token='<OOV>')
+            self.tokenizer.fit_on_texts(self.clean_text(row[1])
+                                        for chunk in iter_interaction_chunks(db, chunk_size) for row in chunk)
+            self._vectorizer = None
+        else:
+            print("🔤 Vocabulario guardado reutilizado (--rebuild-vocab para ajustarlo de nuevo)")
+        
+        print("📦 Codificando fragmentos...")
+        cache = ShardCache(cache_dir)
+        encoded = cache.build(db, self.vectorizer, self.label_encoder.classes_, chunk_size, workers)
+        print(f"✅ {encoded} filas codificadas ({cache.rows} en {len(cache.manifest['shards'])} fragmentos)")
+        
+        # Longitud variable para el relleno dinámico; luego los pesos pasan a un modelo de longitud fija
+        model = self.create_lstm_model(len(classes), self.vectorizer.vocab_size, input_length=None)
+        self.history = model.fit(
+            self.make_dataset(cache, 'train', batch_size),
+            validation_data=self.make_dataset(cache, 'val', batch_size),
+            epochs=epochs,
+            callbacks=[EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True)],
+            verbose=1
+        )
+        self.model = self.create_lstm_model(len(classes), self.vectorizer.vocab_size)
+        self.model.set_weights(model.get_weights())
+        history = self.history.history
+        accuracy = float(history.get('val_accuracy', history['accuracy'])[-1])
+        
+        self.save_model(filename)
+        try:
+            self.export_tflite(filename, quantize=True)
+        except Exception as e:
+            print(f"⚠️ No se pudo exportar a TensorFlow Lite: {e}")
+        save_training_state(filename, new_state(cache.manifest['last_id'],
+                                                label_counts=cache.manifest['label_counts']))
+        print(f"✅ Entrenamiento por streaming completado. Precisión de validación: {accuracy:.2%}")
+        return {'mode': 'streaming', 'accuracy': accuracy, 'rows': cache.rows}
+
 if __name__ == "__main__":
-    # Ejecutar entrenamiento completo
     trainer = AngieLSTMTrainer()
-    results = trainer.run_full_training()
+    if '--incremental' in sys.argv:
+        results = trainer.run_incremental_training()
+    elif '--streaming' in sys.argv:
+        results = trainer.run_streaming_training(rebuild_vocabulary='--rebuild-vocab' in sys.argv)
+    else:
+        # Ejecutar entrenamiento completo
+        results = trainer.run_full_training()
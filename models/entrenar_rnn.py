@@ -1,33 +1,63 @@
-import pandas as pd
 import numpy as np
+import tensorflow as tf
 from tensorflow.keras.preprocessing.text import Tokenizer
-from tensorflow.keras.preprocessing.sequence import pad_sequences
-from tensorflow.keras.utils import to_categorical
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Embedding, SimpleRNN, TimeDistributed, Dense
-from sklearn.model_selection import train_test_split
 import pickle
+import os
+import sys
 
-df = pd.read_csv('historial_comandos.csv', header=None, names=['fecha', 'comando', 'respuesta'])
-comandos = df['comando'].astype(str).values
-respuestas = df['respuesta'].astype(str).values
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from command_journal import iter_batches, training_entries
+from text_vectorizer import TextVectorizer
+
+# Diario de comandos de Angie (y el CSV de la versión anterior, si existe)
+JOURNAL = os.path.join(ROOT, 'data', 'command_journal.jsonl')
+LEGACY_CSV = os.path.join(ROOT, 'data', 'historial_comandos.csv')
 
 num_palabras = 2000
 maxlen = 20
+batch_size = 8
+# Una de cada VALIDATION_EVERY entradas va a validación (el 20 % de antes, sin mezclar en memoria)
+VALIDATION_EVERY = 5
 
-tokenizer = Tokenizer(num_words=num_palabras, oov_token='<OOV>')
-tokenizer.fit_on_texts(np.concatenate((comandos, respuestas)))
+def entries(journal=JOURNAL, legacy_csv=LEGACY_CSV):
+    return training_entries(journal, legacy_csv)
 
-X = tokenizer.texts_to_sequences(comandos)
-X = pad_sequences(X, maxlen=maxlen, padding='post')
+def texts(source):
+    for entry in source:
+        yield entry['command']
+        yield entry['response']
 
-y = tokenizer.texts_to_sequences(respuestas)
-y = pad_sequences(y, maxlen=maxlen, padding='post')
+def fit_vectorizer(source):
+    """Vocabulario en una pasada por el historial; devuelve el Tokenizer y su vectorizador"""
+    tokenizer = Tokenizer(num_words=num_palabras, oov_token='<OOV>')
+    tokenizer.fit_on_texts(texts(source))
+    return tokenizer, TextVectorizer.from_keras(tokenizer, maxlen, padding='post')
 
-# Convertir a one-hot
-y_cat = to_categorical(y, num_classes=num_palabras)
+def target_weights(y):
+    """Peso 1 para las palabras de la respuesta y el primer relleno (marca de fin), 0 para el resto del relleno"""
+    return (np.cumsum(y == 0, axis=1) <= 1).astype(np.float32)
 
-X_train, X_test, y_train, y_test = train_test_split(X, y_cat, test_size=0.2, random_state=42)
+def encoded_batches(source, vectorizer, subset='train', validation_every=VALIDATION_EVERY):
+    """(X, y, pesos) por trozos del historial: y son índices enteros, no vectores one-hot"""
+    for batch in iter_batches(e for i, e in enumerate(source) if (i % validation_every == 0) == (subset == 'val')):
+        X = vectorizer.encode([e['command'] for e in batch])
+        y = vectorizer.encode([e['response'] for e in batch])
+        yield X, y, target_weights(y)
+
+def make_dataset(source_fn, vectorizer, subset='train', shuffle_buffer=10000):
+    """tf.data que vuelve a leer el historial en cada época; source_fn() da un iterador nuevo"""
+    spec = tf.TensorSpec(shape=(None, maxlen), dtype=tf.int32)
+    dataset = tf.data.Dataset.from_generator(
+        lambda: encoded_batches(source_fn(), vectorizer, subset),
+        output_signature=(spec, spec, tf.TensorSpec(shape=(None, maxlen), dtype=tf.float32)))
+    dataset = dataset.unbatch()
+    if subset == 'train' and shuffle_buffer:
+        dataset = dataset.shuffle(shuffle_buffer)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
 
 def build_model():
     model = Sequential([
@@ -35,14 +65,24 @@ def build_model():
         SimpleRNN(64, return_sequences=True),
         TimeDistributed(Dense(num_palabras, activation='softmax'))
     ])
-    model.compile(loss='categorical_crossentropy', optimizer='adam', metrics=['accuracy'])
+    # Objetivos enteros: la pérdida indexa la probabilidad de la palabra correcta sin materializar one-hot;
+    # los pesos por paso quitan el relleno de la pérdida y de la precisión
+    model.compile(loss='sparse_categorical_crossentropy', optimizer='adam', weighted_metrics=['accuracy'])
     return model
 
-model = build_model()
+def main(epochs=30):
+    tokenizer, vectorizer = fit_vectorizer(entries())
+
+    model = build_model()
+    model.fit(make_dataset(entries, vectorizer, 'train'), epochs=epochs,
+              validation_data=make_dataset(entries, vectorizer, 'val'))
 
-model.fit(X_train, y_train, epochs=30, batch_size=8, validation_data=(X_test, y_test))
+    model.save('modelo_rnn_comandos.h5')
+    with open('tokenizer.pickle', 'wb') as handle:
+        pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    # Vocabulario en JSON para que asistente_rnn no necesite el Tokenizer de Keras
+    vectorizer.save('tokenizer_vocab.json')
+    print('Entrenamiento finalizado y modelo guardado.')
 
-model.save('modelo_rnn_comandos.h5')
-with open('tokenizer.pickle', 'wb') as handle:
-    pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
-print('Entrenamiento finalizado y modelo guardado.')
+if __name__ == "__main__":
+    main()
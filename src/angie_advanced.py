@@ -1,32 +1,52 @@
-import speech_recognition as sr
-import pyttsx3
-import pywhatkit
 import datetime
-import google.generativeai as genai
 from dotenv import load_dotenv
 import os
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-import spoty
+from lazy_imports import PROCESS_START, lazy_import, preload, startup_report, timed_import
 import time
-import csv
 from datetime import datetime, timedelta
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
-import requests
-import wikipedia
 import json
-import pyautogui
-from PIL import Image, ImageTk
-import customtkinter as ctk
 import subprocess
 import platform
-import psutil
 import webbrowser
-import sqlite3
-import schedule
-import pyperclip
+with timed_import('speech_recognition'):
+    import speech_recognition as sr
+with timed_import('requests'):
+    import requests
+with timed_import('customtkinter'):
+    import customtkinter as ctk
+
+# Dependencias pesadas: se importan al usarse por primera vez o al calentar tras abrir la ventana
+genai = lazy_import('google.generativeai')
+pyttsx3 = lazy_import('pyttsx3')
+pywhatkit = lazy_import('pywhatkit')
+spoty = lazy_import('spoty')
+pyautogui = lazy_import('pyautogui')
+Image = lazy_import('PIL.Image')
+ImageTk = lazy_import('PIL.ImageTk')
+psutil = lazy_import('psutil')
+schedule = lazy_import('schedule')
+pyperclip = lazy_import('pyperclip')
+DEFERRED_MODULES = [genai, pyttsx3, schedule, psutil, pyperclip, pyautogui, Image, ImageTk, spoty, pywhatkit]
+
+from intent_router import IntentRouter, NEWS_CATEGORY_TABLE, get_default_router, notes_search_term
+from latency_stats import LatencyStats
+from voice_listener import PersistentListener
+from wake_word import WakeWordDetector
+from speech_worker import SpeechWorker, URGENT, NORMAL, BACKGROUND
+from gemini_stream import stream_reply
+from response_cache import ResponseCache
+from http_client import INTERACTIVE_TIMEOUT, first_usable, get_http_client
+from weather_cache import WeatherCache, WeatherError
+from news_cache import NewsCache, NewsPrefetcher, has_articles
+from wiki_lookup import WikiLookup
+from notes_index import search_notes
+from database import get_database
+from command_journal import CommandJournal
 
 # Configurar CustomTkinter
 ctk.set_appearance_mode("dark")
@@ -38,6 +58,25 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
 DEFAULT_CITY = os.getenv("DEFAULT_CITY", "Madrid")
+GEMINI_STREAMING = os.getenv("GEMINI_STREAMING", "1") != "0"
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "600"))
+NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", "900"))
+NEWS_PREFETCH_MINUTES = int(os.getenv("NEWS_PREFETCH_MINUTES", "360"))
+# "lazy": ventana primero y servicios en segundo plano; "eager": todo antes de la ventana (como antes)
+STARTUP_MODE = os.getenv("ANGIE_STARTUP", "lazy")
+
+# Categorías de NewsAPI con su nombre en español
+NEWS_CATEGORY_NAMES = {
+    "general": "generales",
+    "business": "negocios", 
+    "entertainment": "entretenimiento",
+    "health": "salud",
+    "science": "ciencia", 
+    "sports": "deportes",
+    "technology": "tecnología"
+}
+# Países a consultar, ordenados por probabilidad de tener noticias
+NEWS_COUNTRIES = ["us", "gb", "es"]
 
 # Obtener directorio raíz del proyecto
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -53,66 +92,136 @@ class AngieAdvanced:
         self.is_running = False
         self.reminders = []
         self.tasks = []
+        # Funciones a ejecutar al cerrar (p. ej. vaciar búferes de registro)
+        self.shutdown_hooks = []
+        # Funciones a ejecutar en el calentamiento, tras mostrar la ventana (p. ej. cargar modelos)
+        self.warmup_tasks = []
+        self.startup_marks = {}
+        self._warmup_started = False
+        self._warmup_done = False
+        self._warmup_lock = threading.Lock()
+        # Gemini se configura en el calentamiento o en la primera pregunta
+        self._modelo_gemini = None
+        self._gemini_lock = threading.Lock()
+        # Diario de comandos (sustituye a historial_comandos.csv)
+        self.journal = CommandJournal(get_project_path('data', 'command_journal.jsonl'))
+        self.last_reply = None
+        
+        if STARTUP_MODE == "eager":
+            # Todas las dependencias antes de la ventana, para comparar tiempos de arranque
+            self.warm_up()
+        
+        # Crear interfaz antes que los servicios: la ventana no espera a nada pesado
+        self.create_gui()
         
         # Configurar reconocimiento de voz
         self.listener = sr.Recognizer()
-        
-        # Configurar síntesis de voz
-        self.engine = pyttsx3.init()
-        voices = self.engine.getProperty('voices')
-        self.engine.setProperty('voice', voices[0].id)
-        self.engine.setProperty('rate', 150)
-        
-        # Configurar Gemini
-        self.modelo_gemini = self.configurar_gemini()
+        self.voice_listener = PersistentListener(self.listener)
+        self.voice_latency = LatencyStats("Fin de voz → comando")
+        # Detector local de palabra de activación (plantillas: utils/enroll_wake_word.py)
+        self.wake_word = WakeWordDetector(get_project_path('data', 'wake_word_templates.npz'))
+        
+        # Router de intenciones compilado (una sola pasada por comando)
+        self.intent_router = get_default_router()
+        self.news_category_router = IntentRouter(NEWS_CATEGORY_TABLE)
+        self.intent_handlers = self._build_intent_handlers()
+        
+        # Configurar síntesis de voz: un único hilo consume la cola y usa el motor
+        self.speech = SpeechWorker(self.create_tts_engine)
+        self.speech.start()
+        
+        self.gemini_first_sentence = LatencyStats("Gemini → primera frase")
+        self.response_cache = ResponseCache(get_project_path('data', 'response_cache.db'))
+        
+        # Cliente HTTP compartido (pool keep-alive, timeouts y reintentos)
+        self.http = get_http_client()
+        self.weather_cache = WeatherCache(self._fetch_weather, ttl=WEATHER_CACHE_TTL,
+                                          stale_ttl=WEATHER_CACHE_TTL * 6)
+        self.news_cache = NewsCache(get_project_path('data', 'news_cache.db'), self.http,
+                                    NEWS_API_KEY, ttl=NEWS_CACHE_TTL)
+        # Solo se precargan las categorías que el usuario pide (track), no las siete
+        self.news_prefetcher = NewsPrefetcher(self.news_cache, countries=NEWS_COUNTRIES,
+                                              interval=NEWS_PREFETCH_MINUTES * 60)
+        if NEWS_API_KEY and NEWS_API_KEY != "tu_news_api_key_aqui" and NEWS_PREFETCH_MINUTES > 0:
+            self.news_prefetcher.start()
+        self.wiki = WikiLookup(self.http, get_project_path('data', 'wiki_cache.db'), lang="es")
         
         # Configurar base de datos
         self.setup_database()
         
-        # Crear interfaz
-        self.create_gui()
-        
         # Iniciar scheduler para recordatorios
         self.start_scheduler()
         
+    def create_tts_engine(self):
+        """Crear y configurar el motor pyttsx3 (se llama desde el hilo de voz)"""
+        engine = pyttsx3.init()
+        voices = engine.getProperty('voices')
+        engine.setProperty('voice', voices[0].id)
+        engine.setProperty('rate', 150)
+        return engine
+        
     def setup_database(self):
-        """Configurar base de datos SQLite para recordatorios y tareas"""
-        self.conn = sqlite3.connect(get_project_path('data', 'angie_data.db'))
-        self.cursor = self.conn.cursor()
-        
-        # Crear tablas
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS reminders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                datetime TEXT NOT NULL,
-                completed BOOLEAN DEFAULT 0
-            )
-        ''')
-        
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                priority TEXT DEFAULT 'medium',
-                completed BOOLEAN DEFAULT 0,
-                created_date TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Crear tabla para notas
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                created_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                modified_date TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        self.conn.commit()
+        """Configurar base de datos SQLite para recordatorios, tareas y notas"""
+        # Escrituras por un único hilo escritor y lecturas desde un pool (WAL)
+        self.db = get_database(get_project_path('data', 'angie_data.db'))
+        
+    @property
+    def modelo_gemini(self):
+        if self._modelo_gemini is None:
+            with self._gemini_lock:
+                if self._modelo_gemini is None:
+                    self._modelo_gemini = self.configurar_gemini()
+        return self._modelo_gemini
+    
+    def warm_up(self):
+        """Importar las dependencias diferidas, configurar Gemini y ejecutar warmup_tasks"""
+        self._warmup_started = True
+        start = time.perf_counter()
+        for name, error in preload(DEFERRED_MODULES).items():
+            print(f"⚠️ {name} no disponible: {error}")
+        try:
+            self.modelo_gemini
+        except Exception as e:
+            print(f"⚠️ No se pudo configurar Gemini: {e}")
+        index = 0
+        while True:
+            # Las tareas añadidas mientras se calienta también se ejecutan aquí
+            with self._warmup_lock:
+                if index == len(self.warmup_tasks):
+                    self._warmup_done = True
+                    break
+                task = self.warmup_tasks[index]
+            index += 1
+            self._run_warmup_task(task)
+        self.startup_marks['calentamiento'] = time.perf_counter() - start
+    
+    def _run_warmup_task(self, task):
+        try:
+            task()
+        except Exception as e:
+            print(f"⚠️ Error en el calentamiento: {e}")
+    
+    def add_warmup_task(self, task):
+        """Programar una tarea de calentamiento; si el calentamiento ya terminó (p. ej. en modo
+        eager, antes de integrar el LSTM) se ejecuta enseguida en segundo plano"""
+        with self._warmup_lock:
+            if not self._warmup_done:
+                self.warmup_tasks.append(task)
+                return
+        threading.Thread(target=self._run_warmup_task, args=(task,), daemon=True).start()
+    
+    def _on_window_shown(self):
+        """Primera vuelta del bucle de eventos: la ventana ya está en pantalla"""
+        self.startup_marks['ventana'] = time.perf_counter() - PROCESS_START
         
+        def warm_up_and_report():
+            if not self._warmup_started:
+                self.warm_up()
+            for line in startup_report(self.startup_marks):
+                print(line)
+        
+        threading.Thread(target=warm_up_and_report, daemon=True).start()
+    
     def configurar_gemini(self):
         genai.configure(api_key=GEMINI_API_KEY)
         generation_config = {
@@ -276,188 +385,211 @@ class AngieAdvanced:
         self.toggle_button.configure(text="🎤 Activar Angie")
         self.status_label.configure(text="Estado: Desactivado")
         self.info_label.configure(text="Asistente detenido")
+        if self.voice_latency.count:
+            print(f"⏱️ {self.voice_latency.summary()}")
+        if self.wake_word.enrolled:
+            print(f"🔇 Frases descartadas sin llamar al reconocedor: {self.wake_word.rejections} "
+                  f"(aceptadas: {self.wake_word.detections})")
     
     def listen_loop(self):
+        # Un solo stream de micrófono durante toda la sesión de escucha
         while self.is_listening and self.is_running:
             try:
-                with sr.Microphone() as source:
-                    self.listener.adjust_for_ambient_noise(source, duration=0.5)
-                    try:
-                        audio = self.listener.listen(source, timeout=7, phrase_time_limit=8)
-                        rec = self.listener.recognize_google(audio, language='es-ES').lower()
-                        rec_normalizado = rec.replace("á", "a").replace("é", "e").replace("í", "i").replace("ó", "o").replace("ú", "u")
-                        if self.name in rec_normalizado:
-                            rec = rec_normalizado.replace(f"{self.name} ", "")
-                            self.process_command(rec)
-                        else:
-                            self.update_info(f"Di '{self.name.capitalize()}' para activar el asistente")
-                    except sr.WaitTimeoutError:
-                        self.update_info("No se detectó voz, esperando de nuevo...")
-                        continue
-                    except sr.UnknownValueError:
-                        self.update_info("No entendí lo que dijiste. Intenta de nuevo.")
-                        continue
-                    except sr.RequestError as e:
-                        self.update_info(f"Error de conexión: {e}")
+                try:
+                    audio, speech_end = self.voice_listener.listen(timeout=7, phrase_time_limit=8)
+                    # Filtro local: sin palabra de activación no se llama al reconocedor en la nube
+                    if not self.wake_word.detect_audio(audio):
+                        self.update_info(f"Di '{self.name.capitalize()}' para activar el asistente")
                         continue
+                    rec = self.listener.recognize_google(audio, language='es-ES').lower()
+                    rec_normalizado = rec.replace("á", "a").replace("é", "e").replace("í", "i").replace("ó", "o").replace("ú", "u")
+                    if self.name in rec_normalizado:
+                        # Barge-in solo cuando de verdad le hablan a Angie (no con su propia voz
+                        # ni con cualquier ruido); los recordatorios urgentes se conservan
+                        self.speech.interrupt()
+                        rec = rec_normalizado.replace(f"{self.name} ", "")
+                        self.voice_latency.record(time.perf_counter() - speech_end)
+                        self.process_command(rec)
+                    else:
+                        self.update_info(f"Di '{self.name.capitalize()}' para activar el asistente")
+                except sr.WaitTimeoutError:
+                    self.update_info("No se detectó voz, esperando de nuevo...")
+                    continue
+                except sr.UnknownValueError:
+                    self.update_info("No entendí lo que dijiste. Intenta de nuevo.")
+                    continue
+                except sr.RequestError as e:
+                    self.update_info(f"Error de conexión: {e}")
+                    continue
             except Exception as e:
                 if self.is_listening:
                     self.update_info(f"Error: {e}")
+                # Reabrir el dispositivo en la siguiente vuelta
+                self.voice_listener.close()
                 time.sleep(1)
                 continue
+        self.voice_listener.close()
     
     def process_command(self, command):
         self.add_to_chat(f"Tú: {command}")
+        start = time.perf_counter()
+        self.last_reply = None
         
-        # Comandos de música
-        if 'reproduce' in command:
-            if 'spotify' in command:
-                music = command.replace('reproduce en spotify', '').strip()
-                self.speak(f'Reproduciendo {music} en Spotify')
-                self.add_to_chat(f"Angie: Reproduciendo {music} en Spotify")
-                try:
-                    spoty.play(os.getenv("spoty_client_id"), os.getenv("spoty_client_secret"), music)
-                except:
-                    self.add_to_chat("Angie: Error al reproducir en Spotify")
-            else:
-                music = command.replace('reproduce', '').strip()
-                self.speak(f'Reproduciendo {music}')
-                self.add_to_chat(f"Angie: Reproduciendo {music} en YouTube")
-                try:
-                    pywhatkit.playonyt(music)
-                except:
-                    self.add_to_chat("Angie: Error al reproducir en YouTube")
-        
-        # Comandos de tiempo
-        elif "hora" in command:
-            hora = datetime.now().strftime('%I:%M %p')
-            self.speak(f'Son las {hora}')
-            self.add_to_chat(f"Angie: Son las {hora}")
-        
-        # Comandos de clima
-        elif "clima" in command or "tiempo" in command:
-            # Extraer ciudad si se especifica
-            if " en " in command:
-                city = command.split(" en ")[-1].strip()
-                self.get_weather_for_city(city)
-            elif " de " in command:
-                city = command.split(" de ")[-1].strip()
-                self.get_weather_for_city(city)
-            else:
-                self.get_weather()
-        
-        # Comandos de noticias
-        elif "noticias" in command or "noticia" in command:
-            # Detectar categoría específica
-            if "deportes" in command or "deporte" in command:
-                self.get_quick_news_summary("sports")
-            elif "tecnología" in command or "tecnologia" in command:
-                self.get_quick_news_summary("technology")
-            elif "ciencia" in command:
-                self.get_quick_news_summary("science")
-            elif "salud" in command:
-                self.get_quick_news_summary("health")
-            elif "negocios" in command or "economía" in command or "economia" in command:
-                self.get_quick_news_summary("business")
-            elif "entretenimiento" in command:
-                self.get_quick_news_summary("entertainment")
-            else:
-                # Si no se especifica categoría, mostrar ventana completa
-                if "rápidas" in command or "rapidas" in command or "resumen" in command:
-                    self.get_quick_news_summary("general")
-                else:
-                    self.get_news()
-        
-        # Comandos de búsqueda
-        elif "busca" in command or "buscar" in command:
-            query = command.replace("busca", "").replace("buscar", "").strip()
-            if query:
-                self.search_wikipedia(query)
-            else:
-                self.speak("¿Qué quieres que busque?")
-                self.add_to_chat("Angie: ¿Qué quieres que busque en Wikipedia?")
-                self.show_search_window()
-        
-        # Comandos de notas
-        elif "crear nota" in command or "nueva nota" in command or "tomar nota" in command or "anota" in command:
-            self.take_notes()
-        
-        elif "ver notas" in command or "mostrar notas" in command or "mis notas" in command:
-            self.show_all_notes()
-        
-        elif "buscar nota" in command:
-            # Extraer término de búsqueda
-            search_term = command.replace("buscar nota", "").replace("buscar en notas", "").strip()
-            if search_term:
-                self.search_notes_by_voice_command(search_term)
-            else:
-                self.speak("¿Qué quieres buscar en las notas?")
-                self.add_to_chat("Angie: ¿Qué quieres buscar en las notas?")
-        
-        elif "cuántas notas" in command or "resumen de notas" in command:
-            self.get_notes_summary()
-        
-        elif "leer notas" in command:
-            self.read_recent_notes_aloud()
-        
-        # Comandos de notas específicas (legacy - crear nota simple)
-        elif "nota" in command:
-            self.take_notes()
-        
-        # Comandos de captura
-        elif "captura" in command or "screenshot" in command:
-            self.take_screenshot()
-        
-        # Comandos de sistema
-        elif "sistema" in command or "computadora" in command:
-            self.system_info()
-        
-        # Comandos de recordatorios
-        elif "recordatorio" in command or "recordar" in command:
-            self.add_reminder(command)
-        
-        # Comandos de tareas
-        elif "tarea" in command or "agregar tarea" in command:
-            self.add_task(command)
-        
-        # Comandos de navegación
-        elif "abre" in command or "navega" in command:
-            self.open_website(command)
-        
-        # Comandos de cierre
-        elif "descansa" in command or "adiós" in command or "bye" in command:
-            self.speak("¡Hasta luego! Que tengas un buen día")
-            self.add_to_chat("Angie: ¡Hasta luego! Que tengas un buen día")
-            self.stop_listening()
-        
-        elif "ayuda notas" in command or "ayuda de notas" in command:
-            self.show_notes_help()
+        # Un solo recorrido del router compilado elige la intención por prioridad
+        match = self.intent_router.route(command)
+        handler = self.intent_handlers.get(match.name) if match else None
         
+        if handler:
+            handler(command)
         else:
             # Usar Gemini para respuestas generales
-            respuesta = self.chat_with_gemini(command)
-            self.speak(respuesta)
+            respuesta = self.answer_general_question(command)
             self.add_to_chat(f"Angie: {respuesta}")
         
-        self.guardar_historial(command, "Comando procesado")
+        # Última respuesta que Angie mostró para este comando
+        self.guardar_historial(command, self.last_reply or "",
+                               intent=match.name if match else "chat",
+                               latency=time.perf_counter() - start)
+    
+    def _build_intent_handlers(self):
+        """Asociar cada intención de la tabla con su manejador"""
+        return {
+            'music': self._handle_music,
+            'time': self._handle_time,
+            'weather': self._handle_weather,
+            'news': self._handle_news,
+            'search': self._handle_search,
+            'notes_create': lambda command: self.take_notes(),
+            'notes_show': lambda command: self.show_all_notes(),
+            'notes_search': self._handle_notes_search,
+            'notes_summary': lambda command: self.get_notes_summary(),
+            'notes_read': lambda command: self.read_recent_notes_aloud(),
+            'notes_help': lambda command: self.show_notes_help(),
+            # Comandos de notas específicas (legacy - crear nota simple)
+            'note': lambda command: self.take_notes(),
+            'screenshot': lambda command: self.take_screenshot(),
+            'system': lambda command: self.system_info(),
+            'reminder': self.add_reminder,
+            'tasks': self.add_task,
+            'navigation': self.open_website,
+            'goodbye': self._handle_goodbye,
+        }
+    
+    def _handle_music(self, command):
+        if 'spotify' in command:
+            music = command.replace('reproduce en spotify', '').strip()
+            self.speak(f'Reproduciendo {music} en Spotify')
+            self.add_to_chat(f"Angie: Reproduciendo {music} en Spotify")
+            try:
+                spoty.play(os.getenv("spoty_client_id"), os.getenv("spoty_client_secret"), music)
+            except:
+                self.add_to_chat("Angie: Error al reproducir en Spotify")
+        else:
+            music = command.replace('reproduce', '').strip()
+            self.speak(f'Reproduciendo {music}')
+            self.add_to_chat(f"Angie: Reproduciendo {music} en YouTube")
+            try:
+                pywhatkit.playonyt(music)
+            except:
+                self.add_to_chat("Angie: Error al reproducir en YouTube")
+    
+    def _handle_time(self, command):
+        hora = datetime.now().strftime('%I:%M %p')
+        self.speak(f'Son las {hora}')
+        self.add_to_chat(f"Angie: Son las {hora}")
+    
+    def _handle_weather(self, command):
+        # Extraer ciudad si se especifica
+        if " en " in command:
+            city = command.split(" en ")[-1].strip()
+            self.get_weather_for_city(city)
+        elif " de " in command:
+            city = command.split(" de ")[-1].strip()
+            self.get_weather_for_city(city)
+        else:
+            self.get_weather()
+    
+    def _handle_news(self, command):
+        # Detectar categoría específica con la tabla de categorías
+        category = self.news_category_router.route(command)
+        if category:
+            self.get_quick_news_summary(category.name)
+        else:
+            # Si no se especifica categoría, mostrar ventana completa
+            self.get_news()
+    
+    def _handle_search(self, command):
+        query = command.replace("buscar", "").replace("busca", "").strip()
+        if query:
+            self.search_wikipedia(query)
+        else:
+            self.speak("¿Qué quieres que busque?")
+            self.add_to_chat("Angie: ¿Qué quieres que busque en Wikipedia?")
+            self.show_search_window()
+    
+    def _handle_notes_search(self, command):
+        # Extraer término de búsqueda
+        search_term = notes_search_term(command)
+        if search_term:
+            self.search_notes_by_voice_command(search_term)
+        else:
+            self.speak("¿Qué quieres buscar en las notas?")
+            self.add_to_chat("Angie: ¿Qué quieres buscar en las notas?")
+    
+    def _handle_goodbye(self, command):
+        self.speak("¡Hasta luego! Que tengas un buen día")
+        self.add_to_chat("Angie: ¡Hasta luego! Que tengas un buen día")
+        self.stop_listening()
+    
+    def answer_general_question(self, pregunta):
+        """Responder con Gemini, sirviendo desde la caché las preguntas repetidas"""
+        cached = self.response_cache.get(pregunta)
+        if cached is not None:
+            self.speak(cached)
+            return cached
+        if GEMINI_STREAMING:
+            # Cada frase se encola en cuanto llega; el resto se sigue generando
+            return self.chat_with_gemini_streaming(pregunta)
+        respuesta = self.chat_with_gemini(pregunta)
+        self.speak(respuesta)
+        return respuesta
     
     def chat_with_gemini(self, pregunta):
         try:
             response = self.modelo_gemini.generate_content(pregunta)
             if hasattr(response, '_error') and response._error:
                 return f"Error de Gemini: {response._error}"
+            self.response_cache.put(pregunta, response.text)
             return response.text
         except Exception as e:
             return f"Ocurrió un error: {str(e)}"
     
-    def speak(self, text):
-        def speak_thread():
-            self.engine.say(text)
-            self.engine.runAndWait()
-        
-        threading.Thread(target=speak_thread, daemon=True).start()
+    def chat_with_gemini_streaming(self, pregunta):
+        """Respuesta de Gemini en streaming: habla frase a frase mientras se genera"""
+        try:
+            # Las frases de la respuesta no caducan ni se descartan sueltas (quedarían huecos)
+            reply_group = object()
+            respuesta, first_sentence = stream_reply(
+                self.modelo_gemini, pregunta,
+                lambda sentence: self.speak(sentence, expires=False, group=reply_group))
+            if first_sentence is not None:
+                self.gemini_first_sentence.record(first_sentence)
+            if not respuesta:
+                return "No obtuve respuesta de Gemini"
+            self.response_cache.put(pregunta, respuesta)
+            return respuesta
+        except Exception as e:
+            respuesta = f"Ocurrió un error: {str(e)}"
+            self.speak(respuesta)
+            return respuesta
+    
+    def speak(self, text, priority=NORMAL, key=None, expires=True, group=None):
+        """Encolar texto en el hilo de voz"""
+        self.speech.speak(text, priority=priority, key=key, expires=expires, group=group)
     
     def add_to_chat(self, message):
+        if message.startswith("Angie: "):
+            self.last_reply = message[len("Angie: "):]
         self.chat_area.insert("end", message + "\n")
         self.chat_area.see("end")
     
@@ -470,53 +602,53 @@ class AngieAdvanced:
             self.text_input.delete(0, "end")
             self.process_command(command)
     
+    def _fetch_weather(self, city):
+        """Consulta WeatherAPI; los errores de la API se lanzan como WeatherError"""
+        # WeatherAPI endpoint for current weather
+        # Se llama desde process_command: un solo intento con timeout corto para no congelar la voz
+        response = self.http.get("http://api.weatherapi.com/v1/current.json",
+                                 params={'key': WEATHER_API_KEY, 'q': city, 'lang': 'es'},
+                                 timeout=INTERACTIVE_TIMEOUT, retries=0)
+        data = response.json()
+        if response.status_code != 200:
+            raise WeatherError(data.get('error', {}).get('message', 'Ciudad no encontrada'))
+        return data
+    
     def get_weather(self):
         try:
             city = DEFAULT_CITY
-            # WeatherAPI endpoint for current weather
-            url = f"http://api.weatherapi.com/v1/current.json?key={WEATHER_API_KEY}&q={city}&lang=es"
-            response = requests.get(url)
-            data = response.json()
-            
-            if response.status_code == 200:
-                temp = data['current']['temp_c']
-                condition = data['current']['condition']['text']
-                humidity = data['current']['humidity']
-                wind_speed = data['current']['wind_kph']
-                feels_like = data['current']['feelslike_c']
-                
-                weather_info = f"En {city}: {temp}°C, {condition}. Sensación térmica: {feels_like}°C, humedad: {humidity}%, viento: {wind_speed} km/h"
-                self.speak(weather_info)
-                self.add_to_chat(f"Angie: {weather_info}")
-            else:
-                error_msg = data.get('error', {}).get('message', 'Error desconocido')
-                self.add_to_chat(f"Angie: No pude obtener el clima: {error_msg}")
+            data = self.weather_cache.get(city)
+            temp = data['current']['temp_c']
+            condition = data['current']['condition']['text']
+            humidity = data['current']['humidity']
+            wind_speed = data['current']['wind_kph']
+            feels_like = data['current']['feelslike_c']
+            
+            weather_info = f"En {city}: {temp}°C, {condition}. Sensación térmica: {feels_like}°C, humedad: {humidity}%, viento: {wind_speed} km/h"
+            self.speak(weather_info)
+            self.add_to_chat(f"Angie: {weather_info}")
+        except WeatherError as e:
+            self.add_to_chat(f"Angie: No pude obtener el clima: {e}")
         except Exception as e:
             self.add_to_chat(f"Angie: Error al obtener el clima: {str(e)}")
     
     def get_weather_for_city(self, city):
         """Obtiene el clima para una ciudad específica"""
         try:
-            # WeatherAPI endpoint for current weather
-            url = f"http://api.weatherapi.com/v1/current.json?key={WEATHER_API_KEY}&q={city}&lang=es"
-            response = requests.get(url)
-            data = response.json()
-            
-            if response.status_code == 200:
-                temp = data['current']['temp_c']
-                condition = data['current']['condition']['text']
-                humidity = data['current']['humidity']
-                wind_speed = data['current']['wind_kph']
-                feels_like = data['current']['feelslike_c']
-                location = data['location']['name']
-                country = data['location']['country']
-                
-                weather_info = f"En {location}, {country}: {temp}°C, {condition}. Sensación térmica: {feels_like}°C, humedad: {humidity}%, viento: {wind_speed} km/h"
-                self.speak(weather_info)
-                self.add_to_chat(f"Angie: {weather_info}")
-            else:
-                error_msg = data.get('error', {}).get('message', 'Ciudad no encontrada')
-                self.add_to_chat(f"Angie: No pude obtener el clima de {city}: {error_msg}")
+            data = self.weather_cache.get(city)
+            temp = data['current']['temp_c']
+            condition = data['current']['condition']['text']
+            humidity = data['current']['humidity']
+            wind_speed = data['current']['wind_kph']
+            feels_like = data['current']['feelslike_c']
+            location = data['location']['name']
+            country = data['location']['country']
+            
+            weather_info = f"En {location}, {country}: {temp}°C, {condition}. Sensación térmica: {feels_like}°C, humedad: {humidity}%, viento: {wind_speed} km/h"
+            self.speak(weather_info)
+            self.add_to_chat(f"Angie: {weather_info}")
+        except WeatherError as e:
+            self.add_to_chat(f"Angie: No pude obtener el clima de {city}: {e}")
         except Exception as e:
             self.add_to_chat(f"Angie: Error al obtener el clima de {city}: {str(e)}")
     
@@ -538,36 +670,25 @@ class AngieAdvanced:
                 self.show_search_window()
                 return
             
-            # Configurar idioma español para Wikipedia
-            wikipedia.set_lang("es")
-            
             self.add_to_chat(f"Angie: 🔍 Buscando '{query}' en Wikipedia...")
             
-            search_results = wikipedia.search(query, results=3)
-            if search_results:
-                try:
-                    # Intentar obtener el primer resultado
-                    page = wikipedia.page(search_results[0])
-                    summary = wikipedia.summary(search_results[0], sentences=3)
-                    
-                    response = f"Encontré información sobre '{query}': {summary}"
-                    self.speak(response)
-                    self.add_to_chat(f"Angie: 📖 {response}")
-                    
-                    # Mostrar enlace para más información
-                    self.add_to_chat(f"Angie: 🔗 Más información: {page.url}")
-                    
-                except wikipedia.exceptions.DisambiguationError as e:
-                    # Si hay ambigüedad, mostrar opciones
-                    options = e.options[:5]  # Máximo 5 opciones
-                    options_text = ", ".join(options)
-                    response = f"Encontré varias opciones para '{query}': {options_text}. Sé más específico."
-                    self.speak(response)
-                    self.add_to_chat(f"Angie: 📋 {response}")
-                    
-                except wikipedia.exceptions.PageError:
-                    self.add_to_chat(f"Angie: ❌ No encontré una página específica para '{query}'")
-                    
+            # Búsqueda, resumen y URL en una sola petición (o desde la caché)
+            result = self.wiki.lookup(query)
+            if result['status'] == 'ok':
+                response = f"Encontré información sobre '{query}': {result['summary']}"
+                self.speak(response)
+                self.add_to_chat(f"Angie: 📖 {response}")
+                
+                # Mostrar enlace para más información
+                self.add_to_chat(f"Angie: 🔗 Más información: {result['url']}")
+                
+            elif result['status'] == 'disambiguation':
+                # Si hay ambigüedad, mostrar opciones
+                options_text = ", ".join(result['options'])
+                response = f"Encontré varias opciones para '{query}': {options_text}. Sé más específico."
+                self.speak(response)
+                self.add_to_chat(f"Angie: 📋 {response}")
+                
             else:
                 response = f"No encontré resultados para '{query}' en Wikipedia"
                 self.speak(response)
@@ -660,12 +781,10 @@ class AngieAdvanced:
                 
                 if content:
                     try:
-                        cursor = self.conn.cursor()
-                        cursor.execute('''
+                        self.db.execute('''
                             INSERT INTO notes (title, content, created_date, modified_date)
                             VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
                         ''', (title, content))
-                        self.conn.commit()
                         
                         messagebox.showinfo("Nota Guardada", "Nota guardada exitosamente en la base de datos")
                         self.speak("Nota guardada correctamente")
@@ -704,9 +823,7 @@ class AngieAdvanced:
             notes_frame.pack(fill="both", expand=True, padx=10, pady=10)
             
             # Obtener todas las notas
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT id, title, content, created_date, modified_date FROM notes ORDER BY modified_date DESC')
-            notes = cursor.fetchall()
+            notes = self.db.query('SELECT id, title, content, created_date, modified_date FROM notes ORDER BY modified_date DESC')
             
             if not notes:
                 no_notes_label = ctk.CTkLabel(notes_frame, text="No hay notas guardadas")
@@ -803,13 +920,11 @@ class AngieAdvanced:
                 
                 if new_content:
                     try:
-                        cursor = self.conn.cursor()
-                        cursor.execute('''
+                        self.db.execute('''
                             UPDATE notes 
                             SET title = ?, content = ?, modified_date = CURRENT_TIMESTAMP
                             WHERE id = ?
                         ''', (new_title, new_content, note_id))
-                        self.conn.commit()
                         
                         messagebox.showinfo("Nota Actualizada", "Nota actualizada exitosamente")
                         self.speak("Nota actualizada correctamente")
@@ -838,9 +953,7 @@ class AngieAdvanced:
             
             if messagebox.askyesno("Confirmar Eliminación", 
                                  f"¿Estás seguro de que quieres eliminar la nota '{title}'?"):
-                cursor = self.conn.cursor()
-                cursor.execute('DELETE FROM notes WHERE id = ?', (note_id,))
-                self.conn.commit()
+                self.db.execute('DELETE FROM notes WHERE id = ?', (note_id,))
                 
                 messagebox.showinfo("Nota Eliminada", "Nota eliminada exitosamente")
                 self.speak("Nota eliminada correctamente")
@@ -865,15 +978,9 @@ class AngieAdvanced:
     def search_notes_by_voice_command(self, search_term):
         """Buscar notas por comando de voz"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT id, title, content, created_date, modified_date 
-                FROM notes 
-                WHERE title LIKE ? OR content LIKE ?
-                ORDER BY modified_date DESC
-            ''', (f'%{search_term}%', f'%{search_term}%'))
-            
-            notes = cursor.fetchall()
+            # Índice FTS5: sin distinguir acentos y ordenado por relevancia
+            with self.db.reader() as conn:
+                notes = search_notes(conn, search_term)
             
             if notes:
                 if len(notes) == 1:
@@ -894,9 +1001,7 @@ class AngieAdvanced:
     def get_notes_summary(self):
         """Obtener resumen de todas las notas"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM notes')
-            count = cursor.fetchone()[0]
+            count = self.db.query_one('SELECT COUNT(*) FROM notes')[0]
             
             if count == 0:
                 response = "No tienes notas guardadas"
@@ -905,8 +1010,7 @@ class AngieAdvanced:
             else:
                 response = f"Tienes {count} notas guardadas"
                 
-            cursor.execute('SELECT title FROM notes ORDER BY modified_date DESC LIMIT 3')
-            recent_notes = cursor.fetchall()
+            recent_notes = self.db.query('SELECT title FROM notes ORDER BY modified_date DESC LIMIT 3')
             
             if recent_notes:
                 titles = [note[0] for note in recent_notes]
@@ -973,9 +1077,8 @@ class AngieAdvanced:
                         reminder_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
                         
                         # Guardar en base de datos
-                        self.cursor.execute("INSERT INTO reminders (title, datetime) VALUES (?, ?)", 
-                                          (title, reminder_datetime.isoformat()))
-                        self.conn.commit()
+                        self.db.execute("INSERT INTO reminders (title, datetime) VALUES (?, ?)", 
+                                        (title, reminder_datetime.isoformat()))
                         
                         # Programar recordatorio
                         schedule.every().day.at(reminder_datetime.strftime("%H:%M")).do(
@@ -996,14 +1099,13 @@ class AngieAdvanced:
     
     def trigger_reminder(self, title):
         """Activar recordatorio"""
-        self.speak(f"Recordatorio: {title}")
+        self.speak(f"Recordatorio: {title}", priority=URGENT, expires=False)
         self.add_to_chat(f"Angie: 🔔 Recordatorio: {title}")
         messagebox.showinfo("Recordatorio", f"🔔 {title}")
     
     def show_reminders(self):
         try:
-            self.cursor.execute("SELECT * FROM reminders WHERE completed = 0 ORDER BY datetime")
-            reminders = self.cursor.fetchall()
+            reminders = self.db.query("SELECT * FROM reminders WHERE completed = 0 ORDER BY datetime")
             
             if reminders:
                 reminder_text = "Recordatorios pendientes:\n"
@@ -1042,8 +1144,7 @@ class AngieAdvanced:
                 priority = priority_var.get()
                 
                 if task:
-                    self.cursor.execute("INSERT INTO tasks (title, priority) VALUES (?, ?)", (task, priority))
-                    self.conn.commit()
+                    self.db.execute("INSERT INTO tasks (title, priority) VALUES (?, ?)", (task, priority))
                     messagebox.showinfo("Tarea", f"Tarea '{task}' agregada con prioridad {priority}")
                     task_window.destroy()
             
@@ -1055,8 +1156,7 @@ class AngieAdvanced:
     
     def show_tasks(self):
         try:
-            self.cursor.execute("SELECT * FROM tasks WHERE completed = 0 ORDER BY priority DESC, created_date")
-            tasks = self.cursor.fetchall()
+            tasks = self.db.query("SELECT * FROM tasks WHERE completed = 0 ORDER BY priority DESC, created_date")
             
             if tasks:
                 task_text = "Tareas pendientes:\n"
@@ -1089,21 +1189,41 @@ class AngieAdvanced:
         except:
             self.add_to_chat("Angie: Error al abrir el sitio web")
     
-    def guardar_historial(self, comando, respuesta):
+    def guardar_historial(self, comando, respuesta, intent=None, latency=None):
         try:
-            with open(get_project_path('data', 'historial_comandos.csv'), mode='a', encoding='utf-8', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow([datetime.now().isoformat(), comando, respuesta])
-        except:
-            pass
+            self.journal.record(comando, respuesta, intent=intent, latency=latency)
+        except Exception as e:
+            print(f"❌ Error guardando historial: {e}")
     
     def on_closing(self):
         self.stop_listening()
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        for hook in self.shutdown_hooks:
+            try:
+                hook()
+            except Exception as e:
+                print(f"❌ Error al cerrar: {e}")
+        print(f"🔊 Cola de voz: {self.speech.metrics()}")
+        if self.gemini_first_sentence.count:
+            print(f"⏱️ {self.gemini_first_sentence.summary()}")
+        print(f"🗃️ Caché de respuestas: {self.response_cache.stats()}")
+        print(f"🌤️ Caché del clima: {self.weather_cache.stats()}")
+        print(f"📰 Caché de noticias: {self.news_cache.stats()}")
+        print(f"📖 Caché de Wikipedia: {self.wiki.stats()}")
+        self.wiki.close()
+        self.news_prefetcher.stop()
+        self.news_cache.close()
+        for host, stats in self.http.stats().items():
+            print(f"🌐 {host}: n={stats['count']} p50={stats['p50'] * 1000:.0f} ms p95={stats['p95'] * 1000:.0f} ms")
+        self.http.close()
+        self.response_cache.close()
+        self.speech.stop()
+        self.journal.close()
+        if hasattr(self, 'db'):
+            self.db.close()
         self.root.destroy()
     
     def run(self):
+        self.root.after(0, self._on_window_shown)
         self.root.mainloop()
     
     def show_news_window(self, category="general", query="", country="es"):
@@ -1201,18 +1321,18 @@ class AngieAdvanced:
             country = self.country_var.get()
             search_query = self.search_entry.get().strip()
             
-            # Construir URL de la API
+            # Realizar petición (los titulares por categoría salen de la caché si están frescos)
             if search_query:
-                url = f"https://newsapi.org/v2/everything?q={search_query}&language={country}&sortBy=publishedAt&apiKey={NEWS_API_KEY}"
+                params = {'q': search_query, 'language': country, 'sortBy': 'publishedAt', 'apiKey': NEWS_API_KEY}
+                response = self.http.get("https://newsapi.org/v2/everything", params=params, timeout=(3.05, 15))
+                status_code, data = response.status_code, response.json()
             else:
-                url = f"https://newsapi.org/v2/top-headlines?country={country}&category={category}&apiKey={NEWS_API_KEY}"
-            
-            # Realizar petición
-            response = requests.get(url, timeout=15)
-            data = response.json()
+                status_code, data = self.news_cache.headlines(category, country, timeout=(3.05, 15))
+                if status_code == 304:
+                    status_code = 200
             
             # Actualizar interfaz en hilo principal
-            self.root.after(0, self._display_news_results, news_frame, loading_label, data, response.status_code)
+            self.root.after(0, self._display_news_results, news_frame, loading_label, data, status_code)
             
         except requests.exceptions.Timeout:
             self.root.after(0, self._display_error, news_frame, loading_label, 
@@ -1355,7 +1475,8 @@ class AngieAdvanced:
         description = article.get('description', '')
         text_to_speak = f"Noticia: {title}. {description}"
         
-        threading.Thread(target=lambda: self.speak(text_to_speak), daemon=True).start()
+        # Si se pulsan varias noticias seguidas solo se lee la última
+        self.speak(text_to_speak, key='news_article')
         
     def _share_article(self, article):
         """Compartir artículo"""
@@ -1387,7 +1508,7 @@ class AngieAdvanced:
             title = article.get('title', 'Sin título')
             summary_text += f"Noticia {i}: {title}. "
             
-        threading.Thread(target=lambda: self.speak(summary_text), daemon=True).start()
+        self.speak(summary_text, priority=BACKGROUND, key='news_summary')
         
     def get_quick_news_summary(self, category="general"):
         """Obtener resumen rápido de noticias para comandos de voz"""
@@ -1401,89 +1522,74 @@ class AngieAdvanced:
                 return
             
             # Traducir categoría al español para el mensaje
-            category_names = {
-                "general": "generales",
-                "business": "negocios", 
-                "entertainment": "entretenimiento",
-                "health": "salud",
-                "science": "ciencia", 
-                "sports": "deportes",
-                "technology": "tecnología"
-            }
-            category_spanish = category_names.get(category, category)
-            
-            self.add_to_chat(f"Angie: 🔄 Buscando noticias de {category_spanish}...")
-            
-            # Lista de países a intentar (ordenados por probabilidad de tener noticias)
-            countries_to_try = ["us", "gb", "es"]
-            success = False
-            
-            for country in countries_to_try:
-                try:
-                    url = f"https://newsapi.org/v2/top-headlines?country={country}&category={category}&apiKey={NEWS_API_KEY}"
-                    
-                    response = requests.get(url, timeout=10)
-                    data = response.json()
+            category_spanish = NEWS_CATEGORY_NAMES.get(category, category)
+            self.news_prefetcher.track(category)
+            
+            countries_to_try = NEWS_COUNTRIES
+            
+            # Titulares en caché (descargados o precargados): respuesta inmediata sin red
+            index, result, outcomes = None, None, []
+            for i, country in enumerate(countries_to_try):
+                # Solo mientras no superen NEWS_CACHE_TTL, aunque el precargador pase con menos frecuencia
+                data = self.news_cache.cached(category, country)
+                if has_articles(200, data):
+                    index, result = i, (200, data)
+                    break
+            
+            if result is None:
+                self.add_to_chat(f"Angie: 🔄 Buscando noticias de {category_spanish}...")
+                # Países consultados a la vez; gana el primero con titulares por orden de prioridad
+                index, result, outcomes = first_usable(
+                    [lambda c=country: self.news_cache.fetch(category, c, retries=0) for country in countries_to_try],
+                    lambda outcome: has_articles(*outcome))
+            
+            if result is not None:
+                country = countries_to_try[index]
+                articles = result[1]['articles'][:3]  # Solo las 3 principales
+                
+                # Información sobre el país usado
+                country_names = {"us": "Estados Unidos", "gb": "Reino Unido", "es": "España"}
+                country_name = country_names.get(country, country.upper())
+                
+                summary = f"Principales noticias de {category_spanish} desde {country_name}: "
+                for i, article in enumerate(articles, 1):
+                    title = article.get('title', 'Sin título')
+                    # Limpiar el título para lectura de voz
+                    title_clean = title.replace('\n', ' ').replace('\r', ' ')
+                    summary += f"Noticia {i}: {title_clean}. "
                     
-                    if response.status_code == 200 and data.get('articles') and len(data['articles']) > 0:
-                        articles = data['articles'][:3]  # Solo las 3 principales
-                        
-                        # Información sobre el país usado
-                        country_names = {"us": "Estados Unidos", "gb": "Reino Unido", "es": "España"}
-                        country_name = country_names.get(country, country.upper())
-                        
-                        summary = f"Principales noticias de {category_spanish} desde {country_name}: "
-                        for i, article in enumerate(articles, 1):
-                            title = article.get('title', 'Sin título')
-                            # Limpiar el título para lectura de voz
-                            title_clean = title.replace('\n', ' ').replace('\r', ' ')
-                            summary += f"Noticia {i}: {title_clean}. "
-                            
-                        self.speak(summary)
-                        self.add_to_chat(f"Angie: {summary}")
-                        
-                        # También mostrar en chat con mejor formato
-                        self.add_to_chat(f"Angie: 📰 Top 3 noticias de {category_spanish} ({country_name}):")
-                        for i, article in enumerate(articles, 1):
-                            title = article.get('title', 'Sin título')
-                            source = article.get('source', {}).get('name', 'Fuente desconocida')
-                            self.add_to_chat(f"  {i}. {title} ({source})")
-                        
-                        success = True
-                        break
-                        
-                except requests.exceptions.RequestException:
-                    continue
-            
-            if success:
+                self.speak(summary)
+                self.add_to_chat(f"Angie: {summary}")
+                
+                # También mostrar en chat con mejor formato
+                self.add_to_chat(f"Angie: 📰 Top 3 noticias de {category_spanish} ({country_name}):")
+                for i, article in enumerate(articles, 1):
+                    title = article.get('title', 'Sin título')
+                    source = article.get('source', {}).get('name', 'Fuente desconocida')
+                    self.add_to_chat(f"  {i}. {title} ({source})")
                 return
             
-            # Si llegamos aquí, ningún país funcionó, intentar último intento con diagnóstico
-            try:
-                url = f"https://newsapi.org/v2/top-headlines?country=es&category={category}&apiKey={NEWS_API_KEY}"
-                response = requests.get(url, timeout=10)
-                data = response.json()
+            # Ningún país funcionó: diagnóstico con las respuestas ya recibidas
+            statuses = [outcome[0] for outcome in outcomes if not isinstance(outcome, Exception)]
+            if not statuses:
+                # Todas las peticiones fallaron: lo reportan los manejadores de abajo
+                raise outcomes[0]
+            
+            if 401 in statuses:
+                self.speak("La API key de noticias no es válida")
+                self.add_to_chat("Angie: ❌ API key de noticias inválida")
+                self.add_to_chat("Angie: Verifica tu API key en el archivo .env")
                 
-                if response.status_code == 401:
-                    self.speak("La API key de noticias no es válida")
-                    self.add_to_chat("Angie: ❌ API key de noticias inválida")
-                    self.add_to_chat("Angie: Verifica tu API key en el archivo .env")
-                    
-                elif response.status_code == 429:
-                    self.speak("Se ha excedido el límite de consultas de noticias")
-                    self.add_to_chat("Angie: ⏰ Límite de consultas excedido")
-                    self.add_to_chat("Angie: Intenta más tarde o actualiza tu plan en newsapi.org")
-                    
-                else:
-                    error_msg = data.get('message', f'Error HTTP {response.status_code}')
-                    self.speak(f"No hay noticias de {category_spanish} disponibles en este momento")
-                    self.add_to_chat(f"Angie: ⚠️ No hay noticias de {category_spanish} disponibles")
-                    self.add_to_chat("Angie: � Las noticias en español pueden tener disponibilidad limitada")
-                    self.add_to_chat("Angie: 🌐 Tip: Usa el centro de noticias para explorar otras fuentes")
-            except:
-                self.speak(f"No pude obtener noticias de {category_spanish}")
-                self.add_to_chat(f"Angie: ❌ Error al obtener noticias de {category_spanish}")
-                self.add_to_chat("Angie: 💡 Tip: Haz clic en el botón 'Noticias' para acceder al centro completo")
+            elif 429 in statuses:
+                self.speak("Se ha excedido el límite de consultas de noticias")
+                self.add_to_chat("Angie: ⏰ Límite de consultas excedido")
+                self.add_to_chat("Angie: Intenta más tarde o actualiza tu plan en newsapi.org")
+                
+            else:
+                self.speak(f"No hay noticias de {category_spanish} disponibles en este momento")
+                self.add_to_chat(f"Angie: ⚠️ No hay noticias de {category_spanish} disponibles")
+                self.add_to_chat("Angie: � Las noticias en español pueden tener disponibilidad limitada")
+                self.add_to_chat("Angie: 🌐 Tip: Usa el centro de noticias para explorar otras fuentes")
                 
         except requests.exceptions.Timeout:
             self.speak("La conexión tardó demasiado")
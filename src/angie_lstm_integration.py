@@ -1,32 +1,48 @@
-import sqlite3
-import pandas as pd
 from datetime import datetime
+import os
 import threading
 import time
-from angie_lstm_trainer import AngieLSTMTrainer
+from intent_router import get_default_router
+from database import get_database
+from interaction_logger import InteractionLogger
+from fast_classifier import TieredClassifier, load_fast_classifier
+from interaction_stats import InteractionStats
+from lite_predictor import LiteBackend, lite_available
+from lstm_inference import KerasBackend, LSTMInferenceServer
+from lazy_imports import timed_import
+
+MODEL_FILENAME = 'angie_lstm_model'
+FAST_MODEL_PATH = 'angie_fast_classifier.npz'
+# Por debajo de esta confianza del clasificador rápido se consulta el LSTM
+FAST_THRESHOLD = 0.85
 
 class AngieLSTMIntegration:
-    def __init__(self, db_path='angie_data.db'):
+    def __init__(self, db_path='angie_data.db', warm_start=True):
         self.db_path = db_path
-        self.trainer = AngieLSTMTrainer(db_path)
+        self.db = get_database(db_path)
+        self.interaction_stats = InteractionStats(self.db)
+        # Cada lote escrito actualiza los resúmenes en el mismo hilo escritor, sin esperar
+        self.interaction_logger = InteractionLogger(self.db, on_flush=self.interaction_stats.refresh)
+        # TensorFlow solo se importa si hace falta entrenar o no hay modelo TFLite
+        self._trainer = None
+        self.intent_router = get_default_router()
+        self.inference = None
+        self._inference_lock = threading.Lock()
+        self._training_lock = threading.Lock()
+        # Hasta el calentamiento solo responde el nivel rápido, sin bloquear a la espera del modelo
+        self._awaiting_warmup = not warm_start
+        self.tiers = TieredClassifier(load_fast_classifier(FAST_MODEL_PATH), self._submit_lstm, FAST_THRESHOLD)
         self.setup_interaction_table()
+        # El modelo se carga y se calienta al arrancar, fuera del camino de los comandos;
+        # con warm_start=False lo arranca quien crea la integración (p. ej. tras abrir la ventana)
+        if warm_start:
+            self.start_inference()
         
     def setup_interaction_table(self):
         """Configurar tabla de interacciones en la base de datos existente"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS interactions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_input TEXT NOT NULL,
-                    assistant_response TEXT NOT NULL,
-                    command_type TEXT,
-                    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-                    confidence REAL DEFAULT 0.0
-                )
-            ''')
-            conn.commit()
-            conn.close()
+            # get_database ya crea la tabla; se comprueba que existe
+            self.db.query_one("SELECT 1 FROM interactions LIMIT 1")
             print("✅ Tabla de interacciones configurada")
         except Exception as e:
             print(f"❌ Error configurando tabla: {e}")
@@ -34,66 +50,94 @@ class AngieLSTMIntegration:
     def log_interaction(self, user_input, assistant_response, command_type="unknown", confidence=0.0):
         """Registrar una interacción en la base de datos"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute('''
-                INSERT INTO interactions (user_input, assistant_response, command_type, confidence)
-                VALUES (?, ?, ?, ?)
-            ''', (user_input, assistant_response, command_type, confidence))
-            conn.commit()
-            conn.close()
+            # Solo se añade al búfer; se escribe por lotes en segundo plano
+            self.interaction_logger.log(user_input, assistant_response, command_type, confidence)
             return True
         except Exception as e:
             print(f"❌ Error registrando interacción: {e}")
             return False
     
+    @property
+    def trainer(self):
+        """Entrenador del que sirve KerasBackend; no se usa para entrenar"""
+        if self._trainer is None:
+            self._trainer = self.new_trainer()
+        return self._trainer
+    
+    def new_trainer(self):
+        with timed_import('angie_lstm_trainer', deferred=True):
+            from angie_lstm_trainer import AngieLSTMTrainer
+        return AngieLSTMTrainer(self.db_path)
+    
+    def run_training(self, full=False):
+        """Entrenar con una instancia propia, sin tocar el modelo que se está sirviendo,
+        y cambiar al modelo nuevo solo con start_inference(reload=True)"""
+        with self._training_lock:
+            trainer = self.new_trainer()
+            results = trainer.run_full_training() if full else trainer.run_incremental_training()
+            if full or results['mode'] != 'skipped':
+                self.start_inference(reload=True)
+            return results
+    
+    def create_inference_backend(self):
+        """Modelo TFLite si está exportado y hay runtime ligero; si no, el modelo Keras"""
+        if lite_available(MODEL_FILENAME):
+            print("⚡ Usando el modelo TensorFlow Lite")
+            return LiteBackend(MODEL_FILENAME)
+        if os.path.exists(f'{MODEL_FILENAME}.h5'):
+            return KerasBackend(self.trainer, MODEL_FILENAME)
+        return None
+    
+    def start_inference(self, reload=False):
+        """Arrancar el servidor de inferencia si hay modelo; reload=True tras un entrenamiento"""
+        # El calentamiento y la primera predicción pueden llegar a la vez desde hilos distintos
+        with self._inference_lock:
+            try:
+                if reload:
+                    self.tiers.fast = load_fast_classifier(FAST_MODEL_PATH)
+                    # KerasBackend nuevo con un entrenador nuevo que carga el modelo guardado;
+                    # el servidor anterior sigue con el suyo hasta que se detiene
+                    self._trainer = None
+                if self.inference is not None and self.inference.error is None and not reload:
+                    return True
+                backend = self.create_inference_backend()
+                if backend is None:
+                    return False
+                if self.inference is not None:
+                    self.inference.stop()
+                self.inference = LSTMInferenceServer(backend)
+                self.inference.start()
+                return True
+            finally:
+                self._awaiting_warmup = False
+    
+    def _submit_lstm(self, text, callback):
+        if self._awaiting_warmup or not self.start_inference():
+            callback(None)
+            return
+        self.inference.submit(text, callback)
+    
+    def close(self):
+        """Detener la inferencia y escribir las interacciones pendientes"""
+        if self.inference is not None:
+            self.inference.stop()
+            print(f"🧠 {self.inference.summary()}")
+        print(f"⚡ {self.tiers.summary()}")
+        self.interaction_logger.close()
+        print(f"🧾 Registro de interacciones: {self.interaction_logger.stats()}")
+    
     def detect_command_type(self, user_input):
         """Detectar automáticamente el tipo de comando basado en palabras clave"""
-        user_input_lower = user_input.lower()
-        
-        # Mapeo de palabras clave a tipos de comando
-        command_patterns = {
-            'time': ['hora', 'tiempo', 'qué hora', 'qué día'],
-            'weather': ['clima', 'tiempo', 'temperatura', 'lluvia'],
-            'search': ['busca', 'buscar', 'encuentra', 'información'],
-            'music': ['reproduce', 'música', 'spotify', 'youtube'],
-            'notes': ['nota', 'anota', 'escribe', 'apunta'],
-            'screenshot': ['captura', 'screenshot', 'pantalla'],
-            'system': ['sistema', 'computadora', 'cpu', 'ram', 'disco'],
-            'reminder': ['recordatorio', 'recordar', 'recordar'],
-            'news': ['noticias', 'noticia', 'actualidad'],
-            'navigation': ['abre', 'navega', 'ir a', 'visita'],
-            'tasks': ['tarea', 'tareas', 'pendiente'],
-            'chat': ['hola', 'cómo estás', 'chiste', 'conversa']
-        }
-        
-        for command_type, patterns in command_patterns.items():
-            for pattern in patterns:
-                if pattern in user_input_lower:
-                    return command_type
-        
-        return 'chat'  # Por defecto
+        # Misma tabla compilada que usa process_command, más las pistas de clasificación
+        return self.intent_router.classify(user_input, default='chat')
     
     def get_interaction_stats(self):
         """Obtener estadísticas de las interacciones"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            df = pd.read_sql_query("SELECT * FROM interactions", conn)
-            conn.close()
-            
-            if df.empty:
-                return {
-                    'total_interactions': 0,
-                    'command_types': {},
-                    'recent_activity': []
-                }
-            
-            stats = {
-                'total_interactions': len(df),
-                'command_types': df['command_type'].value_counts().to_dict(),
-                'recent_activity': df.tail(10)[['user_input', 'command_type', 'timestamp']].to_dict('records')
-            }
-            
-            return stats
+            # Solo se procesan las filas nuevas; el resto sale de las tablas de resumen
+            self.interaction_logger.flush()
+            self.interaction_stats.refresh().result()
+            return self.interaction_stats.snapshot()
         except Exception as e:
             print(f"❌ Error obteniendo estadísticas: {e}")
             return {}
@@ -104,8 +148,11 @@ class AngieLSTMIntegration:
             while True:
                 try:
                     print("🔄 Iniciando entrenamiento automático...")
-                    results = self.trainer.run_full_training()
-                    print(f"✅ Entrenamiento automático completado. Precisión: {results['accuracy']:.2%}")
+                    # Solo las interacciones nuevas; desde cero únicamente si hay deriva
+                    results = self.run_training()
+                    if results['mode'] != 'skipped':
+                        print(f"✅ Entrenamiento automático ({results['mode']}) completado. "
+                              f"Precisión: {results['accuracy']:.2%}")
                 except Exception as e:
                     print(f"❌ Error en entrenamiento automático: {e}")
                 
@@ -117,20 +164,18 @@ class AngieLSTMIntegration:
         training_thread.start()
         print(f"🔄 Entrenamiento automático iniciado (cada {interval_hours} horas)")
     
-    def predict_next_command(self, user_input):
-        """Predecir el tipo de comando usando el modelo LSTM entrenado"""
+    def predict_next_command(self, user_input, timeout=5.0):
+        """Predecir el tipo de comando: clasificador rápido y, si duda, el modelo LSTM"""
         try:
-            if self.trainer.model is None:
-                # Intentar cargar modelo existente
-                if not self.trainer.load_model():
-                    return None
-            
-            prediction = self.trainer.predict_command_type(user_input)
-            return prediction
+            return self.tiers.classify(user_input, timeout)
         except Exception as e:
             print(f"❌ Error en predicción: {e}")
             return None
     
+    def predict_next_command_async(self, user_input, callback):
+        """Predecir sin bloquear; callback(predicción o None) se llama al tener el resultado"""
+        self.tiers.classify_async(user_input, callback)
+    
     def get_training_recommendations(self):
         """Obtener recomendaciones basadas en los datos de entrenamiento"""
         try:
@@ -153,12 +198,7 @@ class AngieLSTMIntegration:
                     recommendations.append(f"El comando '{cmd_type}' es muy frecuente ({percentage:.1f}%), considera diversificar")
             
             # Verificar variedad de vocabulario
-            conn = sqlite3.connect(self.db_path)
-            df = pd.read_sql_query("SELECT user_input FROM interactions", conn)
-            conn.close()
-            
-            all_words = ' '.join(df['user_input'].str.lower()).split()
-            unique_words = len(set(all_words))
+            unique_words = stats['unique_words']
             
             if unique_words < 50:
                 recommendations.append(f"Pocas palabras únicas ({unique_words}), considera usar más variedad en los comandos")
@@ -172,8 +212,9 @@ class AngieLSTMIntegration:
 def integrate_with_angie(angie_instance):
     """Integrar el sistema LSTM con una instancia de AngieAdvanced"""
     
-    # Crear integrador
-    integrator = AngieLSTMIntegration()
+    # Crear integrador; el modelo se carga en el calentamiento, después de mostrar la ventana
+    integrator = AngieLSTMIntegration(warm_start=False)
+    angie_instance.add_warmup_task(integrator.start_inference)
     
     # Guardar referencia al método original de process_command
     original_process_command = angie_instance.process_command
@@ -197,14 +238,22 @@ def integrate_with_angie(angie_instance):
         # Registrar interacción
         integrator.log_interaction(command, assistant_response, command_type)
         
-        # Mostrar predicción LSTM si está disponible
-        prediction = integrator.predict_next_command(command)
-        if prediction and prediction['confidence'] > 0.7:
-            angie_instance.add_to_chat(f"🤖 LSTM predijo: {prediction['command_type']} (confianza: {prediction['confidence']:.2f})")
+        # Mostrar predicción LSTM si está disponible, sin bloquear el comando
+        def show_prediction(prediction):
+            if prediction and prediction['confidence'] > 0.7:
+                source = "LSTM" if prediction.get('tier') == 'lstm' else "Clasificador rápido"
+                angie_instance.root.after(
+                    0, angie_instance.add_to_chat,
+                    f"🤖 {source} predijo: {prediction['command_type']} (confianza: {prediction['confidence']:.2f})")
+        
+        integrator.predict_next_command_async(command, show_prediction)
     
     # Reemplazar método
     angie_instance.process_command = enhanced_process_command
     
+    # Vaciar el registro de interacciones al cerrar, antes de cerrar la base de datos
+    angie_instance.shutdown_hooks.append(integrator.close)
+    
     # Agregar botón de entrenamiento LSTM a la interfaz
     def add_lstm_training_button():
         """Agregar botón de entrenamiento LSTM a la interfaz"""
@@ -233,7 +282,7 @@ def integrate_with_angie(angie_instance):
         def train_thread():
             try:
                 angie_instance.add_to_chat("🧠 Iniciando entrenamiento LSTM...")
-                results = integrator.trainer.run_full_training()
+                results = integrator.run_training(full=True)
                 angie_instance.add_to_chat(f"✅ Entrenamiento LSTM completado. Precisión: {results['accuracy']:.2%}")
                 
                 # Mostrar recomendaciones
@@ -265,7 +314,7 @@ def run_standalone_training():
     print(f"📊 Tipos de comandos: {stats['command_types']}")
     
     # Ejecutar entrenamiento
-    results = integrator.trainer.run_full_training()
+    results = integrator.new_trainer().run_full_training()
     
     # Mostrar recomendaciones
     recommendations = integrator.get_training_recommendations()
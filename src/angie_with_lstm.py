@@ -85,7 +85,7 @@ class AngieWithLSTM:
                 self.angie.speak("Iniciando entrenamiento del modelo LSTM")
                 
                 # Ejecutar entrenamiento
-                results = self.integrator.trainer.run_full_training()
+                results = self.integrator.run_training(full=True)
                 
                 # Mostrar resultados
                 accuracy = results['accuracy']
@@ -134,6 +134,11 @@ class AngieWithLSTM:
                 for activity in stats['recent_activity'][-3:]:  # Últimas 3
                     self.angie.add_to_chat(f"     - {activity['command_type']}: {activity['user_input'][:30]}...")
             
+            # Latencia del servidor de inferencia
+            if self.integrator.inference is not None:
+                self.angie.add_to_chat(f"   • {self.integrator.inference.summary()}")
+            self.angie.add_to_chat(f"   • {self.integrator.tiers.summary()}")
+            
         except Exception as e:
             self.angie.add_to_chat(f"❌ Error obteniendo estadísticas: {e}")
     
@@ -157,7 +162,7 @@ class AngieWithLSTM:
         
         # Mostrar información de inicio
         if self.lstm_available:
-            print("🧠 Sistema LSTM: ACTIVO")
+            print("🧠 Sistema LSTM: ACTIVO (el modelo se carga tras abrir la ventana)")
             print("📊 Interacciones se registran automáticamente")
             print("🎯 Comandos de entrenamiento disponibles:")
             print("   - 'entrena lstm' o 'entrena modelo'")
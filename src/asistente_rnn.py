@@ -1,17 +1,91 @@
 import speech_recognition as sr
 import pyttsx3
 import numpy as np
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.sequence import pad_sequences
+import os
 import pickle
+import threading
 
-model = load_model('modelo_rnn_comandos.h5')
-with open('tokenizer.pickle', 'rb') as handle:
-    tokenizer = pickle.load(handle)
+from text_vectorizer import TextVectorizer
 
 maxlen = 20
 num_palabras = 2000
 
+MODEL_PATH = 'modelo_rnn_comandos.h5'
+VOCAB_PATH = 'tokenizer_vocab.json'
+TOKENIZER_PATH = 'tokenizer.pickle'
+
+class RNNResponseEngine:
+    """Respuestas del RNN por lotes; el modelo y el vocabulario se cargan en la primera petición"""
+
+    def __init__(self, model_path=MODEL_PATH, vocab_path=VOCAB_PATH, tokenizer_path=TOKENIZER_PATH,
+                 model=None, vectorizer=None):
+        self.model_path = model_path
+        self.vocab_path = vocab_path
+        self.tokenizer_path = tokenizer_path
+        self._model = model
+        self._vectorizer = vectorizer
+        self._words = None
+        self._lock = threading.Lock()
+
+    @property
+    def vectorizer(self):
+        if self._vectorizer is None:
+            with self._lock:
+                if self._vectorizer is None:
+                    self._vectorizer = self._load_vectorizer()
+        return self._vectorizer
+
+    def _load_vectorizer(self):
+        if os.path.exists(self.vocab_path):
+            return TextVectorizer.load(self.vocab_path)
+        # Modelos entrenados antes de exportar el vocabulario en JSON
+        with open(self.tokenizer_path, 'rb') as handle:
+            return TextVectorizer.from_keras(pickle.load(handle), maxlen, padding='post')
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    # TensorFlow solo se importa al pedir la primera respuesta
+                    from tensorflow.keras.models import load_model
+                    self._model = load_model(self.model_path)
+        return self._model
+
+    @property
+    def words(self):
+        """Vocabulario inverso índice → palabra, construido una sola vez"""
+        if self._words is None:
+            self._words = self.vectorizer.reverse_lookup()
+        return self._words
+
+    def decode_batch(self, indices):
+        """Texto de cada fila de índices: hasta el primer 0 (fin de respuesta), sin <OOV>"""
+        indices = np.asarray(indices)
+        words = self.words
+        known = indices < len(words)
+        tokens = words[np.where(known, indices, 0)]
+        keep = known & (np.cumsum(indices == 0, axis=1) == 0) & (tokens != '')
+        return [' '.join(row[mask].tolist()) for row, mask in zip(tokens, keep)]
+
+    def respond_batch(self, commands):
+        """Respuestas para varios comandos con una sola llamada al modelo"""
+        if not commands:
+            return []
+        pred = self.model.predict_on_batch(self.vectorizer.encode(commands))
+        return self.decode_batch(np.argmax(pred, axis=2))
+
+    def respond(self, command):
+        return self.respond_batch([command])[0]
+
+_engine = None
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        _engine = RNNResponseEngine()
+    return _engine
+
 def speak(text):
     engine = pyttsx3.init()
     engine.say(text)
@@ -30,22 +104,11 @@ def get_audio():
             return ""
 
 def predecir_respuesta(comando):
-    seq = tokenizer.texts_to_sequences([comando])
-    seq = pad_sequences(seq, maxlen=maxlen, padding='post')
-    pred = model.predict(seq)
-    pred_indices = np.argmax(pred, axis=2)[0]  # shape: (maxlen,)
-    # Decodificar a texto, omitir ceros y <OOV>
-    index_word = {v: k for k, v in tokenizer.word_index.items()}
-    respuesta = []
-    for idx in pred_indices:
-        if idx == 0 or idx == tokenizer.word_index.get('<OOV>', -1):
-            continue
-        palabra = index_word.get(idx, '')
-        if palabra:
-            respuesta.append(palabra)
-    return ' '.join(respuesta)
+    return get_engine().respond(comando)
 
 def main():
+    # Cargar antes de escuchar para que la primera respuesta no espere a TensorFlow
+    get_engine().model
     print("Asistente RNN listo. Di tu comando (di 'salir' para terminar):")
     while True:
         comando = get_audio()
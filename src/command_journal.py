@@ -0,0 +1,181 @@
+"""
+Diario de comandos de Angie
+JSON Lines de solo anexado con un descriptor abierto y con búfer, rotación por tamaño,
+segmentos rotados comprimidos con gzip y lectura en streaming para el entrenamiento
+"""
+
+import csv
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+
+class CommandJournal:
+    """Registra cada comando con su respuesta real, intención y latencia"""
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backup_count=10, compress=True,
+                 flush_interval=5.0, buffering=64 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.buffering = buffering
+        self._lock = threading.Lock()
+        self._file = None
+        self._last_flush = time.monotonic()
+        self.records = 0
+        self.rotations = 0
+
+    def _open(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8', buffering=self.buffering)
+
+    def record(self, command, response, intent=None, latency=None):
+        """Añadir una entrada; latency en segundos"""
+        entry = {
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'command': command,
+            'response': response,
+            'intent': intent,
+            'latency_ms': round(latency * 1000, 1) if latency is not None else None,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(line)
+            self.records += 1
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        base, ext = os.path.splitext(self.path)
+        rotated = f'{base}.{stamp}{ext}'
+        os.replace(self.path, rotated)
+        self.rotations += 1
+        if self.compress:
+            # Comprimir fuera del camino del comando
+            threading.Thread(target=_gzip_and_remove, args=(rotated,), daemon=True).start()
+        self._prune()
+
+    def _prune(self):
+        segments = rotated_segments(self.path)
+        for old in segments[:max(0, len(segments) - self.backup_count)]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _gzip_and_remove(path):
+    try:
+        with open(path, 'rb') as src, gzip.open(path + '.gz', 'wb') as dst:
+            while True:
+                chunk = src.read(1024 * 1024)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        os.remove(path)
+    except OSError as e:
+        print(f"⚠️ No se pudo comprimir {path}: {e}")
+
+
+def rotated_segments(path):
+    """Segmentos rotados (comprimidos o no), del más antiguo al más reciente"""
+    base, ext = os.path.splitext(path)
+    plain = set(glob.glob(f'{glob.escape(base)}.*{ext}')) - {path}
+    # Un .gz cuyo original sigue ahí aún se está comprimiendo
+    compressed = {p for p in glob.glob(f'{glob.escape(base)}.*{ext}.gz') if p[:-3] not in plain}
+    # El sello de tiempo del nombre ordena cronológicamente
+    return sorted(plain | compressed, key=lambda p: os.path.basename(p).replace('.gz', ''))
+
+
+def _open_segment(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def iter_journal(path, include_rotated=True):
+    """Entradas del diario una a una (sin cargarlo entero), de la más antigua a la más reciente"""
+    segments = rotated_segments(path) if include_rotated else []
+    if os.path.exists(path):
+        segments.append(path)
+    for segment in segments:
+        try:
+            with _open_segment(segment) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # Línea a medio escribir tras un cierre brusco
+                        continue
+        except FileNotFoundError:
+            # Segmento comprimido/rotado mientras se leía
+            continue
+
+
+def iter_legacy_csv(path):
+    """Entradas del antiguo historial_comandos.csv (fecha, comando, respuesta)"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if len(row) >= 3:
+                yield {'ts': row[0], 'command': row[1], 'response': row[2], 'intent': None, 'latency_ms': None}
+
+
+def iter_batches(entries, batch_size=1024):
+    """Agrupar un iterador de entradas en listas de hasta batch_size"""
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Respuesta fija que escribía la versión anterior; no sirve para entrenar
+_PLACEHOLDER_RESPONSES = {'', 'Comando procesado'}
+
+
+def training_entries(journal_path, legacy_csv=None):
+    """Entradas útiles para entrenar: el CSV antiguo (si se indica) y luego el diario,
+    sin las respuestas de relleno"""
+    sources = []
+    if legacy_csv:
+        sources.append(iter_legacy_csv(legacy_csv))
+    sources.append(iter_journal(journal_path))
+    for source in sources:
+        for entry in source:
+            if entry.get('command') and entry.get('response') not in _PLACEHOLDER_RESPONSES:
+                yield entry
@@ -0,0 +1,209 @@
+"""
+Acceso a la base de datos SQLite de Angie
+Un hilo escritor con cola para todas las escrituras, un pool de conexiones de solo lectura y modo WAL
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from interaction_stats import ensure_stats_tables
+from notes_index import ensure_notes_fts
+
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    # Con WAL, NORMAL es seguro ante caídas de la aplicación y evita un fsync por commit
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-8000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA busy_timeout=5000',
+)
+
+SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS reminders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        datetime TEXT NOT NULL,
+        completed BOOLEAN DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        priority TEXT DEFAULT 'medium',
+        completed BOOLEAN DEFAULT 0,
+        created_date TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS notes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_date TEXT DEFAULT CURRENT_TIMESTAMP,
+        modified_date TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS interactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_input TEXT NOT NULL,
+        assistant_response TEXT NOT NULL,
+        command_type TEXT,
+        timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+        confidence REAL DEFAULT 0.0
+    )
+    ''',
+)
+
+_STOP = object()
+
+
+def create_schema(conn):
+    """Tablas de Angie, índice de texto completo de las notas y resúmenes de interacciones"""
+    for statement in SCHEMA:
+        conn.execute(statement)
+    ensure_notes_fts(conn)
+    ensure_stats_tables(conn)
+
+
+def _connect(path, read_only=False):
+    if read_only:
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA cache_size=-8000')
+    else:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+    return conn
+
+
+class Database:
+    """Dueña de la base de datos: escrituras serializadas en un hilo y lecturas concurrentes"""
+
+    def __init__(self, path, readers=3):
+        self.path = os.path.abspath(path)
+        self._queue = queue.Queue()
+        self._writer = _connect(self.path)
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+        # Lectores libres y prestados: close() los cierra todos, también los que estén en uso
+        self._pool = threading.Condition()
+        self._idle = [_connect(self.path, read_only=True) for _ in range(readers)]
+        self._borrowed = set()
+        self._closed = False
+        self.writes = 0
+        self.write_errors = 0
+
+    def _write_loop(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+            fn, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(self._writer)
+                self._writer.commit()
+                self.writes += 1
+                future.set_result(result)
+            except Exception as e:
+                self._writer.rollback()
+                self.write_errors += 1
+                future.set_exception(e)
+        self._writer.close()
+
+    def write(self, fn):
+        """Ejecutar fn(conexión) en el hilo escritor, en su propia transacción.
+        Devuelve un Future con el resultado"""
+        if self._closed:
+            raise RuntimeError("La base de datos está cerrada")
+        future = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def submit(self, sql, params=()):
+        """Encolar una sentencia sin esperar; devuelve un Future con el lastrowid"""
+        return self.write(lambda conn: conn.execute(sql, params).lastrowid)
+
+    def execute(self, sql, params=()):
+        """Ejecutar una sentencia de escritura y esperar su lastrowid"""
+        return self.submit(sql, params).result()
+
+    def executemany(self, sql, rows):
+        """Varias filas en una sola transacción; espera y devuelve cuántas se escribieron"""
+        rows = list(rows)
+        return self.write(lambda conn: conn.executemany(sql, rows).rowcount).result()
+
+    @contextmanager
+    def reader(self):
+        """Conexión de solo lectura prestada del pool"""
+        with self._pool:
+            while not self._idle and not self._closed:
+                self._pool.wait()
+            if self._closed:
+                raise RuntimeError("La base de datos está cerrada")
+            conn = self._idle.pop()
+            self._borrowed.add(conn)
+        try:
+            yield conn
+        finally:
+            with self._pool:
+                self._borrowed.discard(conn)
+                if self._closed:
+                    conn.close()
+                else:
+                    self._idle.append(conn)
+                self._pool.notify_all()
+
+    def query(self, sql, params=()):
+        """Todas las filas de una consulta de lectura"""
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=()):
+        """Primera fila de una consulta de lectura, o None"""
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def close(self, timeout=5.0):
+        """Terminar las escrituras pendientes y cerrar todas las conexiones"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        with self._pool:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+            # Despertar a quien espera un lector (recibe el error) y dar tiempo a las lecturas en curso
+            self._pool.notify_all()
+            self._pool.wait_for(lambda: not self._borrowed, timeout)
+            for conn in self._borrowed:
+                conn.close()
+        with _registry_lock:
+            if _registry.get(self.path) is self:
+                del _registry[self.path]
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_database(path):
+    """Instancia compartida por ruta: todos los módulos usan el mismo escritor"""
+    key = os.path.abspath(path)
+    with _registry_lock:
+        if key not in _registry:
+            db = Database(key)
+            db.write(create_schema).result()
+            _registry[key] = db
+        return _registry[key]
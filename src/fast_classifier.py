@@ -0,0 +1,193 @@
+"""
+Clasificador rápido de comandos para Angie
+Naive Bayes multinomial sobre n-gramas de palabras con hashing: responde en microsegundos
+y solo se consulta el LSTM cuando su confianza no llega al umbral
+"""
+
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from latency_stats import LatencyStats
+from text_vectorizer import clean_text
+
+DEFAULT_FEATURES = 2 ** 15
+
+
+def hashed_ngrams(text, n_features=DEFAULT_FEATURES, ngrams=(1, 2)):
+    """Índices (con hash estable crc32) de los n-gramas de palabras del texto limpio"""
+    words = clean_text(text).split()
+    grams = []
+    for n in range(ngrams[0], ngrams[1] + 1):
+        grams.extend(' '.join(words[i:i + n]) for i in range(len(words) - n + 1))
+    return np.array([zlib.crc32(g.encode('utf-8')) % n_features for g in grams], dtype=np.int64)
+
+
+class HashedNaiveBayes:
+    """Naive Bayes multinomial con suavizado de Laplace sobre características con hashing"""
+
+    def __init__(self, n_features=DEFAULT_FEATURES, alpha=0.5):
+        self.n_features = n_features
+        self.alpha = alpha
+        self.classes = np.array([], dtype=str)
+        # Se guardan los conteos: partial_fit suma filas nuevas sin reentrenar desde cero
+        self.class_count = np.zeros(0, dtype=np.float64)
+        self.feature_count = np.zeros((0, n_features), dtype=np.float32)
+        self.class_log_prior = None
+        self.feature_log_prob = None
+
+    def fit(self, texts, labels):
+        self.classes = np.array([], dtype=str)
+        self.class_count = np.zeros(0, dtype=np.float64)
+        self.feature_count = np.zeros((0, self.n_features), dtype=np.float32)
+        return self.partial_fit(texts, labels)
+
+    def partial_fit(self, texts, labels):
+        """Añadir ejemplos (y clases nuevas) al modelo; el coste depende solo de los ejemplos nuevos"""
+        labels = np.asarray(labels, dtype=str)
+        new_classes = [c for c in np.unique(labels) if c not in set(self.classes.tolist())]
+        if new_classes:
+            self.classes = np.concatenate([self.classes, new_classes])
+            self.class_count = np.concatenate([self.class_count, np.zeros(len(new_classes))])
+            self.feature_count = np.vstack([self.feature_count,
+                                            np.zeros((len(new_classes), self.n_features), dtype=np.float32)])
+        index = {c: i for i, c in enumerate(self.classes.tolist())}
+        for text, label in zip(texts, labels.tolist()):
+            row = index[label]
+            self.class_count[row] += 1
+            np.add.at(self.feature_count[row], hashed_ngrams(text, self.n_features), 1.0)
+        self._update_log_probs()
+        return self
+
+    def _update_log_probs(self):
+        self.class_log_prior = np.log(self.class_count / self.class_count.sum())
+        smoothed = self.feature_count + self.alpha
+        self.feature_log_prob = (np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))).astype(np.float32)
+
+    def predict_proba(self, text):
+        features = hashed_ngrams(text, self.n_features)
+        joint = self.class_log_prior + self.feature_log_prob[:, features].sum(axis=1)
+        joint = np.exp(joint - joint.max())
+        return joint / joint.sum()
+
+    def predict(self, text):
+        """Misma salida que AngieLSTMTrainer.predict_command_type"""
+        probs = self.predict_proba(text)
+        best = int(np.argmax(probs))
+        return {
+            'command_type': self.classes[best],
+            'confidence': float(probs[best]),
+            'all_probabilities': dict(zip(self.classes, probs.tolist())),
+        }
+
+    def accuracy(self, texts, labels):
+        hits = sum(self.predict(t)['command_type'] == str(l) for t, l in zip(texts, labels))
+        return hits / len(texts) if len(texts) else 0.0
+
+    def save(self, path):
+        np.savez_compressed(path, classes=self.classes, class_count=self.class_count,
+                            feature_count=self.feature_count, alpha=self.alpha)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        model = cls(n_features=data['feature_count'].shape[1], alpha=float(data['alpha']))
+        model.classes = data['classes']
+        model.class_count = data['class_count']
+        model.feature_count = data['feature_count']
+        model._update_log_probs()
+        return model
+
+
+def load_fast_classifier(path):
+    """Modelo guardado por el entrenador, o None si no existe o no se puede leer"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return HashedNaiveBayes.load(path)
+    except Exception as e:
+        print(f"⚠️ No se pudo cargar el clasificador rápido: {e}")
+        return None
+
+
+class TieredClassifier:
+    """Primero el clasificador rápido; el lento (LSTM) solo por debajo del umbral de confianza"""
+
+    def __init__(self, fast=None, slow_submit=None, threshold=0.85):
+        self.fast = fast
+        # slow_submit(texto, callback) entrega la predicción del LSTM (o None) por callback
+        self.slow_submit = slow_submit
+        self.threshold = threshold
+        self.fast_latency = LatencyStats("Nivel rápido")
+        self.slow_latency = LatencyStats("Nivel LSTM")
+        self.fast_served = 0
+        self.slow_served = 0
+        # Consultas dudosas en las que el LSTM no respondió y se usó el resultado rápido
+        self.fallback_served = 0
+        self._lock = threading.Lock()
+
+    def classify_async(self, text, callback):
+        """Clasificar y entregar el resultado (con 'tier') por callback"""
+        start = time.perf_counter()
+        fast_result = None
+        if self.fast is not None:
+            fast_result = self.fast.predict(text)
+            self.fast_latency.record(time.perf_counter() - start)
+            if fast_result['confidence'] >= self.threshold or self.slow_submit is None:
+                with self._lock:
+                    self.fast_served += 1
+                callback(dict(fast_result, tier='fast'))
+                return
+
+        if self.slow_submit is None:
+            callback(None)
+            return
+
+        def on_slow(result):
+            if result is not None:
+                self.slow_latency.record(time.perf_counter() - start)
+                with self._lock:
+                    self.slow_served += 1
+                callback(dict(result, tier='lstm'))
+                return
+            # Sin LSTM disponible se devuelve lo que dijo el nivel rápido
+            with self._lock:
+                self.fallback_served += 1
+            callback(dict(fast_result, tier='fast') if fast_result else None)
+
+        self.slow_submit(text, on_slow)
+
+    def classify(self, text, timeout=5.0):
+        """Versión síncrona de classify_async"""
+        done = threading.Event()
+        box = []
+        self.classify_async(text, lambda result: (box.append(result), done.set()))
+        done.wait(timeout)
+        return box[0] if box else None
+
+    def stats(self):
+        total = self.fast_served + self.slow_served + self.fallback_served
+        fast_p50 = self.fast_latency.percentile(50)
+        slow_p50 = self.slow_latency.percentile(50)
+        return {
+            'total': total,
+            'fast_share': self.fast_served / total if total else 0.0,
+            'slow_share': self.slow_served / total if total else 0.0,
+            'fallback_share': self.fallback_served / total if total else 0.0,
+            'fast_p50_ms': fast_p50 * 1000,
+            'slow_p50_ms': slow_p50 * 1000,
+            # Tiempo ahorrado estimado: peticiones rápidas × diferencia de medianas
+            'saved_ms': self.fast_served * max(0.0, slow_p50 - fast_p50) * 1000 if self.slow_served else 0.0,
+        }
+
+    def summary(self):
+        s = self.stats()
+        if not s['total']:
+            return "Clasificación por niveles: sin peticiones"
+        return (f"Clasificación por niveles: rápido {s['fast_share']:.0%} (p50={s['fast_p50_ms']:.2f} ms), "
+                f"LSTM {s['slow_share']:.0%} (p50={s['slow_p50_ms']:.1f} ms), "
+                f"rápido sin LSTM {s['fallback_share']:.0%}, "
+                f"ahorro estimado {s['saved_ms']:.0f} ms")
@@ -0,0 +1,102 @@
+"""
+Respuestas de Gemini en streaming para Angie
+Divide el flujo de tokens en frases para empezar a hablar antes de que termine la generación
+"""
+
+import re
+import time
+
+# Fin de frase: signo de cierre seguido de espacio, o salto de línea
+_SENTENCE_END = re.compile(r'(?<=[.!?…:;])\s+|\n+')
+
+
+class SentenceChunker:
+    """Acumula texto parcial y devuelve las frases completas"""
+
+    def __init__(self, min_chars=25):
+        # Frases muy cortas ("Sí.", "Sr.") se juntan con la siguiente
+        self.min_chars = min_chars
+        self.buffer = ''
+
+    def feed(self, text):
+        """Añadir texto y devolver la lista de frases ya completas"""
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self.buffer):
+            candidate = self.buffer[start:match.start()].strip()
+            if len(candidate) < self.min_chars and '\n' not in match.group(0):
+                continue
+            if candidate:
+                sentences.append(candidate)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self):
+        """Devolver lo que quede pendiente al terminar el flujo"""
+        rest = self.buffer.strip()
+        self.buffer = ''
+        return [rest] if rest else []
+
+
+def _chunk_text(chunk):
+    try:
+        return chunk.text
+    except Exception:
+        # Fragmentos sin texto (p. ej. bloqueados por seguridad) se ignoran
+        return ''
+
+
+def stream_reply(model, prompt, on_sentence, chunker=None):
+    """Generar en streaming y llamar on_sentence por cada frase completa.
+    Devuelve (texto completo, segundos hasta la primera frase o None)"""
+    chunker = chunker or SentenceChunker()
+    start = time.perf_counter()
+    first_sentence = None
+    parts = []
+
+    def emit(sentences):
+        nonlocal first_sentence
+        for sentence in sentences:
+            if first_sentence is None:
+                first_sentence = time.perf_counter() - start
+            on_sentence(sentence)
+
+    response = model.generate_content(prompt, stream=True)
+    for chunk in response:
+        text = _chunk_text(chunk)
+        if text:
+            parts.append(text)
+            emit(chunker.feed(text))
+    emit(chunker.flush())
+    return ''.join(parts), first_sentence
+
+
+class _FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """Modelo falso compatible con generate_content(prompt, stream=...) para pruebas sin conexión"""
+
+    def __init__(self, reply="Hola, soy una respuesta de prueba.", chunk_size=8, delay=0.0):
+        self.reply = reply
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self.prompts = []
+
+    def _chunks(self):
+        for i in range(0, len(self.reply), self.chunk_size):
+            if self.delay:
+                time.sleep(self.delay)
+            yield _FakeChunk(self.reply[i:i + self.chunk_size])
+
+    def generate_content(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        if stream:
+            return self._chunks()
+        if self.delay:
+            time.sleep(self.delay * len(range(0, len(self.reply), self.chunk_size)))
+        return _FakeChunk(self.reply)
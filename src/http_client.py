@@ -0,0 +1,154 @@
+"""
+Cliente HTTP compartido para las APIs externas de Angie
+Sesión con conexiones persistentes por host, timeouts por defecto, reintentos con espera
+aleatoria en 5xx/429 y fallos de conexión, límite de peticiones simultáneas por host
+e histogramas de latencia
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from latency_stats import LatencyStats
+
+# (conexión, lectura) en segundos: una API colgada nunca bloquea más de esto por intento
+DEFAULT_TIMEOUT = (3.05, 10)
+# Para peticiones que espera el usuario (p. ej. desde el hilo de voz): mejor fallar pronto
+INTERACTIVE_TIMEOUT = (2, 4)
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class HttpClient:
+    """Sesión requests compartida con pool por host, reintentos y métricas"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=2, backoff=0.5, max_backoff=8.0,
+                 per_host_limit=4, pool_maxsize=10):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.per_host_limit = per_host_limit
+        self.session = requests.Session()
+        # Un pool keep-alive por host: el TLS se negocia una vez y se reutiliza
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self._host_slots = {}
+        self._host_stats = {}
+        self.requests_sent = 0
+        self.retried = 0
+        self.failures = 0
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_stats[host] = LatencyStats(host)
+            return self._host_slots[host], self._host_stats[host]
+
+    def _delay(self, attempt, response=None):
+        """Espera antes del siguiente intento: Retry-After si viene, si no backoff exponencial con jitter"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def request(self, method, url, timeout=None, retries=None, retry_read_timeouts=False, **kwargs):
+        """Petición con reintentos. Lanza las excepciones de requests como antes;
+        si se agotan los reintentos por estado HTTP se devuelve la última respuesta.
+        Un timeout de lectura no se reintenta salvo con retry_read_timeouts: la API ya tardó
+        el timeout entero y repetirlo multiplica la espera del llamador"""
+        host = urlsplit(url).netloc
+        slot, stats = self._slot(host)
+        timeout = timeout if timeout is not None else self.timeout
+        retries = self.retries if retries is None else retries
+        attempt = 0
+        while True:
+            with slot:
+                start = time.perf_counter()
+                try:
+                    self._count('requests_sent')
+                    response = self.session.request(method, url, timeout=timeout, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    stats.record(time.perf_counter() - start)
+                    read_timeout = isinstance(e, requests.exceptions.ReadTimeout)
+                    if attempt >= retries or (read_timeout and not retry_read_timeouts):
+                        self._count('failures')
+                        raise
+                    response = None
+                else:
+                    stats.record(time.perf_counter() - start)
+                    if response.status_code not in RETRY_STATUS or attempt >= retries:
+                        return response
+                    # Devolver la conexión al pool antes de esperar
+                    response.close()
+            self._count('retried')
+            time.sleep(self._delay(attempt, response))
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        """GET con los valores por defecto del cliente"""
+        return self.request('GET', url, **kwargs)
+
+    def stats(self):
+        """Resumen de latencias por host (incluye histograma)"""
+        with self._lock:
+            hosts = dict(self._host_stats)
+        return {
+            host: dict(stats.snapshot(), histogram=stats.histogram())
+            for host, stats in hosts.items()
+        }
+
+    def close(self):
+        self.session.close()
+
+
+def first_usable(calls, usable):
+    """Lanzar todas las llamadas a la vez y devolver (índice, resultado) del primer resultado
+    utilizable en orden de prioridad, o (None, None). El resto se cancela.
+    También devuelve la lista de resultados o excepciones recibidos, para diagnóstico"""
+    outcomes = []
+    if not calls:
+        return None, None, outcomes
+    executor = ThreadPoolExecutor(max_workers=len(calls))
+    try:
+        futures = [executor.submit(call) for call in calls]
+        for index, future in enumerate(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                outcomes.append(e)
+                continue
+            outcomes.append(result)
+            if usable(result):
+                for pending in futures[index + 1:]:
+                    pending.cancel()
+                return index, result, outcomes
+        return None, None, outcomes
+    finally:
+        # Las peticiones ya en vuelo terminan solas (acotadas por el timeout); no se esperan
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_http_client():
+    """Cliente compartido por toda la aplicación"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
@@ -0,0 +1,131 @@
+"""
+Estado y métricas de deriva del reentrenamiento incremental de Angie
+Guarda hasta qué interacción se ha entrenado (marca de agua) y decide si basta con
+ajustar el modelo con las filas nuevas o hace falta reentrenar desde cero
+"""
+
+import json
+import math
+import os
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+# Umbrales por defecto para pedir un reentrenamiento completo
+MAX_OOV_RATE = 0.3
+MAX_LABEL_SHIFT = 0.3
+# Además de la distancia, el cambio debe ser significativo para el tamaño del lote (chi-cuadrado)
+LABEL_SHIFT_P_VALUE = 0.01
+# Reentrenar desde cero cuando las filas añadidas desde el último completo superan esta fracción
+MAX_GROWTH = 1.0
+
+
+def state_path(filename):
+    return f'{filename}_state.json'
+
+
+def load_training_state(filename):
+    """Estado guardado junto al modelo, o None si no hay (modelo antiguo o sin entrenar)"""
+    try:
+        with open(state_path(filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def save_training_state(filename, state):
+    state = dict(state, updated=datetime.now().isoformat(timespec='seconds'))
+    tmp = state_path(filename) + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, state_path(filename))
+    return state
+
+
+def new_state(last_id, labels=(), label_counts=None):
+    """Estado tras un entrenamiento completo (etiquetas una a una o ya contadas)"""
+    counts = Counter(label_counts or {})
+    counts.update(str(l) for l in labels)
+    return {
+        'last_id': int(last_id),
+        'rows_at_full': sum(counts.values()),
+        'rows_since_full': 0,
+        'label_counts': dict(counts),
+        'mode': 'full',
+    }
+
+
+def advance_state(state, last_id, labels):
+    """Estado tras un ajuste incremental con las etiquetas nuevas"""
+    counts = Counter(state.get('label_counts', {}))
+    counts.update(str(l) for l in labels)
+    return dict(state, last_id=int(last_id), rows_since_full=state.get('rows_since_full', 0) + len(labels),
+                label_counts=dict(counts), mode='incremental')
+
+
+def total_variation(p_counts, q_counts):
+    """Distancia de variación total entre dos distribuciones dadas como conteos"""
+    p_total = sum(p_counts.values()) or 1
+    q_total = sum(q_counts.values()) or 1
+    keys = set(p_counts) | set(q_counts)
+    return 0.5 * sum(abs(p_counts.get(k, 0) / p_total - q_counts.get(k, 0) / q_total) for k in keys)
+
+
+def chi_square_pvalue(reference_counts, new_counts):
+    """Valor p de la prueba chi-cuadrado de bondad de ajuste de los conteos nuevos frente a la
+    distribución de referencia; con pocas filas nuevas hace falta un cambio mayor para ser significativo"""
+    keys = sorted(set(reference_counts) | set(new_counts))
+    n = sum(new_counts.values())
+    if len(keys) < 2 or not n or not sum(reference_counts.values()):
+        return 1.0
+    # Suavizado para que una clase ausente en la referencia no dé una frecuencia esperada nula
+    reference = np.array([reference_counts.get(k, 0) + 0.5 for k in keys], dtype=float)
+    expected = n * reference / reference.sum()
+    observed = np.array([new_counts.get(k, 0) for k in keys], dtype=float)
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    # Cola de la chi-cuadrado con la aproximación de Wilson-Hilferty (sin depender de scipy)
+    df = len(keys) - 1
+    z = ((statistic / df) ** (1 / 3) - (1 - 2 / (9 * df))) / math.sqrt(2 / (9 * df))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def oov_rate(texts, vectorizer):
+    """Fracción de palabras que el vocabulario del modelo no conoce"""
+    tokens = [t for text in texts for t in vectorizer.split(text)]
+    if not tokens:
+        return 0.0
+    ids = vectorizer.lookup(np.array(tokens, dtype=str))
+    unknown = (ids < 0) | (ids == vectorizer.oov_index) | (ids >= vectorizer.bucket_base)
+    return float(unknown.mean())
+
+
+def drift_report(state, texts, labels, vectorizer, known_classes):
+    """Métricas de las filas nuevas frente a lo que ya vio el modelo"""
+    labels = [str(l) for l in labels]
+    known = set(str(c) for c in known_classes)
+    rows_at_full = max(1, state.get('rows_at_full', 0))
+    new_counts = Counter(labels)
+    return {
+        'new_rows': len(labels),
+        'new_labels': sorted(set(labels) - known),
+        'oov_rate': oov_rate(texts, vectorizer),
+        'label_shift': total_variation(state.get('label_counts', {}), new_counts),
+        'label_shift_p': chi_square_pvalue(state.get('label_counts', {}), new_counts),
+        'growth': (state.get('rows_since_full', 0) + len(labels)) / rows_at_full,
+    }
+
+
+def full_retrain_reason(report, max_oov_rate=MAX_OOV_RATE, max_label_shift=MAX_LABEL_SHIFT,
+                        max_growth=MAX_GROWTH, label_shift_p_value=LABEL_SHIFT_P_VALUE):
+    """Motivo para reentrenar desde cero, o None si basta con el ajuste incremental"""
+    if report['new_labels']:
+        return f"tipos de comando nuevos: {', '.join(report['new_labels'])}"
+    if report['oov_rate'] > max_oov_rate:
+        return f"{report['oov_rate']:.0%} de palabras fuera del vocabulario"
+    if report['label_shift'] > max_label_shift and report['label_shift_p'] < label_shift_p_value:
+        return (f"la distribución de comandos cambió ({report['label_shift']:.2f}, "
+                f"p={report['label_shift_p']:.3g})")
+    if report['growth'] > max_growth:
+        return f"el historial creció un {report['growth']:.0%} desde el último entrenamiento completo"
+    return None
@@ -0,0 +1,165 @@
+"""
+Enrutador de intenciones compilado para Angie
+Tabla declarativa de intenciones compilada en una única expresión regular
+"""
+
+import re
+
+_ACCENTS = str.maketrans('áéíóúüàèìòù', 'aeiouuaeiou')
+
+
+def normalize_text(text):
+    """Pasar a minúsculas y quitar acentos para comparar palabras clave"""
+    text = text.lower()
+    return text if text.isascii() else text.translate(_ACCENTS)
+
+
+def _trie_pattern(words):
+    """Compilar las palabras como un trie de regex: el coste no crece con la tabla"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Cuantificador voraz: se prefiere siempre la palabra clave más larga
+        return '(?:' + body + ')?' if '' in node else body
+
+    return emit(trie) if trie else '(?!)'
+
+
+class Intent:
+    """Entrada de la tabla de intenciones"""
+
+    def __init__(self, name, command_type, keywords, priority, hints=()):
+        self.name = name
+        self.command_type = command_type
+        self.keywords = list(keywords)
+        self.priority = priority
+        # Las pistas solo cuentan para clasificar (LSTM), no para despachar
+        self.hints = list(hints)
+
+
+# Tabla de intenciones: gana la de mayor prioridad entre todas las coincidencias.
+# Las palabras clave son palabras completas: plurales y formas verbales van aparte
+INTENT_TABLE = [
+    Intent('music', 'music', ['reproduce', 'reproducir'], 100, hints=['música', 'spotify', 'youtube']),
+    Intent('notes_help', 'notes', ['ayuda notas', 'ayuda de notas'], 95),
+    Intent('notes_search', 'notes', ['buscar nota', 'buscar notas', 'buscar en notas', 'buscar en mis notas'], 90),
+    Intent('notes_show', 'notes', ['ver notas', 'mostrar notas', 'mis notas'], 90),
+    Intent('notes_summary', 'notes', ['cuántas notas', 'resumen de notas'], 90),
+    Intent('notes_read', 'notes', ['leer notas'], 90),
+    Intent('notes_create', 'notes', ['crear nota', 'nueva nota', 'tomar nota', 'anota', 'anotar'], 85),
+    Intent('time', 'time', ['hora', 'horas'], 80, hints=['qué día']),
+    # "tiempo" solo es clima cuando no aparece "hora" en el mismo comando
+    Intent('weather', 'weather', ['clima', 'tiempo'], 70, hints=['temperatura', 'lluvia']),
+    Intent('news', 'news', ['noticias', 'noticia'], 60, hints=['actualidad']),
+    Intent('search', 'search', ['busca', 'buscar'], 50, hints=['encuentra', 'información']),
+    Intent('note', 'notes', ['nota', 'notas'], 40, hints=['escribe', 'apunta']),
+    Intent('screenshot', 'screenshot', ['captura', 'capturar', 'screenshot'], 35, hints=['pantalla']),
+    Intent('system', 'system', ['sistema', 'computadora'], 35, hints=['cpu', 'ram', 'disco']),
+    Intent('reminder', 'reminder', ['recordatorio', 'recordatorios', 'recordar'], 30),
+    Intent('tasks', 'tasks', ['tarea', 'tareas', 'agregar tarea'], 30, hints=['pendiente', 'pendientes']),
+    Intent('navigation', 'navigation', ['abre', 'navega', 'navegar'], 25, hints=['ir a', 'visita']),
+    Intent('goodbye', 'chat', ['descansa', 'adiós', 'bye'], 20),
+    Intent('chat', 'chat', [], 0, hints=['hola', 'cómo estás', 'chiste', 'conversa']),
+]
+
+# Categorías de noticias reconocidas dentro de un comando de noticias
+NEWS_CATEGORY_TABLE = [
+    Intent('sports', 'news', ['deportes', 'deporte'], 60),
+    Intent('technology', 'news', ['tecnología'], 50),
+    Intent('science', 'news', ['ciencia'], 40),
+    Intent('health', 'news', ['salud'], 30),
+    Intent('business', 'news', ['negocios', 'economía'], 20),
+    Intent('entertainment', 'news', ['entretenimiento'], 10),
+    Intent('general', 'news', ['rápidas', 'resumen'], 0),
+]
+
+# Palabras clave de notes_search, con límites de palabra ("buscar notas compras" → "compras")
+_NOTES_SEARCH_PREFIX = re.compile(r'\bbuscar\s+(?:en\s+(?:mis\s+)?notas?|notas?)\b\s*', re.IGNORECASE)
+
+
+def notes_search_term(command):
+    """Término de búsqueda de un comando de notes_search (vacío si no hay)"""
+    return _NOTES_SEARCH_PREFIX.sub('', command, count=1).strip()
+
+
+class IntentMatch:
+    """Resultado del enrutado: intención elegida y palabras clave encontradas"""
+
+    def __init__(self, intent, keywords):
+        self.intent = intent
+        self.name = intent.name
+        self.command_type = intent.command_type
+        self.keywords = keywords
+
+    def __repr__(self):
+        return f"IntentMatch({self.name!r}, keywords={self.keywords!r})"
+
+
+class IntentRouter:
+    """Compila una tabla de intenciones en una sola regex y enruta en una pasada"""
+
+    def __init__(self, table=None):
+        self.table = list(INTENT_TABLE if table is None else table)
+        # palabra clave normalizada -> [(índice de intención, es_pista)]
+        self._owners = {}
+        for index, intent in enumerate(self.table):
+            for keyword in intent.keywords:
+                self._owners.setdefault(normalize_text(keyword), []).append((index, False))
+            for hint in intent.hints:
+                self._owners.setdefault(normalize_text(hint), []).append((index, True))
+
+        # Trie voraz: "buscar nota" gana a "busca" en la misma posición; límites de palabra
+        # a ambos lados ("hora" no está en "ahora" ni en "horario")
+        self.pattern = re.compile(r'(?<!\w)' + _trie_pattern(self._owners) + r'(?!\w)')
+
+    def find_all(self, text):
+        """Devolver todas las palabras clave encontradas en el texto"""
+        return [m.group(0) for m in self.pattern.finditer(normalize_text(text))]
+
+    def _best(self, found, include_hints):
+        best_index = None
+        matched = {}
+        for keyword in found:
+            for index, is_hint in self._owners[keyword]:
+                if is_hint and not include_hints:
+                    continue
+                matched.setdefault(index, []).append(keyword)
+                if best_index is None:
+                    best_index = index
+                    continue
+                current, best = self.table[index], self.table[best_index]
+                # A igual prioridad gana la que aparece antes en la tabla
+                if (current.priority, -index) > (best.priority, -best_index):
+                    best_index = index
+        if best_index is None:
+            return None
+        return IntentMatch(self.table[best_index], matched[best_index])
+
+    def route(self, text):
+        """Elegir la intención a despachar (None si ninguna palabra clave coincide)"""
+        return self._best(self.find_all(text), include_hints=False)
+
+    def classify(self, text, default='chat'):
+        """Tipo de comando para el registro LSTM, usando también las pistas"""
+        match = self._best(self.find_all(text), include_hints=True)
+        return match.command_type if match else default
+
+
+_default_router = None
+
+
+def get_default_router():
+    """Router compartido con la tabla por defecto (se compila una sola vez)"""
+    global _default_router
+    if _default_router is None:
+        _default_router = IntentRouter()
+    return _default_router
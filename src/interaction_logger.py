@@ -0,0 +1,101 @@
+"""
+Registro de interacciones por lotes para Angie
+Las filas se acumulan en memoria y se escriben con executemany en una sola transacción
+"""
+
+import threading
+from datetime import datetime, timezone
+
+INSERT_INTERACTION = '''
+    INSERT INTO interactions (user_input, assistant_response, command_type, confidence, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+
+def sqlite_timestamp():
+    """Marca de tiempo en el formato de CURRENT_TIMESTAMP (UTC), tomada al registrar y no al escribir"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class InteractionLogger:
+    """Búfer de interacciones que se vacía por tamaño, por tiempo o al cerrar"""
+
+    def __init__(self, db, batch_size=32, flush_interval=2.0, max_buffer=5000, on_flush=None):
+        self.db = db
+        # Se llama tras cada lote escrito (p. ej. para actualizar las estadísticas)
+        self.on_flush = on_flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Si la base de datos no da abasto se descartan las filas más antiguas
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._running = True
+        self.logged = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def log(self, user_input, assistant_response, command_type="unknown", confidence=0.0):
+        """Añadir una interacción al búfer (no toca el disco)"""
+        row = (user_input, assistant_response, command_type, confidence, sqlite_timestamp())
+        with self._cond:
+            if len(self._buffer) >= self.max_buffer:
+                self._buffer.pop(0)
+                self.dropped += 1
+            self._buffer.append(row)
+            self.logged += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self):
+        """Escribir ya todo lo pendiente en una transacción; devuelve las filas escritas"""
+        with self._flush_lock:
+            with self._cond:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            try:
+                self.db.executemany(INSERT_INTERACTION, rows)
+            except Exception as e:
+                self.failed += len(rows)
+                print(f"❌ Error registrando {len(rows)} interacciones: {e}")
+                return 0
+            self.flushed += len(rows)
+            self.flushes += 1
+            if self.on_flush is not None:
+                self.on_flush()
+            return len(rows)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._running and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if not self._running:
+                    return
+            self.flush()
+
+    def close(self):
+        """Detener el hilo y vaciar el búfer antes de cerrar la base de datos"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(2.0)
+        self.flush()
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._buffer)
+        return {
+            'logged': self.logged,
+            'flushed': self.flushed,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'flushes': self.flushes,
+            'pending': pending,
+        }
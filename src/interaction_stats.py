@@ -0,0 +1,178 @@
+"""
+Estadísticas incrementales de las interacciones de Angie
+Tablas de resumen que se actualizan solo con las filas nuevas (id mayor que el último procesado),
+de modo que consultar las estadísticas no depende del tamaño del historial
+"""
+
+import threading
+from collections import deque
+
+STATS_SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS interaction_stats_state (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS interaction_type_counts (
+        command_type TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS interaction_hourly (
+        hour INTEGER PRIMARY KEY,
+        count INTEGER NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS interaction_vocabulary (
+        word TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    )
+    ''',
+)
+
+_SUMMARY_TABLES = ('interaction_stats_state', 'interaction_type_counts',
+                   'interaction_hourly', 'interaction_vocabulary')
+
+
+def ensure_stats_tables(conn):
+    """Crear las tablas de resumen si no existen"""
+    for statement in STATS_SCHEMA:
+        conn.execute(statement)
+
+
+def _hour(timestamp):
+    """Hora (0-23) de una marca 'AAAA-MM-DD HH:MM:SS', o None si no tiene ese formato"""
+    try:
+        return int(timestamp[11:13])
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_state(conn, key):
+    row = conn.execute("SELECT value FROM interaction_stats_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else 0
+
+
+class InteractionStats:
+    """Agregados de interactions: total, tipos de comando, vocabulario, histograma por hora
+    y las últimas N interacciones"""
+
+    def __init__(self, db, recent_size=10, chunk_size=1000):
+        self.db = db
+        self.chunk_size = chunk_size
+        self._recent = deque(maxlen=recent_size)
+        self._recent_id = 0
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.rows_processed = 0
+        self._load_recent()
+
+    def _load_recent(self):
+        rows = self.db.query(
+            "SELECT id, user_input, command_type, timestamp FROM interactions ORDER BY id DESC LIMIT ?",
+            (self._recent.maxlen,))
+        with self._lock:
+            self._recent.clear()
+            self._recent_id = 0
+            self._push_recent(reversed(rows))
+
+    def _push_recent(self, rows):
+        # Llamar con self._lock; las filas ya presentes (por id) se ignoran
+        for row_id, user_input, command_type, timestamp in rows:
+            if row_id > self._recent_id:
+                self._recent.append({'user_input': user_input, 'command_type': command_type,
+                                     'timestamp': timestamp})
+                self._recent_id = row_id
+
+    def refresh(self):
+        """Procesar en el hilo escritor las filas nuevas; devuelve un Future con cuántas"""
+        return self.db.write(self._apply)
+
+    def _apply(self, conn):
+        last_id = _get_state(conn, 'last_id')
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM interactions").fetchone()[0]
+        if max_id < last_id:
+            # La tabla se vació o se recreó: se recalcula desde cero
+            for table in _SUMMARY_TABLES:
+                conn.execute(f"DELETE FROM {table}")
+            last_id = 0
+            with self._lock:
+                self._recent.clear()
+                self._recent_id = 0
+
+        processed = 0
+        while True:
+            rows = conn.execute(
+                "SELECT id, user_input, command_type, timestamp FROM interactions "
+                "WHERE id > ? ORDER BY id LIMIT ?", (last_id, self.chunk_size)).fetchall()
+            if not rows:
+                break
+            self._apply_chunk(conn, rows)
+            last_id = rows[-1][0]
+            processed += len(rows)
+
+        if processed:
+            conn.execute("INSERT OR REPLACE INTO interaction_stats_state (key, value) VALUES ('last_id', ?)",
+                         (last_id,))
+            self.rows_processed += processed
+        self.refreshes += 1
+        return processed
+
+    def _apply_chunk(self, conn, rows):
+        types = {}
+        hours = {}
+        words = {}
+        for _, user_input, command_type, timestamp in rows:
+            if command_type is not None:
+                types[command_type] = types.get(command_type, 0) + 1
+            hour = _hour(timestamp)
+            if hour is not None:
+                hours[hour] = hours.get(hour, 0) + 1
+            for word in (user_input or '').lower().split():
+                words[word] = words.get(word, 0) + 1
+
+        conn.executemany(
+            "INSERT INTO interaction_type_counts (command_type, count) VALUES (?, ?) "
+            "ON CONFLICT(command_type) DO UPDATE SET count = count + excluded.count", types.items())
+        conn.executemany(
+            "INSERT INTO interaction_hourly (hour, count) VALUES (?, ?) "
+            "ON CONFLICT(hour) DO UPDATE SET count = count + excluded.count", hours.items())
+
+        # Las palabras que no existían son las que inserta INSERT OR IGNORE
+        before = conn.total_changes
+        conn.executemany("INSERT OR IGNORE INTO interaction_vocabulary (word, count) VALUES (?, 0)",
+                         ((word,) for word in words))
+        new_words = conn.total_changes - before
+        conn.executemany("UPDATE interaction_vocabulary SET count = count + ? WHERE word = ?",
+                         ((count, word) for word, count in words.items()))
+
+        conn.executemany(
+            "INSERT INTO interaction_stats_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+            (('total', len(rows)), ('vocabulary_size', new_words)))
+
+        with self._lock:
+            self._push_recent(rows[-self._recent.maxlen:])
+
+    def snapshot(self):
+        """Estadísticas desde las tablas de resumen, sin recorrer interactions"""
+        with self.db.reader() as conn:
+            state = dict(conn.execute("SELECT key, value FROM interaction_stats_state").fetchall())
+            command_types = dict(conn.execute(
+                "SELECT command_type, count FROM interaction_type_counts ORDER BY count DESC").fetchall())
+            hourly = dict(conn.execute("SELECT hour, count FROM interaction_hourly").fetchall())
+        with self._lock:
+            recent = list(self._recent)
+        return {
+            'total_interactions': state.get('total', 0),
+            'command_types': command_types,
+            'recent_activity': recent,
+            'unique_words': state.get('vocabulary_size', 0),
+            # Horas en UTC, como las marcas de tiempo de interactions
+            'hourly_activity': [hourly.get(hour, 0) for hour in range(24)],
+        }
+
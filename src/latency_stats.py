@@ -0,0 +1,94 @@
+"""
+Contador de latencias para Angie
+Guarda las últimas muestras y calcula media y percentiles
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+
+# Límites superiores (segundos) de los cubos del histograma
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _pick(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+
+class LatencyStats:
+    """Ventana circular de latencias (en segundos) con percentiles"""
+
+    def __init__(self, name, window=500, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.buckets = tuple(buckets)
+        # Un cubo por límite más el de desbordamiento; cuenta todas las muestras
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        """Registrar una muestra de latencia"""
+        with self._lock:
+            self.samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+            self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+
+    def timer(self):
+        """Context manager que registra el tiempo transcurrido dentro del bloque"""
+        return _Timer(self)
+
+    def percentile(self, p):
+        """Percentil p (0-100) de la ventana actual"""
+        with self._lock:
+            ordered = sorted(self.samples)
+        return _pick(ordered, p)
+
+    def histogram(self):
+        """Lista de (límite superior en segundos, muestras); el último límite es inf"""
+        with self._lock:
+            counts = list(self.bucket_counts)
+        return list(zip(self.buckets + (float('inf'),), counts))
+
+    def snapshot(self):
+        """Diccionario con el resumen de la ventana actual"""
+        with self._lock:
+            ordered = sorted(self.samples)
+            count, total = self.count, self.total
+
+        return {
+            'name': self.name,
+            'count': count,
+            'mean': total / count if count else 0.0,
+            'p50': _pick(ordered, 50),
+            'p95': _pick(ordered, 95),
+            'p99': _pick(ordered, 99),
+            'max': ordered[-1] if ordered else 0.0,
+        }
+
+    def summary(self):
+        """Texto corto para mostrar en consola o en el chat"""
+        s = self.snapshot()
+        if not s['count']:
+            return f"{self.name}: sin muestras"
+        return (f"{self.name}: n={s['count']} media={s['mean'] * 1000:.0f} ms "
+                f"p50={s['p50'] * 1000:.0f} ms p95={s['p95'] * 1000:.0f} ms "
+                f"máx={s['max'] * 1000:.0f} ms")
+
+
+class _Timer:
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stats.record(time.perf_counter() - self.start)
+        return False
@@ -0,0 +1,100 @@
+"""
+Importaciones diferidas y tiempos de arranque de Angie
+Las dependencias pesadas se importan la primera vez que se usan (o durante el calentamiento
+en segundo plano) y se anota lo que costó cada una para el informe de arranque
+"""
+
+import importlib
+import threading
+import time
+
+# Referencia para medir el tiempo hasta la primera ventana: el asistente importa este módulo lo primero
+PROCESS_START = time.perf_counter()
+
+_import_times = {}
+_times_lock = threading.Lock()
+
+
+def record_import(name, seconds, deferred):
+    with _times_lock:
+        _import_times[name] = (seconds, deferred)
+
+
+class timed_import:
+    """Contexto para medir una importación que se sigue haciendo al arrancar"""
+
+    def __init__(self, name, deferred=False):
+        self.name = name
+        self.deferred = deferred
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            record_import(self.name, time.perf_counter() - self._start, self.deferred)
+        return False
+
+
+class LazyModule:
+    """Módulo que se importa en el primer acceso a uno de sus atributos"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    record_import(self._name, time.perf_counter() - start, True)
+                    self._module = module
+        return self._module
+
+    @property
+    def _loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'cargado' if self._loaded else 'sin cargar'
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def preload(modules):
+    """Importar varios módulos diferidos; devuelve {nombre: error} de los que no se pudieron cargar"""
+    failed = {}
+    for module in modules:
+        try:
+            module._load()
+        except Exception as e:
+            failed[module._name] = e
+    return failed
+
+
+def import_times():
+    """[(módulo, segundos, diferido)] del más caro al más barato"""
+    with _times_lock:
+        items = [(name, seconds, deferred) for name, (seconds, deferred) in _import_times.items()]
+    return sorted(items, key=lambda item: item[1], reverse=True)
+
+
+def startup_report(marks=None):
+    """Líneas del informe: hitos (nombre → segundos) y coste de importación de cada módulo"""
+    lines = []
+    if marks:
+        lines.append("⏱️ Arranque: " + ", ".join(f"{name} {seconds:.2f} s" for name, seconds in marks.items()))
+    for name, seconds, deferred in import_times():
+        when = 'diferido' if deferred else 'al arrancar'
+        lines.append(f"   {name:<24}{seconds * 1000:>8.0f} ms  ({when})")
+    return lines
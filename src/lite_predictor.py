@@ -0,0 +1,109 @@
+"""
+Clasificador de comandos de Angie sobre TensorFlow Lite
+Usa solo el intérprete ligero (tflite_runtime / ai_edge_litert) y el vocabulario exportado en JSON,
+sin importar TensorFlow ni Keras
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+from text_vectorizer import TextVectorizer
+
+
+def load_interpreter_class():
+    """Clase Interpreter del runtime ligero disponible, o None"""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    # Si TensorFlow ya está cargado por otro módulo, su intérprete no cuesta nada extra
+    tf = sys.modules.get('tensorflow')
+    if tf is not None:
+        return tf.lite.Interpreter
+    return None
+
+
+def model_paths(filename):
+    """Rutas del modelo .tflite y de su vocabulario"""
+    return f'{filename}.tflite', f'{filename}_vocab.json'
+
+
+def lite_available(filename):
+    """Hay modelo exportado y un runtime capaz de ejecutarlo"""
+    return all(os.path.exists(p) for p in model_paths(filename)) and load_interpreter_class() is not None
+
+
+class LiteBackend:
+    """Modelo .tflite exportado por AngieLSTMTrainer.export_tflite; sirve también al LSTMInferenceServer"""
+
+    def __init__(self, filename='angie_lstm_model', num_threads=1, interpreter_class=None):
+        self.model_path, self.vocab_path = model_paths(filename)
+        self.num_threads = num_threads
+        # Por defecto, el runtime ligero que haya instalado
+        self.interpreter_class = interpreter_class
+        self.vectorizer = None
+        self.classes = None
+        self.max_len = None
+        self.interpreter = None
+        self._batch_size = None
+
+    def load(self):
+        with open(self.vocab_path, 'r', encoding='utf-8') as f:
+            vocab = json.load(f)
+        self.vectorizer = TextVectorizer.from_dict(vocab)
+        self.classes = np.array(vocab['classes'])
+        self.max_len = self.vectorizer.max_len
+        interpreter_class = self.interpreter_class or load_interpreter_class()
+        if interpreter_class is None:
+            raise RuntimeError("No hay runtime de TensorFlow Lite instalado")
+        self.interpreter = interpreter_class(model_path=self.model_path, num_threads=self.num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = int(self._input['shape'][0])
+
+    def _resize(self, batch_size):
+        """Adaptar la entrada al tamaño del lote; solo se reserva memoria cuando cambia"""
+        if batch_size == self._batch_size:
+            return
+        self.interpreter.resize_tensor_input(self._input['index'], [batch_size, self.max_len])
+        self.interpreter.allocate_tensors()
+        self._batch_size = batch_size
+
+    def encode(self, texts):
+        return self.vectorizer.encode(texts)
+
+    def predict(self, batch):
+        """Probabilidades de todo el lote con un único invoke"""
+        batch = np.asarray(batch)
+        self._resize(len(batch))
+        self.interpreter.set_tensor(self._input['index'], batch.astype(self._input['dtype']))
+        self.interpreter.invoke()
+        return self._dequantize(self.interpreter.get_tensor(self._output['index']))
+
+    def _dequantize(self, values):
+        scale, zero_point = self._output.get('quantization', (0.0, 0))
+        if scale:
+            return (values.astype(np.float32) - zero_point) * scale
+        return values
+
+    def predict_command_type(self, text):
+        """Misma salida que AngieLSTMTrainer.predict_command_type"""
+        if self.interpreter is None:
+            self.load()
+        probs = self.predict(self.encode([text]))[0]
+        best = int(np.argmax(probs))
+        return {
+            'command_type': self.classes[best],
+            'confidence': float(probs[best]),
+            'all_probabilities': dict(zip(self.classes, probs.tolist())),
+        }
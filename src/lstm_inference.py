@@ -0,0 +1,169 @@
+"""
+Servidor de inferencia LSTM en proceso para Angie
+El modelo se carga y se calienta una sola vez; las peticiones concurrentes se agrupan
+en micro-lotes dentro de un pequeño presupuesto de latencia y se resuelven en un hilo propio
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from latency_stats import LatencyStats
+
+_STOP = object()
+
+
+class KerasBackend:
+    """Modelo Keras guardado por AngieLSTMTrainer (angie_lstm_model.h5 + tokenizer + etiquetas)"""
+
+    def __init__(self, trainer, filename='angie_lstm_model'):
+        self.trainer = trainer
+        self.filename = filename
+        self.max_len = trainer.max_len
+
+    @property
+    def classes(self):
+        # Se lee del entrenador: tras un reentrenamiento se sirven el modelo y las etiquetas nuevas
+        return self.trainer.label_encoder.classes_
+
+    def load(self):
+        if self.trainer.model is None and not self.trainer.load_model(self.filename):
+            raise RuntimeError(f"No se pudo cargar {self.filename}.h5")
+
+    def encode(self, texts):
+        return self.trainer.encode_texts(texts)
+
+    def predict(self, batch):
+        # predict_on_batch evita la sobrecarga de model.predict (dataset, callbacks, progreso)
+        return np.asarray(self.trainer.model.predict_on_batch(batch))
+
+
+class LSTMInferenceServer:
+    """Hilo residente que agrupa peticiones y entrega cada resultado por callback o Future"""
+
+    def __init__(self, backend, max_batch=16, max_wait=0.005):
+        self.backend = backend
+        self.max_batch = max_batch
+        # Tiempo máximo que la primera petición de un lote espera a que lleguen más
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = None
+        self._stopped = False
+        self.ready = threading.Event()
+        self.error = None
+        self.latency = LatencyStats("Inferencia LSTM")
+        self.batches = 0
+        self.requests = 0
+
+    def start(self):
+        """Cargar y calentar el modelo en el hilo del servidor; no bloquea al llamador"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        self.backend.load()
+        # Lote ficticio: la primera predicción real no paga la construcción del grafo
+        dummy = np.zeros((self.max_batch, self.backend.max_len), dtype=np.int32)
+        self.backend.predict(dummy[:1])
+        self.backend.predict(dummy)
+
+    def submit(self, text, callback=None):
+        """Encolar un texto; devuelve un Future con el resultado.
+        callback(resultado) se llama en el hilo del servidor (resultado None si falla)"""
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(lambda f: callback(None if f.exception() else f.result()))
+        if self._stopped:
+            future.set_exception(RuntimeError("El servidor de inferencia está detenido"))
+        elif self.error is not None:
+            future.set_exception(self.error)
+        else:
+            self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def predict(self, text, timeout=5.0):
+        """Versión síncrona de submit"""
+        return self.submit(text).result(timeout)
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Se procesa el lote actual y luego se detiene
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        try:
+            self._load()
+        except Exception as e:
+            self.error = e
+            print(f"⚠️ Servidor de inferencia LSTM no disponible: {e}")
+        self.ready.set()
+
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            if self.error is not None:
+                item[1].set_exception(self.error)
+                continue
+            self._process(self._collect(item))
+
+    def _process(self, batch):
+        texts = [text for text, _, _ in batch]
+        try:
+            probabilities = self.backend.predict(self.backend.encode(texts))
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.requests += len(batch)
+        classes = self.backend.classes
+        now = time.perf_counter()
+        for (_, future, enqueued), probs in zip(batch, probabilities):
+            best = int(np.argmax(probs))
+            self.latency.record(now - enqueued)
+            future.set_result({
+                'command_type': classes[best],
+                'confidence': float(probs[best]),
+                'all_probabilities': dict(zip(classes, probs.tolist())),
+            })
+
+    def stop(self, timeout=2.0):
+        """Terminar las peticiones pendientes y detener el hilo"""
+        self._stopped = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        s = self.latency.snapshot()
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'avg_batch': self.requests / self.batches if self.batches else 0.0,
+            'p50_ms': s['p50'] * 1000,
+            'p99_ms': s['p99'] * 1000,
+        }
+
+    def summary(self):
+        s = self.stats()
+        return (f"Inferencia LSTM: n={s['requests']} lotes={s['batches']} "
+                f"media/lote={s['avg_batch']:.1f} p50={s['p50_ms']:.1f} ms p99={s['p99_ms']:.1f} ms")
@@ -0,0 +1,200 @@
+"""
+Caché de titulares de NewsAPI para Angie
+Titulares por categoría × país en SQLite, peticiones condicionales y precarga periódica en segundo plano
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+NEWS_URL = "https://newsapi.org/v2/top-headlines"
+
+
+def has_articles(status_code, data):
+    return status_code in (200, 304) and bool(data and data.get('articles'))
+
+
+class NewsCache:
+    """Titulares recientes servidos desde disco; la red solo se usa si están viejos"""
+
+    def __init__(self, db_path, http, api_key, ttl=15 * 60):
+        self.http = http
+        self.api_key = api_key
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS news_headlines (
+                category TEXT NOT NULL,
+                country TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (category, country)
+            )
+        ''')
+        # Categorías que el usuario ha pedido: la precarga las sigue entre sesiones
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS news_tracked (
+                category TEXT PRIMARY KEY,
+                tracked_at REAL NOT NULL
+            )
+        ''')
+        self.conn.commit()
+        self.hits = 0
+        self.fetches = 0
+        self.not_modified = 0
+
+    def _row(self, category, country):
+        with self._lock:
+            return self.conn.execute(
+                'SELECT payload, etag, last_modified, fetched_at FROM news_headlines '
+                'WHERE category = ? AND country = ?', (category, country)).fetchone()
+
+    def age(self, category, country):
+        """Segundos desde la última descarga, o None si no hay entrada"""
+        row = self._row(category, country)
+        return None if row is None else time.time() - row[3]
+
+    def cached(self, category, country, max_age=None):
+        """Datos en caché si tienen menos de max_age segundos (por defecto el TTL), o None"""
+        row = self._row(category, country)
+        max_age = self.ttl if max_age is None else max_age
+        if row is None or time.time() - row[3] > max_age:
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def fetch(self, category, country, **kwargs):
+        """Descargar titulares (condicional si hay ETag/Last-Modified) y guardarlos.
+        Devuelve (código HTTP, datos); en 304 los datos son los de la caché"""
+        row = self._row(category, country)
+        headers = {}
+        if row is not None:
+            if row[1]:
+                headers['If-None-Match'] = row[1]
+            if row[2]:
+                headers['If-Modified-Since'] = row[2]
+        response = self.http.get(NEWS_URL, headers=headers,
+                                 params={'country': country, 'category': category, 'apiKey': self.api_key},
+                                 **kwargs)
+        self.fetches += 1
+        now = time.time()
+        if response.status_code == 304 and row is not None:
+            self.not_modified += 1
+            with self._lock:
+                self.conn.execute('UPDATE news_headlines SET fetched_at = ? WHERE category = ? AND country = ?',
+                                  (now, category, country))
+                self.conn.commit()
+            return 304, json.loads(row[0])
+        data = response.json()
+        if has_articles(response.status_code, data):
+            with self._lock:
+                self.conn.execute('''
+                    INSERT OR REPLACE INTO news_headlines
+                        (category, country, payload, etag, last_modified, fetched_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (category, country, json.dumps(data), response.headers.get('ETag'),
+                      response.headers.get('Last-Modified'), now))
+                self.conn.commit()
+        return response.status_code, data
+
+    def headlines(self, category, country, **kwargs):
+        """Titulares frescos de la caché o, si no hay, de la red"""
+        data = self.cached(category, country)
+        if data is not None:
+            return 200, data
+        return self.fetch(category, country, **kwargs)
+
+    def track(self, category):
+        with self._lock:
+            self.conn.execute('INSERT OR IGNORE INTO news_tracked (category, tracked_at) VALUES (?, ?)',
+                              (category, time.time()))
+            self.conn.commit()
+
+    def tracked_categories(self):
+        """Categorías seguidas, en el orden en que se pidieron"""
+        with self._lock:
+            rows = self.conn.execute('SELECT category FROM news_tracked ORDER BY tracked_at, rowid').fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self):
+        with self._lock:
+            (entries,) = self.conn.execute('SELECT COUNT(*) FROM news_headlines').fetchone()
+        return {'entries': entries, 'hits': self.hits, 'fetches': self.fetches,
+                'not_modified': self.not_modified}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class NewsPrefetcher:
+    """Refresca periódicamente las categorías; por cada una se queda con el primer país con titulares.
+    Solo precarga las categorías indicadas o pedidas con track() (guardadas en la caché, así que
+    siguen en la próxima sesión): la cuota gratuita de NewsAPI (~100 peticiones al día) no alcanza
+    para todas las categorías y países"""
+
+    def __init__(self, cache, categories=(), countries=(), interval=6 * 60 * 60):
+        self.cache = cache
+        self.categories = list(categories)
+        for category in cache.tracked_categories():
+            if category not in self.categories:
+                self.categories.append(category)
+        self.countries = list(countries)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.runs = 0
+
+    def track(self, category):
+        """Incluir en la precarga una categoría que el usuario ha pedido"""
+        with self._lock:
+            if category in self.categories:
+                return
+            self.categories.append(category)
+        self.cache.track(category)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Detener y esperar a que termine la pasada en curso (antes de cerrar la caché)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def prefetch_once(self):
+        """Una pasada por las categorías seguidas; los errores de red no detienen la precarga"""
+        with self._lock:
+            categories = list(self.categories)
+        for category in categories:
+            if self._stop.is_set():
+                return
+            for country in self.countries:
+                # Si aún está fresco no se gasta cuota
+                age = self.cache.age(category, country)
+                if age is not None and age < self.interval / 2:
+                    break
+                try:
+                    status_code, data = self.cache.fetch(category, country, retries=0)
+                except Exception as e:
+                    print(f"⚠️ Precarga de noticias ({category}/{country}) fallida: {e}")
+                    continue
+                if has_articles(status_code, data):
+                    break
+                if status_code in (401, 429):
+                    # Key inválida o cuota agotada: esperar a la próxima pasada
+                    return
+        self.runs += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.prefetch_once()
+            self._stop.wait(self.interval)
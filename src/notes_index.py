@@ -0,0 +1,90 @@
+"""
+Índice de texto completo para las notas de Angie
+Tabla FTS5 sincronizada con notes mediante triggers, sin distinguir acentos, con ranking BM25 y fragmentos
+"""
+
+import re
+import sqlite3
+
+_WORD = re.compile(r'\w+')
+
+# Peso del título frente al contenido en el ranking BM25
+TITLE_WEIGHT = 5.0
+CONTENT_WEIGHT = 1.0
+
+_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+        title, content,
+        content='notes', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+        INSERT INTO notes_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE OF title, content ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO notes_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    ''',
+]
+
+
+def ensure_notes_fts(conn):
+    """Crear índice y triggers si faltan y rellenar el índice con las notas existentes.
+    Devuelve False si este SQLite no tiene FTS5 (se seguirá usando LIKE)"""
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts'").fetchone()
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        if not exists:
+            # Migración: indexar las notas creadas antes de existir el índice
+            conn.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+        conn.commit()
+        return True
+    except sqlite3.OperationalError as e:
+        print(f"⚠️ Búsqueda de texto completo no disponible: {e}")
+        return False
+
+
+def fts_query(text):
+    """Consulta FTS5 segura: cada palabra entre comillas y como prefijo, todas requeridas"""
+    return ' '.join(f'"{word}"*' for word in _WORD.findall(text))
+
+
+def search_notes(conn, term, limit=20):
+    """Notas que coinciden con el término, mejor valoradas primero.
+    Filas (id, title, content, created_date, modified_date, fragmento)"""
+    query = fts_query(term)
+    if not query:
+        return []
+    try:
+        return conn.execute(f'''
+            SELECT n.id, n.title, n.content, n.created_date, n.modified_date,
+                   snippet(notes_fts, 1, '«', '»', '…', 12)
+            FROM notes_fts
+            JOIN notes n ON n.id = notes_fts.rowid
+            WHERE notes_fts MATCH ?
+            ORDER BY bm25(notes_fts, {TITLE_WEIGHT}, {CONTENT_WEIGHT})
+            LIMIT ?
+        ''', (query, limit)).fetchall()
+    except sqlite3.OperationalError:
+        # Sin FTS5 (o sin índice todavía): búsqueda lineal de siempre
+        pass
+    return conn.execute('''
+        SELECT id, title, content, created_date, modified_date, substr(content, 1, 80)
+        FROM notes
+        WHERE title LIKE ? OR content LIKE ?
+        ORDER BY modified_date DESC
+        LIMIT ?
+    ''', (f'%{term}%', f'%{term}%', limit)).fetchall()
@@ -0,0 +1,188 @@
+"""
+Caché persistente de respuestas de Gemini para Angie
+SQLite con claves normalizadas, TTL y expulsión LRU; coincidencia aproximada por trigramas
+opcional y sin guardar las preguntas que dependen del momento ("hoy", "ahora", "últimas...")
+"""
+
+import re
+import sqlite3
+import threading
+import time
+
+from intent_router import normalize_text
+
+_NON_WORD = re.compile(r'[^\w\s]')
+_SPACES = re.compile(r'\s+')
+# Palabras que no cambian la pregunta (sobre claves ya normalizadas, sin acentos)
+_STOPWORDS = frozenset('el la los las lo un una unos unas de del al a en y e o u por para con se me te le'.split())
+# La respuesta caduca con el momento en que se pregunta
+_TIME_SENSITIVE = re.compile(
+    r'\b(hoy|ahora|ayer|mañana|actual\w*|ultim\w*|reciente\w*|esta semana|este mes|este año|en este momento)\b')
+
+
+def normalize_prompt(prompt):
+    """Clave canónica: minúsculas, sin acentos, sin puntuación ni espacios de más"""
+    text = _NON_WORD.sub(' ', normalize_text(prompt))
+    return _SPACES.sub(' ', text).strip()
+
+
+def trigram_signature(key):
+    """Conjunto de trigramas de caracteres de la clave normalizada"""
+    padded = f'  {key} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def content_tokens(key):
+    """Palabras y números con significado de la clave (sin artículos ni preposiciones)"""
+    return frozenset(w for w in key.split() if w not in _STOPWORDS)
+
+
+def is_time_sensitive(key):
+    return _TIME_SENSITIVE.search(key) is not None
+
+
+def dice(a, b):
+    """Coeficiente de Dice entre dos firmas (1.0 = idénticas)"""
+    if not a or not b:
+        return 0.0
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+
+class ResponseCache:
+    """Respuestas ya generadas, servidas en milisegundos para preguntas repetidas"""
+
+    def __init__(self, db_path, ttl_hours=24 * 7, max_entries=500,
+                 fuzzy=False, similarity=0.8):
+        self.db_path = db_path
+        self.ttl = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.fuzzy = fuzzy
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS response_cache (
+                prompt_key TEXT PRIMARY KEY,
+                prompt TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER DEFAULT 0
+            )
+        ''')
+        self.conn.commit()
+        # Firmas en memoria para la búsqueda aproximada (la tabla es pequeña)
+        self._signatures = {
+            key: trigram_signature(key)
+            for (key,) in self.conn.execute('SELECT prompt_key FROM response_cache')
+        }
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.skipped = 0
+
+    def _closest_key(self, key):
+        # Los trigramas solo desempatan: "2 más 2" y "2 más 3" o "austria" y "australia"
+        # se parecen mucho, así que las palabras con significado y los números deben coincidir
+        signature = trigram_signature(key)
+        tokens = content_tokens(key)
+        best_key, best_score = None, self.similarity
+        for candidate, candidate_signature in self._signatures.items():
+            if content_tokens(candidate) != tokens:
+                continue
+            score = dice(signature, candidate_signature)
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        return best_key
+
+    def get(self, prompt):
+        """Respuesta en caché para la pregunta, o None"""
+        key = normalize_prompt(prompt)
+        if not key or is_time_sensitive(key):
+            return None
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT prompt_key, response, created_at FROM response_cache WHERE prompt_key = ?',
+                (key,)).fetchone()
+            exact = row is not None
+            if row is None and self.fuzzy:
+                near_key = self._closest_key(key)
+                if near_key is not None:
+                    row = self.conn.execute(
+                        'SELECT prompt_key, response, created_at FROM response_cache WHERE prompt_key = ?',
+                        (near_key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            found_key, response, created_at = row
+            if now - created_at > self.ttl:
+                self._delete(found_key)
+                self.conn.commit()
+                self.misses += 1
+                return None
+            self.conn.execute(
+                'UPDATE response_cache SET last_used = ?, hits = hits + 1 WHERE prompt_key = ?',
+                (now, found_key))
+            self.conn.commit()
+            if exact:
+                self.hits += 1
+            else:
+                self.fuzzy_hits += 1
+            return response
+
+    def put(self, prompt, response):
+        """Guardar una respuesta y expulsar las menos usadas si se supera el máximo"""
+        key = normalize_prompt(prompt)
+        if not key or not response:
+            return
+        if is_time_sensitive(key):
+            self.skipped += 1
+            return
+        now = time.time()
+        with self._lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO response_cache
+                    (prompt_key, prompt, response, created_at, last_used, hits)
+                VALUES (?, ?, ?, ?, ?, 0)
+            ''', (key, prompt, response, now, now))
+            self._signatures[key] = trigram_signature(key)
+            self.stores += 1
+            self._evict(now)
+            self.conn.commit()
+
+    def _delete(self, key):
+        self.conn.execute('DELETE FROM response_cache WHERE prompt_key = ?', (key,))
+        self._signatures.pop(key, None)
+
+    def _evict(self, now):
+        expired = [k for (k,) in self.conn.execute(
+            'SELECT prompt_key FROM response_cache WHERE created_at < ?', (now - self.ttl,))]
+        overflow = len(self._signatures) - len(expired) - self.max_entries
+        if overflow > 0:
+            expired += [k for (k,) in self.conn.execute(
+                'SELECT prompt_key FROM response_cache WHERE created_at >= ? '
+                'ORDER BY last_used ASC LIMIT ?', (now - self.ttl, overflow))]
+        for key in expired:
+            self._delete(key)
+        self.evictions += len(expired)
+
+    def stats(self):
+        """Aciertos, fallos y tamaño de la caché"""
+        lookups = self.hits + self.fuzzy_hits + self.misses
+        return {
+            'entries': len(self._signatures),
+            'hits': self.hits,
+            'fuzzy_hits': self.fuzzy_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.fuzzy_hits) / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'skipped': self.skipped,
+        }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
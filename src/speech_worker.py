@@ -0,0 +1,223 @@
+"""
+Cola de síntesis de voz para Angie
+Un único hilo consume una cola de prioridad acotada y es el único que usa el motor pyttsx3
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+from latency_stats import LatencyStats
+
+URGENT = 0
+NORMAL = 1
+BACKGROUND = 2
+
+
+class _Utterance:
+    def __init__(self, text, priority, seq, key, deadline, group=None):
+        self.text = text
+        self.priority = priority
+        self.seq = seq
+        self.key = key
+        self.deadline = deadline
+        self.group = group
+        self.enqueued_at = time.perf_counter()
+        self.started = False
+
+    def __lt__(self, other):
+        # Menor prioridad numérica primero; FIFO dentro de la misma prioridad
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class SpeechWorker:
+    """Hilo consumidor de voz con cola acotada, coalescencia, barge-in y descarte de frases viejas"""
+
+    def __init__(self, engine_factory, max_queue=20, max_age=30.0):
+        self.engine_factory = engine_factory
+        self.max_queue = max_queue
+        # Frases que llevan más de max_age segundos en cola ya no se dicen
+        self.max_age = max_age
+        self.engine = None
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._current = None
+        self._running = False
+        self._thread = None
+        self._has_start_event = False
+        # Grupos descartados: sus frases posteriores ya no se encolan (no se dice una respuesta sin su principio)
+        self._dropped_groups = deque(maxlen=100)
+
+        self.time_to_first_audio = LatencyStats("Cola → primer audio")
+        self.spoken = 0
+        self.coalesced = 0
+        self.dropped_full = 0
+        self.dropped_stale = 0
+        self.interrupted = 0
+        self.max_depth = 0
+
+    def start(self):
+        """Arrancar el hilo de voz"""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Vaciar la cola, cortar la frase actual y detener el hilo"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self.interrupt(keep_urgent=False)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def depth(self):
+        with self._cond:
+            return len(self._heap)
+
+    def speak(self, text, priority=NORMAL, key=None, expires=True, barge_in=False, group=None):
+        """Encolar una frase. Con key, una frase pendiente con la misma clave se sustituye.
+        Las frases de un mismo group (p. ej. una respuesta en streaming) no se descartan sueltas:
+        con la cola llena se unen a la última pendiente del grupo, un grupo solo lo desplaza una
+        frase más importante y, si se descarta, sale entero junto con las frases que lleguen después"""
+        if not text:
+            return
+        if barge_in:
+            self.interrupt()
+        deadline = time.perf_counter() + self.max_age if expires and self.max_age else None
+        with self._cond:
+            if group is not None and group in self._dropped_groups:
+                self.dropped_full += 1
+                return
+            if key is not None:
+                for pending in self._heap:
+                    if pending.key == key:
+                        pending.text = text
+                        pending.deadline = deadline
+                        self.coalesced += 1
+                        return
+            if len(self._heap) >= self.max_queue:
+                same_group = [u for u in self._heap if group is not None and u.group == group]
+                if same_group:
+                    # El grupo no crece más allá de la cola: la frase se dice junto a la anterior
+                    last = max(same_group, key=lambda u: u.seq)
+                    last.text = f"{last.text} {text}"
+                    self.coalesced += 1
+                    return
+                if not self._make_room(priority):
+                    self.dropped_full += 1
+                    self._drop_group(group)
+                    return
+            heapq.heappush(self._heap, _Utterance(text, priority, next(self._seq), key, deadline, group))
+            self.max_depth = max(self.max_depth, len(self._heap))
+            self._cond.notify()
+
+    def _make_room(self, priority):
+        """Quitar de la cola llena lo menos importante frente a una frase de esta prioridad.
+        Una frase suelta sale ante otra igual o más importante (la más antigua primero); un grupo,
+        solo ante una estrictamente más importante y entero. False si no hay nada que quitar"""
+        candidates = [u for u in self._heap
+                      if u.priority > priority or (u.group is None and u.priority == priority)]
+        if not candidates:
+            return False
+        worst = max(candidates, key=lambda u: (u.priority, u.group is None, -u.seq))
+        if worst.group is None:
+            evicted = [worst]
+        else:
+            evicted = [u for u in self._heap if u.group == worst.group]
+            self._drop_group(worst.group)
+        self._heap = [u for u in self._heap if not any(u is e for e in evicted)]
+        heapq.heapify(self._heap)
+        self.dropped_full += len(evicted)
+        return True
+
+    def _drop_group(self, group):
+        if group is not None and group not in self._dropped_groups:
+            self._dropped_groups.append(group)
+
+    def interrupt(self, keep_urgent=True):
+        """Barge-in: descartar lo pendiente y cortar la frase que se está diciendo.
+        Con keep_urgent, las frases URGENT (p. ej. recordatorios) se conservan y no se cortan"""
+        with self._cond:
+            kept = [u for u in self._heap if keep_urgent and u.priority == URGENT]
+            self.interrupted += len(self._heap) - len(kept)
+            for u in self._heap:
+                if not any(u is k for k in kept):
+                    self._drop_group(u.group)
+            self._heap = kept
+            heapq.heapify(self._heap)
+            # Se corta con el lock tomado: el hilo de voz entrega cada frase al motor también con el
+            # lock, así que la frase cortada es seguro la que se miró y no la siguiente (quizá urgente)
+            current = self._current
+            if current is not None and not (keep_urgent and current.priority == URGENT):
+                self._drop_group(current.group)
+                if self.engine is not None:
+                    try:
+                        self.engine.stop()
+                        self.interrupted += 1
+                    except Exception:
+                        pass
+
+    def metrics(self):
+        """Métricas de la cola y del tiempo hasta el primer audio"""
+        return {
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'spoken': self.spoken,
+            'coalesced': self.coalesced,
+            'dropped_full': self.dropped_full,
+            'dropped_stale': self.dropped_stale,
+            'interrupted': self.interrupted,
+            'time_to_first_audio': self.time_to_first_audio.snapshot(),
+        }
+
+    def _on_started(self, name=None):
+        current = self._current
+        if current is not None and not current.started:
+            current.started = True
+            self.time_to_first_audio.record(time.perf_counter() - current.enqueued_at)
+
+    def _run(self):
+        try:
+            self.engine = self.engine_factory()
+            if hasattr(self.engine, 'connect'):
+                self.engine.connect('started-utterance', self._on_started)
+                self._has_start_event = True
+        except Exception as e:
+            print(f"❌ Error iniciando el motor de voz: {e}")
+            return
+
+        while True:
+            with self._cond:
+                while self._running and not self._heap:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                item = heapq.heappop(self._heap)
+                if item.deadline is not None and time.perf_counter() > item.deadline:
+                    self.dropped_stale += 1
+                    continue
+                self._current = item
+                try:
+                    if not self._has_start_event:
+                        # Motores sin evento de inicio: se mide al entregarle la frase
+                        self._on_started()
+                    self.engine.say(item.text)
+                except Exception as e:
+                    print(f"❌ Error en síntesis de voz: {e}")
+                    self._current = None
+                    continue
+            try:
+                self.engine.runAndWait()
+                self.spoken += 1
+            except Exception as e:
+                print(f"❌ Error en síntesis de voz: {e}")
+            finally:
+                with self._cond:
+                    self._current = None
@@ -0,0 +1,200 @@
+"""
+Tokenizador y vectorizador en NumPy para Angie
+Reproduce clean_text + Tokenizer.texts_to_sequences + pad_sequences de Keras sin importar TensorFlow;
+el vocabulario se guarda en JSON y cada lote se codifica con una sola búsqueda vectorizada
+"""
+
+import json
+import os
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+
+VOCAB_FORMAT = 1
+
+# Filtros por defecto del Tokenizer de Keras
+KERAS_FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+
+
+def clean_text(text):
+    """Misma limpieza que AngieLSTMTrainer.clean_text"""
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class TextVectorizer:
+    """Vocabulario palabra → índice con la semántica del Tokenizer de Keras (num_words, <OOV>)"""
+
+    def __init__(self, word_index, num_words=None, oov_token='<OOV>', max_len=50, filters=KERAS_FILTERS,
+                 clean=False, padding='pre', truncating='pre', oov_buckets=0):
+        self.word_index = dict(word_index)
+        self.num_words = num_words
+        self.oov_token = oov_token
+        self.oov_index = self.word_index.get(oov_token) if oov_token is not None else None
+        self.max_len = max_len
+        self.filters = filters
+        self.clean = clean
+        self.padding = padding
+        self.truncating = truncating
+        # Con oov_buckets > 0 cada palabra desconocida va a uno de esos índices reservados (por hash)
+        # en vez de a <OOV>: el vocabulario puede crecer sin cambiar el tamaño del Embedding
+        self.oov_buckets = oov_buckets
+        self._table = str.maketrans({c: ' ' for c in filters})
+        self._build_lookup()
+
+    def _build_lookup(self):
+        # Solo las palabras que texts_to_sequences conserva; ordenadas para searchsorted
+        kept = [(w, i) for w, i in self.word_index.items() if not self.num_words or i < self.num_words]
+        kept.sort()
+        self._words = np.array([w for w, _ in kept], dtype=str)
+        self._ids = np.array([i for _, i in kept], dtype=np.int32)
+        self.bucket_base = int(self._ids.max()) + 1 if len(self._ids) else 1
+        self.index_word = {i: w for w, i in self.word_index.items()}
+
+    @classmethod
+    def fit(cls, texts, num_words=None, oov_token='<OOV>', **kwargs):
+        """Construir el vocabulario como Tokenizer.fit_on_texts (frecuencia, empates por aparición)"""
+        vectorizer = cls({}, num_words, oov_token, **kwargs)
+        counts = Counter()
+        for text in texts:
+            counts.update(vectorizer.split(text))
+        # sorted es estable: a igual frecuencia se respeta el orden de aparición, como en Keras
+        ordered = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        words = ([oov_token] if oov_token is not None else []) + [w for w, _ in ordered]
+        return cls({w: i for i, w in enumerate(words, start=1)}, num_words, oov_token, **kwargs)
+
+    @classmethod
+    def from_keras(cls, tokenizer, max_len, **kwargs):
+        """Copiar el vocabulario de un Tokenizer de Keras ya ajustado"""
+        return cls(tokenizer.word_index, tokenizer.num_words, tokenizer.oov_token, max_len,
+                   tokenizer.filters, **kwargs)
+
+    @property
+    def vocab_size(self):
+        """Índices posibles (relleno, vocabulario y cubos OOV): tamaño de entrada del Embedding"""
+        return self.bucket_base + self.oov_buckets
+
+    @classmethod
+    def from_dict(cls, vocab):
+        if vocab.get('format') != VOCAB_FORMAT:
+            raise ValueError(f"Formato de vocabulario no soportado: {vocab.get('format')}")
+        return cls(vocab['word_index'], vocab.get('num_words'), vocab.get('oov_token', '<OOV>'),
+                   vocab['max_len'], vocab.get('filters', KERAS_FILTERS), vocab.get('clean', True),
+                   vocab.get('padding', 'pre'), vocab.get('truncating', 'pre'), vocab.get('oov_buckets', 0))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self, **extra):
+        vocab = {
+            'format': VOCAB_FORMAT,
+            'max_len': self.max_len,
+            'num_words': self.num_words,
+            'oov_token': self.oov_token,
+            'filters': self.filters,
+            'clean': self.clean,
+            'padding': self.padding,
+            'truncating': self.truncating,
+            'oov_buckets': self.oov_buckets,
+            'word_index': {w: int(i) for w, i in zip(self._words.tolist(), self._ids.tolist())},
+        }
+        vocab.update(extra)
+        return vocab
+
+    def save(self, path, **extra):
+        """Guardar en JSON; extra añade claves (p. ej. las clases del modelo).
+        Se escribe aparte y se renombra: quien lo lea nunca ve un archivo a medias"""
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(**extra), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def split(self, text):
+        """Palabras de un texto, como text_to_word_sequence"""
+        if self.clean:
+            text = clean_text(text)
+        return text.lower().translate(self._table).split()
+
+    def lookup(self, tokens):
+        """Índices de un array de palabras; desconocidas → cubo OOV, <OOV> o -1 si no hay OOV"""
+        missing = -1 if self.oov_index is None else self.oov_index
+        if len(self._words):
+            pos = np.minimum(np.searchsorted(self._words, tokens), len(self._words) - 1)
+            found = self._words[pos] == tokens
+            ids = np.where(found, self._ids[pos], missing).astype(np.int32)
+        else:
+            found = np.zeros(len(tokens), dtype=bool)
+            ids = np.full(len(tokens), missing, dtype=np.int32)
+        if self.oov_buckets and not found.all():
+            unknown = np.flatnonzero(~found)
+            ids[unknown] = [self.bucket_base + zlib.crc32(t.encode('utf-8')) % self.oov_buckets
+                            for t in tokens[unknown].tolist()]
+        return ids
+
+    def _positions(self, texts):
+        """Índice de cada palabra, su fila y su posición tras recortar a max_len (sin rellenar)"""
+        token_lists = [self.split(text) for text in texts]
+        lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.int64)
+        if not lengths.sum():
+            empty = np.zeros(0, dtype=np.int64)
+            return empty.astype(np.int32), empty, empty, np.zeros(len(texts), dtype=np.int64)
+
+        ids = self.lookup(np.array([t for tokens in token_lists for t in tokens], dtype=str))
+        row = np.repeat(np.arange(len(texts)), lengths)
+        if self.oov_index is None:
+            # Sin OOV, Keras descarta las palabras desconocidas
+            keep = ids >= 0
+            ids, row = ids[keep], row[keep]
+            lengths = np.bincount(row, minlength=len(texts))
+
+        # Posición de cada palabra dentro de su texto
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        pos = np.arange(len(ids)) - np.repeat(starts, lengths)
+        length = np.repeat(lengths, lengths)
+        kept = np.minimum(length, self.max_len)
+        if self.truncating == 'pre':
+            pos = pos - (length - kept)
+        keep = (pos >= 0) & (pos < kept)
+        return ids[keep], row[keep], pos[keep], np.minimum(lengths, self.max_len)
+
+    def encode(self, texts):
+        """Matriz (len(texts), max_len) de int32, idéntica a pad_sequences(texts_to_sequences(...))"""
+        ids, row, pos, lengths = self._positions(texts)
+        out = np.zeros((len(texts), self.max_len), dtype=np.int32)
+        if self.padding == 'pre':
+            pos = pos + (self.max_len - lengths[row])
+        out[row, pos] = ids
+        return out
+
+    def encode_ragged(self, texts):
+        """Secuencias sin relleno (ya recortadas): todos los índices seguidos y la longitud de cada texto"""
+        ids, _, _, lengths = self._positions(texts)
+        return ids, lengths.astype(np.int32)
+
+    def reverse_lookup(self, skip_oov=True):
+        """Array índice → palabra de tamaño vocab_size; '' para el relleno (y <OOV> y sus cubos si skip_oov)"""
+        width = max([len(w) for w in self._words.tolist()] + [len(self.oov_token or '')] + [1])
+        table = np.full(self.vocab_size, '', dtype=f'U{width}')
+        table[self._ids] = self._words
+        if skip_oov:
+            if self.oov_index is not None and self.oov_index < len(table):
+                table[self.oov_index] = ''
+        elif self.oov_token is not None:
+            table[self.bucket_base:] = self.oov_token
+        return table
+
+    def decode(self, sequence, skip_oov=True):
+        """Texto a partir de índices, omitiendo el relleno (y <OOV> si skip_oov)"""
+        words = []
+        for idx in np.asarray(sequence).tolist():
+            if idx == 0 or (skip_oov and (idx == self.oov_index or (self.oov_buckets and idx >= self.bucket_base))):
+                continue
+            word = self.index_word.get(idx)
+            if word:
+                words.append(word)
+        return ' '.join(words)
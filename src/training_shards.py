@@ -0,0 +1,183 @@
+"""
+Fragmentos codificados de interactions para entrenar el LSTM de Angie
+Lee la tabla por trozos (paginación por id), tokeniza en paralelo, guarda cada trozo
+codificado en disco y sirve lotes agrupados por longitud con relleno dinámico,
+de modo que la memoria no crece con el tamaño del historial
+"""
+
+import hashlib
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+MANIFEST = 'manifest.json'
+# Límites superiores de longitud de cada cubo; lo más largo va al último (hasta max_len)
+DEFAULT_BOUNDARIES = (4, 8, 16, 32)
+
+
+def iter_interaction_chunks(db, chunk_size=5000, after_id=0):
+    """Listas de (id, user_input, command_type) en orden de id, sin cargar la tabla entera"""
+    last_id = after_id
+    while True:
+        rows = db.query(
+            "SELECT id, user_input, command_type FROM interactions "
+            "WHERE id > ? AND command_type IS NOT NULL ORDER BY id LIMIT ?", (last_id, chunk_size))
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def vocabulary_fingerprint(vectorizer, classes):
+    """Huella del vocabulario y las clases: si cambia, los fragmentos guardados no sirven"""
+    payload = json.dumps([vectorizer.to_dict(), [str(c) for c in classes]], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _encode_chunk(args):
+    vectorizer, class_index, rows = args
+    ids = np.array([r[0] for r in rows], dtype=np.int64)
+    values, lengths = vectorizer.encode_ragged([r[1] for r in rows])
+    labels = np.array([class_index.get(str(r[2]), -1) for r in rows], dtype=np.int32)
+    return ids, values, lengths, labels
+
+
+class ShardCache:
+    """Directorio con un .npz por trozo codificado y un manifest.json con su contenido"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_manifest(self):
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def build(self, db, vectorizer, classes, chunk_size=5000, workers=None):
+        """Codificar las interacciones que falten; reutiliza los fragmentos si el vocabulario no cambió.
+        Devuelve cuántas filas se codificaron en esta llamada"""
+        os.makedirs(self.directory, exist_ok=True)
+        fingerprint = vocabulary_fingerprint(vectorizer, classes)
+        if self.manifest is None or self.manifest.get('fingerprint') != fingerprint:
+            for name in os.listdir(self.directory):
+                if name.startswith('shard_') and name.endswith('.npz'):
+                    os.remove(os.path.join(self.directory, name))
+            self.manifest = {'fingerprint': fingerprint, 'last_id': 0, 'shards': [], 'label_counts': {}}
+
+        class_index = {str(c): i for i, c in enumerate(classes)}
+        chunks = ((vectorizer, class_index, rows)
+                  for rows in iter_interaction_chunks(db, chunk_size, self.manifest['last_id']))
+        if workers == 0:
+            # Sin procesos auxiliares (pruebas o máquinas con un solo núcleo)
+            return self._store_all(map(_encode_chunk, chunks), classes)
+
+        encoded = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # pool.map consumiría toda la entrada por adelantado; con una ventana se limita lo que hay en vuelo
+            window = (workers or os.cpu_count() or 1) * 2
+            pending = []
+            for chunk in chunks:
+                pending.append(pool.submit(_encode_chunk, chunk))
+                if len(pending) >= window:
+                    encoded += self._store_all([pending.pop(0).result()], classes)
+            encoded += self._store_all((f.result() for f in pending), classes)
+        return encoded
+
+    def _store_all(self, results, classes):
+        stored = 0
+        for ids, values, lengths, labels in results:
+            name = f"shard_{len(self.manifest['shards']):05d}.npz"
+            np.savez(os.path.join(self.directory, name), ids=ids, values=values, lengths=lengths, labels=labels)
+            self.manifest['shards'].append({'file': name, 'rows': len(ids)})
+            self.manifest['last_id'] = int(ids[-1])
+            counts = self.manifest['label_counts']
+            for label, count in zip(*np.unique(labels[labels >= 0], return_counts=True)):
+                key = str(classes[label])
+                counts[key] = counts.get(key, 0) + int(count)
+            stored += len(ids)
+            # El manifiesto se escribe tras cada fragmento: una interrupción no obliga a empezar de nuevo
+            self._write_manifest()
+        return stored
+
+    @property
+    def rows(self):
+        return sum(s['rows'] for s in self.manifest['shards']) if self.manifest else 0
+
+    def iter_examples(self, subset='train', validation_every=5):
+        """(secuencia, etiqueta) fragmento a fragmento; id % validation_every == 0 es validación"""
+        for shard in (self.manifest or {}).get('shards', []):
+            with np.load(os.path.join(self.directory, shard['file'])) as data:
+                ids, values, lengths, labels = data['ids'], data['values'], data['lengths'], data['labels']
+            offsets = np.concatenate(([0], np.cumsum(lengths)))
+            is_val = ids % validation_every == 0
+            for i in np.flatnonzero(is_val if subset == 'val' else ~is_val):
+                if labels[i] >= 0:
+                    # Copia: una vista retendría el fragmento entero mientras esté en el búfer de mezcla
+                    yield values[offsets[i]:offsets[i + 1]].copy(), int(labels[i])
+
+
+def pad_batch(sequences, padding='pre'):
+    """Rellenar con ceros hasta la secuencia más larga del lote"""
+    width = max(1, max(len(s) for s in sequences))
+    out = np.zeros((len(sequences), width), dtype=np.int32)
+    for row, seq in enumerate(sequences):
+        if len(seq):
+            if padding == 'pre':
+                out[row, width - len(seq):] = seq
+            else:
+                out[row, :len(seq)] = seq
+    return out
+
+
+def bucketed_batches(examples, batch_size=64, boundaries=DEFAULT_BOUNDARIES, shuffle_buffer=10000,
+                     seed=None, padding='pre'):
+    """Lotes (X, y) de secuencias de longitud parecida, cada uno relleno solo hasta su máximo.
+    La memoria se limita al búfer de mezcla más un lote por cubo"""
+    rng = random.Random(seed)
+    buffer = []
+    buckets = [[] for _ in range(len(boundaries) + 1)]
+
+    def place(example):
+        bucket = buckets[int(np.searchsorted(boundaries, len(example[0])))]
+        bucket.append(example)
+        if len(bucket) == batch_size:
+            batch = list(bucket)
+            bucket.clear()
+            return batch
+        return None
+
+    def emit(batch):
+        return pad_batch([seq for seq, _ in batch], padding), np.array([label for _, label in batch], dtype=np.int32)
+
+    for example in examples:
+        if shuffle_buffer:
+            if len(buffer) < shuffle_buffer:
+                buffer.append(example)
+                continue
+            # Mezcla por reservorio: sale un ejemplo al azar y entra el nuevo
+            index = rng.randrange(len(buffer))
+            example, buffer[index] = buffer[index], example
+        batch = place(example)
+        if batch:
+            yield emit(batch)
+
+    rng.shuffle(buffer)
+    for example in buffer:
+        batch = place(example)
+        if batch:
+            yield emit(batch)
+    for bucket in buckets:
+        if bucket:
+            yield emit(bucket)
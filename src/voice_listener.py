@@ -0,0 +1,103 @@
+"""
+Escucha continua con un único stream de micrófono
+Calibra el ruido ambiente una sola vez al abrir; si el nivel de ruido cambia, el umbral se
+reajusta con el ruido ya medido entre frases, sin volver a leer del micrófono
+"""
+
+import time
+
+import numpy as np
+import speech_recognition as sr
+
+_SAMPLE_DTYPES = {1: np.int8, 2: '<i2', 4: '<i4'}
+
+
+def rms(frame_data, sample_width):
+    """Energía RMS de audio PCM con signo (little-endian), como audioop.rms"""
+    if sample_width == 3:
+        raw = np.frombuffer(frame_data[:len(frame_data) - len(frame_data) % 3], dtype=np.uint8).reshape(-1, 3)
+        samples = (raw[:, 0].astype(np.int32) | (raw[:, 1].astype(np.int32) << 8)
+                   | (raw[:, 2].astype(np.int8).astype(np.int32) << 16))
+    else:
+        dtype = np.dtype(_SAMPLE_DTYPES[sample_width])
+        samples = np.frombuffer(frame_data[:len(frame_data) - len(frame_data) % dtype.itemsize], dtype=dtype)
+    if not len(samples):
+        return 0
+    return int(np.sqrt(np.mean(samples.astype(np.float64) ** 2)))
+
+
+class PersistentListener:
+    """Mantiene sr.Microphone abierto entre frases y vigila la deriva del ruido"""
+
+    def __init__(self, recognizer, calibration_duration=0.5, drift_factor=2.0,
+                 ambient_window=0.25, smoothing=0.3):
+        self.recognizer = recognizer
+        self.calibration_duration = calibration_duration
+        # Se recalibra cuando el ruido medido se aleja este factor del calibrado
+        self.drift_factor = drift_factor
+        self.ambient_window = ambient_window
+        self.smoothing = smoothing
+        self.microphone = None
+        self.source = None
+        self.baseline_energy = None
+        self.ambient_energy = None
+        self.needs_calibration = True
+        self.calibrations = 0
+        self.recalibrations = 0
+
+    def open(self):
+        """Abrir el stream del micrófono si no está abierto y calibrar"""
+        if self.source is None:
+            self.microphone = sr.Microphone()
+            self.source = self.microphone.__enter__()
+            self.needs_calibration = True
+        if self.needs_calibration:
+            self.calibrate()
+        return self.source
+
+    def close(self):
+        """Cerrar el stream del micrófono"""
+        if self.microphone is not None:
+            try:
+                self.microphone.__exit__(None, None, None)
+            except Exception:
+                pass
+        self.microphone = None
+        self.source = None
+
+    def calibrate(self):
+        """Ajustar el umbral de energía con el ruido ambiente actual"""
+        self.recognizer.adjust_for_ambient_noise(self.source, duration=self.calibration_duration)
+        self.baseline_energy = self.recognizer.energy_threshold / self.recognizer.dynamic_energy_ratio
+        self.ambient_energy = self.baseline_energy
+        self.needs_calibration = False
+        self.calibrations += 1
+
+    def listen(self, timeout=None, phrase_time_limit=None):
+        """Escuchar una frase; devuelve (audio, instante de fin de voz en perf_counter)"""
+        source = self.open()
+        audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+        # listen() vuelve tras pause_threshold segundos de silencio que no incluye en el audio
+        speech_end = time.perf_counter() - self.recognizer.pause_threshold
+        self._track_noise(audio)
+        return audio, speech_end
+
+    def _track_noise(self, audio):
+        """Estimar el ruido con el tramo previo a la voz y reajustar el umbral si deriva"""
+        sample_count = int(audio.sample_rate * self.ambient_window)
+        head = audio.frame_data[:sample_count * audio.sample_width]
+        if not head or not self.baseline_energy:
+            return
+        energy = rms(head, audio.sample_width)
+        self.ambient_energy = (self.smoothing * energy
+                               + (1 - self.smoothing) * self.ambient_energy)
+        ratio = self.ambient_energy / self.baseline_energy
+        if ratio > self.drift_factor or ratio < 1.0 / self.drift_factor:
+            self.recalibrate()
+
+    def recalibrate(self):
+        """Umbral a partir del ruido medido entre frases: mismo valor al que converge
+        adjust_for_ambient_noise, sin bloquear la siguiente escucha leyendo el micrófono"""
+        self.recognizer.energy_threshold = self.ambient_energy * self.recognizer.dynamic_energy_ratio
+        self.baseline_energy = self.ambient_energy
+        self.recalibrations += 1
@@ -0,0 +1,161 @@
+"""
+Detector local de palabra de activación para Angie
+Detección de voz por energía + comparación DTW con plantillas grabadas por el usuario.
+Funciona sin conexión y decide si merece la pena enviar el audio a recognize_google.
+"""
+
+import os
+
+import numpy as np
+
+
+def audio_to_samples(frame_data, sample_width=2):
+    """Convertir bytes PCM (como AudioData.frame_data) a float32 en [-1, 1]"""
+    if sample_width == 2:
+        return np.frombuffer(frame_data, dtype='<i2').astype(np.float32) / 32768.0
+    if sample_width == 4:
+        return np.frombuffer(frame_data, dtype='<i4').astype(np.float32) / 2147483648.0
+    if sample_width == 1:
+        return (np.frombuffer(frame_data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    raise ValueError(f"Ancho de muestra no soportado: {sample_width}")
+
+
+def _frames(samples, sample_rate, frame_ms=25, hop_ms=10):
+    frame_len = int(sample_rate * frame_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    if len(samples) < frame_len:
+        samples = np.pad(samples, (0, frame_len - len(samples)))
+    count = 1 + (len(samples) - frame_len) // hop
+    index = np.arange(frame_len)[None, :] + hop * np.arange(count)[:, None]
+    return samples[index]
+
+
+def speech_bounds(samples, sample_rate, ratio=4.0, min_energy=0.005, hop_ms=10):
+    """VAD por energía: (inicio, fin) en muestras del tramo con voz, o None"""
+    energy = np.sqrt(np.mean(_frames(samples, sample_rate, hop_ms=hop_ms) ** 2, axis=1))
+    noise_floor = np.percentile(energy, 10)
+    active = np.nonzero(energy > max(min_energy, noise_floor * ratio))[0]
+    if len(active) == 0:
+        return None
+    hop = int(sample_rate * hop_ms / 1000)
+    return active[0] * hop, (active[-1] + 1) * hop + int(sample_rate * 0.015)
+
+
+def extract_features(samples, sample_rate, bands=20):
+    """Energías logarítmicas por bandas (escala tipo mel) con normalización de media"""
+    frames = _frames(samples, sample_rate) * np.hamming(int(sample_rate * 0.025))
+    power = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+    freqs = np.fft.rfftfreq(frames.shape[1], 1.0 / sample_rate)
+    mel = 2595 * np.log10(1 + freqs / 700.0)
+    edges = np.linspace(mel[1], mel[-1], bands + 1)
+    band_index = np.clip(np.searchsorted(edges, mel) - 1, 0, bands - 1)
+    pooled = np.zeros((power.shape[0], bands), dtype=np.float64)
+    for band in range(bands):
+        mask = band_index == band
+        if mask.any():
+            pooled[:, band] = power[:, mask].sum(axis=1)
+    features = np.log(pooled + 1e-10)
+    return features - features.mean(axis=0)
+
+
+def subsequence_dtw(template, query):
+    """DTW con inicio fijo y final libre: coste medio del mejor alineamiento del
+    template con un prefijo de la consulta (la palabra va al principio de la frase)"""
+    n, m = len(template), len(query)
+    cost = np.sqrt(((template[:, None, :] - query[None, :, :]) ** 2).sum(axis=2))
+    acc = np.full((n + 1, m + 1), np.inf)
+    acc[0, 0] = 0.0
+    for i in range(1, n + 1):
+        row = cost[i - 1]
+        prev = acc[i - 1]
+        # Diagonal y vertical se vectorizan; el paso horizontal se resuelve en bucle
+        best = np.minimum(prev[:-1], prev[1:]) + row
+        current = acc[i]
+        for j in range(1, m + 1):
+            current[j] = min(best[j - 1], current[j - 1] + row[j - 1])
+    return float(acc[n, 1:].min() / n)
+
+
+class WakeWordDetector:
+    """Compara el inicio de cada frase con plantillas de la palabra de activación"""
+
+    def __init__(self, templates_path=None, threshold=None, max_query_ratio=1.6):
+        self.templates_path = templates_path
+        self.templates = []
+        self.threshold = threshold
+        self.max_query_ratio = max_query_ratio
+        self.detections = 0
+        self.rejections = 0
+        if templates_path and os.path.exists(templates_path):
+            self.load(templates_path)
+
+    @property
+    def enrolled(self):
+        return len(self.templates) > 0
+
+    def _speech_features(self, samples, sample_rate):
+        bounds = speech_bounds(samples, sample_rate)
+        if bounds is None:
+            return None
+        start, end = bounds
+        return extract_features(samples[start:end], sample_rate)
+
+    def enroll(self, samples, sample_rate):
+        """Añadir una grabación de la palabra de activación como plantilla"""
+        features = self._speech_features(samples, sample_rate)
+        if features is None:
+            raise ValueError("No se detectó voz en la grabación de la plantilla")
+        self.templates.append(features)
+        if len(self.templates) > 1:
+            self._calibrate_threshold()
+        return features
+
+    def _calibrate_threshold(self):
+        """Umbral a partir de la distancia entre las propias plantillas"""
+        distances = []
+        for i, a in enumerate(self.templates):
+            for j, b in enumerate(self.templates):
+                if i != j:
+                    distances.append(subsequence_dtw(a, b))
+        self.threshold = max(distances) * 1.25
+
+    def score(self, samples, sample_rate):
+        """Distancia mínima a las plantillas (inf si no hay voz)"""
+        features = self._speech_features(samples, sample_rate)
+        if features is None or not self.templates:
+            return float('inf')
+        best = float('inf')
+        for template in self.templates:
+            query = features[:int(len(template) * self.max_query_ratio)]
+            best = min(best, subsequence_dtw(template, query))
+        return best
+
+    def detect(self, samples, sample_rate):
+        """True si el audio empieza con la palabra de activación"""
+        if not self.enrolled or self.threshold is None:
+            return True  # Sin plantillas no se filtra nada
+        found = self.score(samples, sample_rate) <= self.threshold
+        if found:
+            self.detections += 1
+        else:
+            self.rejections += 1
+        return found
+
+    def detect_audio(self, audio):
+        """Versión para sr.AudioData"""
+        samples = audio_to_samples(audio.frame_data, audio.sample_width)
+        return self.detect(samples, audio.sample_rate)
+
+    def save(self, path=None):
+        """Guardar plantillas y umbral en un archivo .npz"""
+        path = path or self.templates_path
+        arrays = {f'template_{i}': t for i, t in enumerate(self.templates)}
+        np.savez(path, threshold=np.array(self.threshold or 0.0), **arrays)
+
+    def load(self, path):
+        """Cargar plantillas y umbral desde un archivo .npz"""
+        with np.load(path) as data:
+            keys = sorted((k for k in data.files if k.startswith('template_')),
+                          key=lambda k: int(k.split('_')[1]))
+            self.templates = [data[k] for k in keys]
+            self.threshold = float(data['threshold']) or None
@@ -0,0 +1,101 @@
+"""
+Caché del clima actual para Angie
+Entradas por ubicación canónica de WeatherAPI, alias de consultas, TTL y refresco en segundo plano
+"""
+
+import threading
+import time
+
+from response_cache import normalize_prompt
+
+
+class WeatherError(Exception):
+    """La API respondió con un error (ciudad no encontrada, key inválida...)"""
+
+
+def location_key(data):
+    """Clave canónica a partir de la ubicación que devuelve WeatherAPI"""
+    location = data['location']
+    return f"{normalize_prompt(location['name'])}|{normalize_prompt(location.get('country', ''))}"
+
+
+class _Entry:
+    def __init__(self, data, query):
+        self.data = data
+        self.query = query
+        self.fetched_at = time.monotonic()
+
+
+class WeatherCache:
+    """Clima por ciudad: fresco hasta ttl, servido y refrescado en segundo plano hasta stale_ttl"""
+
+    def __init__(self, fetch, ttl=600, stale_ttl=3600):
+        # fetch(consulta) -> dict de WeatherAPI o lanza WeatherError
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        # "madrid", "madrid espana"... -> clave canónica
+        self._aliases = {}
+        self._refreshing = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get(self, query):
+        """Clima para la consulta; solo bloquea si no hay dato o es demasiado viejo"""
+        alias = normalize_prompt(query)
+        with self._lock:
+            key = self._aliases.get(alias)
+            entry = self._entries.get(key) if key else None
+            age = time.monotonic() - entry.fetched_at if entry else None
+            if entry is not None and age < self.ttl:
+                self.hits += 1
+                return entry.data
+            if entry is not None and age < self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(target=self._refresh, args=(key, entry.query), daemon=True).start()
+                return entry.data
+            self.misses += 1
+        data = self.fetch(query)
+        self._store(alias, query, data)
+        return data
+
+    def _store(self, alias, query, data):
+        key = location_key(data)
+        location = data['location']
+        with self._lock:
+            self._aliases[alias] = key
+            # El nombre canónico y sus variantes con región/país también apuntan a la entrada
+            name = location['name']
+            for variant in (name, f"{name} {location.get('region', '')}", f"{name} {location.get('country', '')}"):
+                self._aliases.setdefault(normalize_prompt(variant), key)
+            self._entries[key] = _Entry(data, query)
+
+    def _refresh(self, key, query):
+        try:
+            data = self.fetch(query)
+            self._store(normalize_prompt(query), query, data)
+            self.refreshes += 1
+        except Exception as e:
+            # Se sigue sirviendo el dato viejo hasta stale_ttl
+            print(f"⚠️ No se pudo refrescar el clima de {query}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def stats(self):
+        """Aciertos, datos viejos servidos, fallos y ubicaciones en caché"""
+        with self._lock:
+            return {
+                'locations': len(self._entries),
+                'aliases': len(self._aliases),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+            }
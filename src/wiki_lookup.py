@@ -0,0 +1,139 @@
+"""
+Búsqueda en Wikipedia para Angie
+Resultado de búsqueda, resumen y URL en una sola petición a la API (los enlaces de una página
+de desambiguación solo se piden si hace falta), con caché en disco por consulta
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from response_cache import normalize_prompt
+
+
+# La API de Wikimedia pide un User-Agent identificable
+HEADERS = {'User-Agent': 'Angie/1.0 (asistente de voz)'}
+
+
+def api_url(lang):
+    return f"https://{lang}.wikipedia.org/w/api.php"
+
+
+def lookup_params(query, sentences=3, results=3):
+    """Parámetros de action=query: búsqueda como generador más extractos, URL y marca de desambiguación"""
+    return {
+        'action': 'query',
+        'format': 'json',
+        'formatversion': 2,
+        'generator': 'search',
+        'gsrsearch': query,
+        'gsrlimit': results,
+        'redirects': 1,
+        'prop': 'extracts|info|pageprops',
+        'exintro': 1,
+        'explaintext': 1,
+        'exsentences': sentences,
+        'exlimit': results,
+        'inprop': 'url',
+        'ppprop': 'disambiguation',
+    }
+
+
+def links_params(title, limit=20):
+    """Parámetros para los enlaces (opciones) de una sola página de desambiguación"""
+    return {
+        'action': 'query',
+        'format': 'json',
+        'formatversion': 2,
+        'titles': title,
+        'prop': 'links',
+        'plnamespace': 0,
+        'pllimit': limit,
+    }
+
+
+def parse_links(data, max_options=5):
+    pages = data.get('query', {}).get('pages', [])
+    return [link['title'] for page in pages for link in page.get('links', [])][:max_options]
+
+
+def parse_lookup(data, max_options=5):
+    """Convertir la respuesta de la API en {'status', 'title', 'summary', 'url', 'options'}"""
+    pages = sorted(data.get('query', {}).get('pages', []), key=lambda page: page.get('index', 0))
+    pages = [page for page in pages if not page.get('missing')]
+    if not pages:
+        return {'status': 'not_found', 'title': None, 'summary': '', 'url': None, 'options': []}
+    top = pages[0]
+    result = {
+        'status': 'ok',
+        'title': top.get('title'),
+        'summary': (top.get('extract') or '').strip(),
+        'url': top.get('fullurl'),
+        'options': [],
+    }
+    if 'disambiguation' in top.get('pageprops', {}):
+        result['status'] = 'disambiguation'
+        result['options'] = [link['title'] for link in top.get('links', [])][:max_options]
+    return result
+
+
+class WikiLookup:
+    """Consultas a Wikipedia con una petición por búsqueda y caché SQLite con TTL"""
+
+    def __init__(self, http, db_path, lang='es', ttl_hours=72, not_found_ttl_minutes=10):
+        self.http = http
+        self.lang = lang
+        self.ttl = ttl_hours * 3600
+        # Un "no encontrado" puede deberse a un artículo nuevo o a un fallo puntual: dura poco
+        self.not_found_ttl = not_found_ttl_minutes * 60
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS wiki_cache (
+                query_key TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (query_key, lang)
+            )
+        ''')
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, query):
+        """Resultado para la consulta, de la caché si está fresco o de la API"""
+        key = normalize_prompt(query)
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT payload, created_at FROM wiki_cache WHERE query_key = ? AND lang = ?',
+                (key, self.lang)).fetchone()
+        if row is not None:
+            cached = json.loads(row[0])
+            ttl = self.not_found_ttl if cached['status'] == 'not_found' else self.ttl
+            if time.time() - row[1] < ttl:
+                self.hits += 1
+                return cached
+        self.misses += 1
+
+        response = self.http.get(api_url(self.lang), params=lookup_params(query), headers=HEADERS)
+        response.raise_for_status()
+        result = parse_lookup(response.json())
+        if result['status'] == 'disambiguation' and not result['options']:
+            response = self.http.get(api_url(self.lang), params=links_params(result['title']), headers=HEADERS)
+            response.raise_for_status()
+            result['options'] = parse_links(response.json())
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO wiki_cache (query_key, lang, payload, created_at) VALUES (?, ?, ?, ?)',
+                (key, self.lang, json.dumps(result), time.time()))
+            self.conn.commit()
+        return result
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Genera el conjunto de audios sintéticos usado por test_wake_word.py
+Cada "palabra" es una secuencia de sílabas con dos formantes; las variantes
+cambian velocidad, tono, volumen y ruido de fondo. Semilla fija: salida estable.
+"""
+
+import os
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Formantes (Hz) de cada sílaba: "a-sis-ten-te" frente a otras frases
+WAKE_WORD = [(750, 1200), (300, 2300), (500, 1800), (400, 2100)]
+OTHER_WORDS = [
+    [(300, 800), (650, 1000), (280, 2600)],
+    [(550, 900), (350, 1500), (700, 1100), (320, 2700), (600, 1000)],
+]
+
+
+def syllables(formants, stretch=1.0, pitch=1.0, rng=None):
+    """Sintetizar una secuencia de sílabas con envolvente suave"""
+    parts = []
+    for f1, f2 in formants:
+        length = int(SAMPLE_RATE * 0.16 * stretch)
+        t = np.arange(length) / SAMPLE_RATE
+        jitter = rng.uniform(0.97, 1.03)
+        tone = (np.sin(2 * np.pi * f1 * pitch * jitter * t)
+                + 0.6 * np.sin(2 * np.pi * f2 * pitch * jitter * t)
+                + 0.3 * np.sin(2 * np.pi * 130 * pitch * t))
+        parts.append(tone * np.hanning(length))
+        parts.append(np.zeros(int(SAMPLE_RATE * 0.02 * stretch)))
+    return np.concatenate(parts)
+
+
+def utterance(words, rng, stretch=1.0, pitch=1.0, volume=0.3, noise=0.003):
+    """Silencio + palabras + silencio, con ruido de fondo"""
+    silence = np.zeros(int(SAMPLE_RATE * 0.3))
+    body = [silence]
+    for formants in words:
+        body.append(syllables(formants, stretch, pitch, rng))
+        body.append(np.zeros(int(SAMPLE_RATE * 0.12)))
+    body.append(silence)
+    signal = np.concatenate(body)
+    signal = volume * signal / np.max(np.abs(signal))
+    return signal + rng.normal(0, noise, len(signal))
+
+
+def write_wav(name, signal):
+    path = os.path.join(HERE, name)
+    pcm = (np.clip(signal, -1, 1) * 32767).astype('<i2')
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm.tobytes())
+    print(f"✅ {name}")
+
+
+def main():
+    rng = np.random.default_rng(2025)
+    # Plantillas de enrolamiento
+    write_wav('wake_1.wav', utterance([WAKE_WORD], rng, stretch=1.0, pitch=1.0))
+    write_wav('wake_2.wav', utterance([WAKE_WORD], rng, stretch=1.1, pitch=0.97, volume=0.25))
+    write_wav('wake_3.wav', utterance([WAKE_WORD], rng, stretch=0.92, pitch=1.03, volume=0.4))
+    # Palabra de activación seguida de un comando, con más ruido
+    write_wav('wake_command.wav', utterance([WAKE_WORD, OTHER_WORDS[0]], rng,
+                                            stretch=1.05, pitch=1.02, noise=0.006))
+    # Voz que no va dirigida al asistente
+    write_wav('other_1.wav', utterance([OTHER_WORDS[0]], rng))
+    write_wav('other_2.wav', utterance([OTHER_WORDS[1], OTHER_WORDS[0]], rng, stretch=1.1))
+    # Solo ruido ambiente
+    write_wav('silence.wav', rng.normal(0, 0.003, SAMPLE_RATE))
+
+
+if __name__ == "__main__":
+    main()
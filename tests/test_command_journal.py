@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Diario de Comandos - Angie Advanced
+===========================================
+
+Este script prueba el diario de comandos en un directorio temporal.
+
+Funcionalidades probadas:
+- Registro de respuesta real, intención y latencia
+- Rotación por tamaño con compresión gzip y límite de segmentos
+- Lectura en streaming de todos los segmentos en orden
+- Lectura del CSV antiguo sin las respuestas de relleno
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from command_journal import CommandJournal, iter_journal, rotated_segments, training_entries
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_record_and_read():
+    """Cada entrada guarda la respuesta real y la latencia"""
+    print("📒 Probando diario de comandos...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'journal.jsonl')
+        journal = CommandJournal(path)
+        journal.record("qué hora es", "Son las 10:00 AM", intent="time", latency=0.0123)
+        journal.close()
+        entries = list(iter_journal(path))
+        print(f"   {entries[0]}")
+        assert entries[0]['response'] == "Son las 10:00 AM"
+        assert entries[0]['intent'] == "time" and entries[0]['latency_ms'] == 12.3
+
+
+def test_rotation_and_streaming():
+    """Los segmentos rotados se comprimen, se limitan y se leen en orden"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'journal.jsonl')
+        journal = CommandJournal(path, max_bytes=2000, backup_count=3)
+        for i in range(200):
+            journal.record(f"comando {i}", f"respuesta {i}")
+        journal.close()
+        assert journal.rotations > 3
+        assert wait_until(lambda: all(p.endswith('.gz') for p in rotated_segments(path)))
+        segments = rotated_segments(path)
+        assert len(segments) == 3
+        numbers = [int(entry['command'].split()[1]) for entry in iter_journal(path)]
+        # Se conservan las entradas más recientes, en orden y sin huecos
+        assert numbers == list(range(numbers[0], 200))
+
+
+def test_training_entries_skip_placeholders():
+    """El CSV antiguo se lee y se ignora 'Comando procesado'"""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, 'historial_comandos.csv')
+        with open(legacy, 'w', encoding='utf-8') as f:
+            f.write('2025-01-01T10:00:00,hola,Hola! ¿En qué te ayudo?\n')
+            f.write('2025-01-01T10:01:00,busca python,Comando procesado\n')
+        path = os.path.join(tmp, 'journal.jsonl')
+        journal = CommandJournal(path)
+        journal.record("clima", "En Madrid: 20°C", intent="weather")
+        journal.record("nada", "")
+        journal.close()
+        commands = [entry['command'] for entry in training_entries(path, legacy)]
+        assert commands == ["hola", "clima"]
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL DIARIO DE COMANDOS - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_record_and_read()
+    test_rotation_and_streaming()
+    test_training_entries_skip_placeholders()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
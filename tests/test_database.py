@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la Capa de Acceso a Datos - Angie Advanced
+=================================================
+
+Este script prueba la base de datos compartida (hilo escritor + pool de lectura).
+
+Funcionalidades probadas:
+- Esquema creado y modo WAL activado
+- Escrituras concurrentes desde varios hilos sin "database is locked"
+- Lecturas concurrentes mientras se escribe
+- Errores de escritura devueltos al llamador
+- Cierre de todos los lectores (también los prestados) y consultas rechazadas tras cerrar
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from database import get_database
+
+
+def test_schema_and_wal():
+    """Se crean las tablas de Angie y la base queda en modo WAL"""
+    print("🗄️ Probando esquema y WAL...")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        assert get_database(os.path.join(tmp, 'angie.db')) is db
+        tables = {row[0] for row in db.query("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {'notes', 'reminders', 'tasks', 'interactions', 'notes_fts'} <= tables
+        assert db.query_one('PRAGMA journal_mode')[0] == 'wal'
+        db.close()
+
+
+def test_concurrent_writes_and_reads():
+    """Varios hilos escriben y leen a la vez"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        errors = []
+
+        def writer(n):
+            try:
+                for i in range(50):
+                    db.submit("INSERT INTO tasks (title) VALUES (?)", (f"tarea {n}-{i}",))
+                db.execute("INSERT INTO notes (title, content) VALUES (?, ?)", (f"nota {n}", "contenido"))
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            try:
+                for _ in range(50):
+                    db.query("SELECT COUNT(*) FROM tasks")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors, errors
+        assert db.query_one("SELECT COUNT(*) FROM tasks")[0] == 200
+        assert db.query_one("SELECT COUNT(*) FROM notes")[0] == 4
+        print(f"   Escrituras: {db.writes}")
+        db.close()
+
+
+def test_write_errors_reach_caller():
+    """Un error de escritura se lanza en quien la pidió y el escritor sigue vivo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        try:
+            db.execute("INSERT INTO notes (title) VALUES ('sin contenido')")
+            assert False, "se esperaba IntegrityError"
+        except sqlite3.IntegrityError:
+            pass
+        assert db.execute("INSERT INTO notes (title, content) VALUES ('ok', 'ok')") == 1
+        assert db.write_errors == 1
+        db.close()
+
+
+def test_close_closes_borrowed_readers():
+    """Un lector prestado a otro hilo también se cierra y después no se admiten consultas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        borrowed, release = threading.Event(), threading.Event()
+        held = []
+
+        def hold_reader():
+            with db.reader() as conn:
+                held.append(conn)
+                borrowed.set()
+                release.wait(2)
+
+        thread = threading.Thread(target=hold_reader)
+        thread.start()
+        assert borrowed.wait(2)
+        threading.Timer(0.1, release.set).start()
+        db.close()
+        thread.join()
+        try:
+            held[0].execute("SELECT 1")
+            assert False, "el lector prestado debía quedar cerrado"
+        except sqlite3.ProgrammingError:
+            pass
+        try:
+            db.query("SELECT COUNT(*) FROM notes")
+            assert False, "se esperaba RuntimeError"
+        except RuntimeError:
+            pass
+
+        # Un lector que no se devuelve a tiempo se cierra igualmente
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        borrowed.clear()
+        release.clear()
+        held.clear()
+        thread = threading.Thread(target=hold_reader)
+        thread.start()
+        assert borrowed.wait(2)
+        db.close(timeout=0.05)
+        release.set()
+        thread.join()
+        try:
+            held[0].execute("SELECT 1")
+            assert False, "el lector prestado debía quedar cerrado"
+        except sqlite3.ProgrammingError:
+            pass
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE LA CAPA DE DATOS - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_schema_and_wal()
+    test_concurrent_writes_and_reads()
+    test_write_errors_reach_caller()
+    test_close_closes_borrowed_readers()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
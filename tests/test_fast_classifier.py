@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Clasificador por Niveles - Angie Advanced
+=================================================
+
+Este script prueba el clasificador rápido (Naive Bayes con hashing) y el reparto con el LSTM.
+
+Funcionalidades probadas:
+- Entrenamiento y predicción del clasificador rápido
+- Guardado y carga del modelo
+- Consulta al LSTM solo por debajo del umbral de confianza
+- Reparto de tráfico por nivel (las respuestas sin LSTM no cuentan como LSTM)
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from fast_classifier import HashedNaiveBayes, TieredClassifier
+
+TRAINING = [
+    ("qué hora es", "time"), ("dime la hora", "time"), ("hora actual por favor", "time"),
+    ("qué clima hace", "weather"), ("dime el clima en madrid", "weather"), ("va a llover hoy clima", "weather"),
+    ("reproduce música de queen", "music"), ("pon música", "music"), ("reproduce una canción", "music"),
+]
+
+
+def train():
+    texts, labels = zip(*TRAINING)
+    return HashedNaiveBayes().fit(texts, labels)
+
+
+def test_fast_classifier():
+    """Aprende las intenciones y sobrevive a guardar/cargar"""
+    print("⚡ Probando clasificador rápido...")
+    model = train()
+    result = model.predict("¿Qué hora es ahora?")
+    print(f"   {result['command_type']} ({result['confidence']:.2f})")
+    assert result['command_type'] == 'time'
+    assert model.predict("clima en barcelona")['command_type'] == 'weather'
+    assert model.accuracy(*zip(*TRAINING)) == 1.0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rapido.npz')
+        model.save(path)
+        loaded = HashedNaiveBayes.load(path)
+    assert loaded.predict("pon música")['command_type'] == 'music'
+
+
+def test_tiers():
+    """Solo lo dudoso llega al LSTM"""
+    asked = []
+
+    def slow_submit(text, callback):
+        asked.append(text)
+        callback({'command_type': 'chat', 'confidence': 0.99, 'all_probabilities': {}})
+
+    tiers = TieredClassifier(train(), slow_submit, threshold=0.9)
+    assert tiers.classify("qué hora es")['tier'] == 'fast'
+    doubtful = tiers.classify("cuéntame algo")
+    assert doubtful['tier'] == 'lstm' and asked == ["cuéntame algo"]
+    stats = tiers.stats()
+    print(f"   {tiers.summary()}")
+    assert stats['fast_share'] == 0.5 and stats['slow_share'] == 0.5
+
+
+def test_fallback_without_lstm():
+    """Si el LSTM no responde se usa el resultado rápido; sin modelos, None"""
+    tiers = TieredClassifier(train(), lambda text, callback: callback(None), threshold=1.1)
+    assert tiers.classify("qué hora es")['tier'] == 'fast'
+    stats = tiers.stats()
+    assert stats['slow_share'] == 0.0 and stats['fallback_share'] == 1.0
+    assert tiers.slow_latency.percentile(50) == 0.0
+    assert TieredClassifier().classify("qué hora es") is None
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL CLASIFICADOR POR NIVELES - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_fast_classifier()
+    test_tiers()
+    test_fallback_without_lstm()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
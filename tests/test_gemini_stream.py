@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de Respuestas en Streaming - Angie Advanced
+===============================================
+
+Este script prueba la división en frases del streaming de Gemini con un
+modelo falso, sin conexión a internet.
+
+Funcionalidades probadas:
+- Corte en frases a partir de fragmentos arbitrarios
+- Unión de frases demasiado cortas
+- La primera frase llega antes de que termine la generación
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gemini_stream import FakeGeminiModel, SentenceChunker, stream_reply
+
+REPLY = ("Python es un lenguaje de programación muy popular. "
+         "Fue creado por Guido van Rossum a finales de los ochenta. "
+         "Hoy se usa en ciencia de datos, web y automatización.")
+
+
+def test_chunker_splits_sentences():
+    """Las frases se emiten completas aunque lleguen troceadas"""
+    print("✂️ Probando división en frases...")
+    chunker = SentenceChunker()
+    sentences = []
+    for i in range(0, len(REPLY), 7):
+        sentences.extend(chunker.feed(REPLY[i:i + 7]))
+    sentences.extend(chunker.flush())
+    for sentence in sentences:
+        print(f"   - {sentence}")
+    assert len(sentences) == 3
+    assert ' '.join(sentences) == REPLY
+
+
+def test_short_sentences_are_merged():
+    """Frases muy cortas se juntan con la siguiente"""
+    chunker = SentenceChunker(min_chars=10)
+    sentences = chunker.feed("Sí. Claro que puedo ayudarte con eso. ")
+    assert sentences == ["Sí. Claro que puedo ayudarte con eso."]
+
+
+def test_first_sentence_before_generation_ends():
+    """La primera frase se habla mientras el resto se sigue generando"""
+    model = FakeGeminiModel(REPLY, chunk_size=10, delay=0.01)
+    spoken = []
+    start = time.perf_counter()
+    text, first_sentence = stream_reply(model, "qué es python", spoken.append)
+    total = time.perf_counter() - start
+    print(f"   Primera frase: {first_sentence * 1000:.0f} ms | Generación completa: {total * 1000:.0f} ms")
+    assert text == REPLY
+    assert len(spoken) == 3
+    assert first_sentence < total / 2
+    assert model.prompts == ["qué es python"]
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE RESPUESTAS EN STREAMING - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_chunker_splits_sentences()
+    test_short_sentences_are_merged()
+    test_first_sentence_before_generation_ends()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
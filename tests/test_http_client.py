@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Cliente HTTP Compartido - Angie Advanced
+================================================
+
+Este script prueba el cliente HTTP contra un servidor local (sin internet).
+
+Funcionalidades probadas:
+- Reintentos en 5xx/429 respetando Retry-After
+- Devolución de la última respuesta al agotar reintentos
+- Timeouts de lectura (la petición no se cuelga ni se reintenta salvo que se pida)
+- Límite de peticiones simultáneas por host
+- Histograma de latencias por host
+- Consultas en paralelo con el primer resultado útil por prioridad
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from http_client import HttpClient, first_usable
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """/flaky falla dos veces y luego responde; /busy siempre 429; /slow y /wait tardan"""
+    calls = {}
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        count = FlakyHandler.calls.get(path, 0) + 1
+        FlakyHandler.calls[path] = count
+        if path == '/slow':
+            time.sleep(1.0)
+        if path == '/wait':
+            with FlakyHandler.lock:
+                FlakyHandler.active += 1
+                FlakyHandler.max_active = max(FlakyHandler.max_active, FlakyHandler.active)
+            time.sleep(0.1)
+            with FlakyHandler.lock:
+                FlakyHandler.active -= 1
+        if path == '/flaky' and count <= 2:
+            self._reply(503, b'{}')
+        elif path == '/busy':
+            self._reply(429, b'{}', {'Retry-After': '0'})
+        else:
+            self._reply(200, b'{"ok": true}')
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    FlakyHandler.calls = {}
+    FlakyHandler.active = FlakyHandler.max_active = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def test_retries_on_server_error():
+    """Un 503 transitorio se reintenta hasta obtener respuesta"""
+    print("🌐 Probando reintentos...")
+    server, base = start_server()
+    try:
+        client = HttpClient(retries=2, backoff=0.01)
+        response = client.get(f'{base}/flaky', params={'q': 'madrid'})
+        assert response.status_code == 200
+        assert response.json() == {'ok': True}
+        assert FlakyHandler.calls['/flaky'] == 3
+        assert client.retried == 2
+    finally:
+        server.shutdown()
+
+
+def test_returns_last_response_when_exhausted():
+    """Con 429 persistente se devuelve la respuesta para que el llamador la trate"""
+    server, base = start_server()
+    try:
+        client = HttpClient(retries=1, backoff=0.01)
+        response = client.get(f'{base}/busy')
+        assert response.status_code == 429
+        assert FlakyHandler.calls['/busy'] == 2
+    finally:
+        server.shutdown()
+
+
+def test_read_timeout():
+    """Una API lenta lanza Timeout en lugar de bloquear al llamador"""
+    server, base = start_server()
+    try:
+        client = HttpClient(timeout=(1, 0.2), retries=0)
+        start = time.perf_counter()
+        try:
+            client.get(f'{base}/slow')
+            assert False, "se esperaba Timeout"
+        except requests.exceptions.Timeout:
+            pass
+        assert time.perf_counter() - start < 1.0
+        assert client.failures == 1
+    finally:
+        server.shutdown()
+
+
+def test_read_timeout_not_retried():
+    """Con reintentos, un timeout de lectura solo se repite si se pide"""
+    server, base = start_server()
+    try:
+        client = HttpClient(timeout=(1, 0.2), retries=2, backoff=0.01)
+        try:
+            client.get(f'{base}/slow')
+            assert False, "se esperaba Timeout"
+        except requests.exceptions.Timeout:
+            pass
+        assert FlakyHandler.calls['/slow'] == 1 and client.retried == 0
+        try:
+            client.get(f'{base}/slow', retry_read_timeouts=True)
+        except requests.exceptions.Timeout:
+            pass
+        assert FlakyHandler.calls['/slow'] == 4 and client.retried == 2
+    finally:
+        server.shutdown()
+
+
+def test_per_host_limit():
+    """Nunca hay más peticiones en vuelo a un host que per_host_limit"""
+    server, base = start_server()
+    try:
+        client = HttpClient(per_host_limit=2)
+        threads = [threading.Thread(target=client.get, args=(f'{base}/wait',)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"   Máximo simultáneo en el servidor: {FlakyHandler.max_active}")
+        assert FlakyHandler.calls['/wait'] == 6
+        assert FlakyHandler.max_active == 2
+        assert client.requests_sent == 6
+    finally:
+        server.shutdown()
+
+
+def test_latency_histogram():
+    """Cada host acumula su histograma de latencias"""
+    server, base = start_server()
+    try:
+        client = HttpClient()
+        for _ in range(5):
+            client.get(f'{base}/ok')
+        stats = client.stats()[base.split('//')[1]]
+        print(f"   Latencias: p50={stats['p50'] * 1000:.1f} ms, histograma={stats['histogram']}")
+        assert stats['count'] == 5
+        assert sum(count for _, count in stats['histogram']) == 5
+    finally:
+        server.shutdown()
+
+
+def test_first_usable_in_priority_order():
+    """Se elige el primer resultado útil por prioridad y el coste es una sola ida y vuelta"""
+    def call(value, delay):
+        def run():
+            time.sleep(delay)
+            if isinstance(value, Exception):
+                raise value
+            return value
+        return run
+
+    start = time.perf_counter()
+    index, result, outcomes = first_usable(
+        [call(ValueError('caído'), 0.2), call(0, 0.2), call(5, 0.2), call(7, 0.2)],
+        lambda value: value > 0)
+    elapsed = time.perf_counter() - start
+    print(f"   Fan-out: índice {index} en {elapsed * 1000:.0f} ms")
+    assert (index, result) == (2, 5)
+    assert isinstance(outcomes[0], ValueError) and outcomes[1:] == [0, 5]
+    assert elapsed < 0.6
+
+    index, result, outcomes = first_usable([call(0, 0), call(-1, 0)], lambda value: value > 0)
+    assert index is None and result is None and outcomes == [0, -1]
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL CLIENTE HTTP - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_retries_on_server_error()
+    test_returns_last_response_when_exhausted()
+    test_read_timeout()
+    test_read_timeout_not_retried()
+    test_per_host_limit()
+    test_latency_histogram()
+    test_first_usable_in_priority_order()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Reentrenamiento Incremental - Angie Advanced
+====================================================
+
+Este script prueba las piezas del reentrenamiento incremental que no necesitan TensorFlow.
+
+Funcionalidades probadas:
+- Marca de agua y conteos guardados entre entrenamientos
+- Métricas de deriva y decisión de reentrenar desde cero
+- Cambio de distribución de comandos significativo según el tamaño del lote
+- Cubos OOV para palabras nuevas sin cambiar el tamaño del vocabulario
+- Clasificador rápido actualizado solo con las filas nuevas
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from fast_classifier import HashedNaiveBayes
+from incremental_training import (advance_state, drift_report, full_retrain_reason, load_training_state,
+                                  new_state, save_training_state)
+from text_vectorizer import TextVectorizer
+
+OLD_TEXTS = ["qué hora es", "dime la hora", "qué clima hace", "clima de hoy"]
+OLD_LABELS = ["time", "time", "weather", "weather"]
+
+
+def test_state_roundtrip():
+    """La marca de agua y los conteos avanzan con cada ajuste"""
+    print("🔁 Probando estado del entrenamiento incremental...")
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, 'modelo')
+        assert load_training_state(prefix) is None
+        save_training_state(prefix, new_state(4, OLD_LABELS))
+        state = advance_state(load_training_state(prefix), 6, ["time", "time"])
+        assert state['last_id'] == 6 and state['rows_since_full'] == 2
+        assert state['label_counts'] == {'time': 4, 'weather': 2}
+
+
+def test_drift_decision():
+    """Filas parecidas se ajustan; etiquetas o vocabulario nuevos piden reentrenar"""
+    vectorizer = TextVectorizer.fit(OLD_TEXTS, max_len=5, clean=True, oov_buckets=8)
+    state = dict(new_state(4, OLD_LABELS), rows_at_full=100)
+    report = drift_report(state, ["qué hora es", "clima hoy"], ["time", "weather"], vectorizer, ["time", "weather"])
+    print(f"   {report}")
+    assert full_retrain_reason(report) is None
+    report = drift_report(state, ["pon música"], ["music"], vectorizer, ["time", "weather"])
+    assert report['new_labels'] == ['music'] and full_retrain_reason(report)
+    report = drift_report(state, ["abre el navegador ahora"], ["time"], vectorizer, ["time", "weather"])
+    assert report['oov_rate'] == 1.0 and full_retrain_reason(report)
+
+
+def test_label_shift_needs_evidence():
+    """Un lote pequeño con ruido no pide reentrenar; un cambio claro con filas suficientes sí"""
+    vectorizer = TextVectorizer.fit(OLD_TEXTS, max_len=5, clean=True, oov_buckets=8)
+    state = dict(new_state(0, label_counts={'time': 500, 'weather': 500}), rows_at_full=10000)
+    classes = ["time", "weather"]
+    # 13 contra 7 es una distancia de 0.15 con solo 20 filas: ruido
+    noisy = drift_report(state, ["qué hora es"] * 20, ["time"] * 13 + ["weather"] * 7, vectorizer, classes)
+    print(f"   Ruido: shift={noisy['label_shift']:.2f} p={noisy['label_shift_p']:.3f}")
+    assert noisy['label_shift_p'] > 0.01 and full_retrain_reason(noisy) is None
+    noisy = drift_report(state, ["qué hora es"] * 8, ["time"] * 7 + ["weather"], vectorizer, classes)
+    assert noisy['label_shift'] > 0.3 and full_retrain_reason(noisy) is None
+    shifted = drift_report(state, ["qué hora es"] * 60, ["time"] * 55 + ["weather"] * 5, vectorizer, classes)
+    print(f"   Cambio: shift={shifted['label_shift']:.2f} p={shifted['label_shift_p']:.2g}")
+    assert shifted['label_shift_p'] < 0.01 and full_retrain_reason(shifted)
+
+
+def test_oov_buckets_and_partial_fit():
+    """Palabras nuevas van a cubos reservados y el clasificador rápido suma filas"""
+    vectorizer = TextVectorizer.fit(OLD_TEXTS, max_len=3, clean=True, oov_buckets=8)
+    encoded = vectorizer.encode(["hora navegador"])[0]
+    assert encoded[1] == vectorizer.word_index['hora']
+    assert vectorizer.bucket_base <= encoded[2] < vectorizer.vocab_size
+    assert (vectorizer.encode(["navegador"]) == vectorizer.encode(["navegador"])).all()
+
+    full = HashedNaiveBayes().fit(OLD_TEXTS + ["pon música"], OLD_LABELS + ["music"])
+    incremental = HashedNaiveBayes().fit(OLD_TEXTS, OLD_LABELS).partial_fit(["pon música"], ["music"])
+    assert sorted(incremental.classes.tolist()) == sorted(full.classes.tolist())
+    assert np.isclose(incremental.predict("pon música")['confidence'], full.predict("pon música")['confidence'])
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL REENTRENAMIENTO INCREMENTAL - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_state_roundtrip()
+    test_drift_decision()
+    test_label_shift_needs_evidence()
+    test_oov_buckets_and_partial_fit()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Router de Intenciones - Angie Advanced
+==============================================
+
+Este script prueba el enrutado de comandos con la tabla compilada.
+
+Funcionalidades probadas:
+- Elección de intención por prioridad
+- Coincidencias más específicas ("buscar nota" frente a "busca")
+- Palabras completas: ni "hora" en "horario" ni "nota" en "notable"; plurales y verbos explícitos
+- Normalización de acentos y mayúsculas
+- Clasificación de tipos de comando para el registro LSTM
+- Extracción del término de búsqueda de notas
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from intent_router import IntentRouter, NEWS_CATEGORY_TABLE, get_default_router, notes_search_term
+
+
+def test_route_by_priority():
+    """Probar que gana la intención de mayor prioridad"""
+    print("🧭 Probando prioridad de intenciones...")
+    router = get_default_router()
+
+    cases = {
+        "qué hora es": "time",
+        "qué tiempo hace en madrid": "weather",
+        "dime la hora y el tiempo": "time",
+        "reproduce las noticias de la radio": "music",
+        "crear nota sobre la hora de la reunión": "notes_create",
+        "busca python": "search",
+        "buscar nota compras": "notes_search",
+        "ayuda de notas": "notes_help",
+        "agregar tarea lavar el coche": "tasks",
+    }
+
+    for command, expected in cases.items():
+        match = router.route(command)
+        print(f"   '{command}' -> {match.name if match else None}")
+        assert match is not None and match.name == expected
+
+
+def test_no_match_goes_to_gemini():
+    """Comandos sin palabra clave no se enrutan (van a Gemini)"""
+    router = get_default_router()
+    assert router.route("cuéntame un chiste") is None
+    # "hora" no debe coincidir dentro de "ahora"
+    assert router.route("ahora dime algo bonito") is None
+    # Ni una palabra clave al principio de otra palabra
+    assert router.route("eso es notable") is None
+    assert router.route("busco un notario") is None
+    assert router.route("cuál es el horario") is None
+
+
+def test_plural_and_verb_variants():
+    """Plurales y formas verbales que antes coincidían por prefijo siguen enrutándose"""
+    router = get_default_router()
+    cases = {
+        "qué horas son": "time",
+        "muéstrame las notas": "note",
+        "anotar el número de la reunión": "notes_create",
+        "lista de tareas": "tasks",
+        "mis recordatorios": "reminder",
+        "capturar la pantalla": "screenshot",
+    }
+    for command, expected in cases.items():
+        match = router.route(command)
+        assert match is not None and match.name == expected, (command, match)
+
+
+def test_accents_and_case():
+    """Probar normalización de acentos y mayúsculas"""
+    router = get_default_router()
+    assert router.route("ADIÓS").name == "goodbye"
+    assert router.route("adios").name == "goodbye"
+    assert router.route("Cuantas notas tengo").name == "notes_summary"
+
+
+def test_news_categories():
+    """Probar la tabla de categorías de noticias"""
+    router = IntentRouter(NEWS_CATEGORY_TABLE)
+    assert router.route("noticias de deportes").name == "sports"
+    assert router.route("noticias de economía").name == "business"
+    assert router.route("resumen de noticias").name == "general"
+    assert router.route("noticias") is None
+
+
+def test_classify_for_lstm():
+    """Probar la clasificación con pistas adicionales"""
+    router = get_default_router()
+    assert router.classify("qué temperatura hace") == "weather"
+    assert router.classify("pon música") == "music"
+    assert router.classify("hola, cómo estás") == "chat"
+    assert router.classify("lee mis notas") == "notes"
+    assert router.classify("algo sin sentido") == "chat"
+
+
+def test_notes_search_term():
+    """La palabra clave se quita entera, también en plural"""
+    router = get_default_router()
+    for command in ["buscar notas compras", "buscar nota compras", "buscar en mis notas compras"]:
+        assert router.route(command).name == "notes_search"
+        assert notes_search_term(command) == "compras"
+    assert notes_search_term("buscar notas") == ""
+    assert notes_search_term("buscar nota notariales") == "notariales"
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL ROUTER DE INTENCIONES - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_route_by_priority()
+    test_no_match_goes_to_gemini()
+    test_plural_and_verb_variants()
+    test_accents_and_case()
+    test_news_categories()
+    test_classify_for_lstm()
+    test_notes_search_term()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
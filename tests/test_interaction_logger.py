@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Registro de Interacciones por Lotes - Angie Advanced
+============================================================
+
+Este script prueba el búfer de interacciones sobre una base de datos temporal.
+
+Funcionalidades probadas:
+- Vaciado por tamaño de lote y por tiempo
+- Vaciado garantizado al cerrar
+- Descarte de las filas más antiguas con el búfer lleno
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from database import get_database
+from interaction_logger import InteractionLogger
+
+
+def count_interactions(db):
+    return db.query_one("SELECT COUNT(*) FROM interactions")[0]
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_flush_by_size_and_time():
+    """Un lote completo se escribe enseguida y el resto al pasar el intervalo"""
+    print("🧾 Probando registro por lotes...")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        logger = InteractionLogger(db, batch_size=10, flush_interval=0.2)
+        for i in range(10):
+            logger.log(f"comando {i}", "respuesta", "chat")
+        assert wait_until(lambda: count_interactions(db) == 10)
+        for i in range(3):
+            logger.log(f"comando extra {i}", "respuesta", "chat")
+        assert wait_until(lambda: count_interactions(db) == 13)
+        stats = logger.stats()
+        print(f"   Estadísticas: {stats}")
+        assert stats['flushed'] == 13 and stats['flushes'] == 2
+        logger.close()
+        db.close()
+
+
+def test_close_flushes_everything():
+    """Al cerrar no se pierde ninguna interacción"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        logger = InteractionLogger(db, batch_size=1000, flush_interval=60)
+        for i in range(25):
+            logger.log(f"comando {i}", "respuesta")
+        assert count_interactions(db) == 0
+        logger.close()
+        assert count_interactions(db) == 25
+        row = db.query_one("SELECT user_input, timestamp FROM interactions ORDER BY id LIMIT 1")
+        assert row[0] == "comando 0" and len(row[1]) == 19
+        db.close()
+
+
+def test_drops_oldest_when_full():
+    """Con el búfer lleno se descartan las filas más antiguas y se cuentan"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        logger = InteractionLogger(db, batch_size=1000, flush_interval=60, max_buffer=5)
+        for i in range(8):
+            logger.log(f"comando {i}", "respuesta")
+        logger.close()
+        assert logger.dropped == 3
+        assert [row[0] for row in db.query("SELECT user_input FROM interactions ORDER BY id")] == \
+            [f"comando {i}" for i in range(3, 8)]
+        db.close()
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL REGISTRO DE INTERACCIONES - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_flush_by_size_and_time()
+    test_close_flushes_everything()
+    test_drops_oldest_when_full()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de las Estadísticas Incrementales - Angie Advanced
+======================================================
+
+Este script prueba los resúmenes de interacciones sobre una base de datos temporal.
+
+Funcionalidades probadas:
+- Conteo por tipo de comando, vocabulario e histograma por hora
+- Actualización incremental desde el último id procesado
+- Últimas N interacciones en orden
+- Actualización automática tras cada lote del registro de interacciones
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from database import get_database
+from interaction_logger import INSERT_INTERACTION, InteractionLogger
+from interaction_stats import InteractionStats
+
+
+def test_aggregates():
+    """Los resúmenes coinciden con los datos insertados"""
+    print("📊 Probando estadísticas incrementales...")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        db.executemany(INSERT_INTERACTION, [
+            ("qué hora es", "Son las 10", "time", 0.9, "2025-01-01 10:00:00"),
+            ("Qué clima hace", "Soleado", "weather", 0.8, "2025-01-01 10:30:00"),
+            ("hora actual", "Son las 11", "time", 0.9, "2025-01-01 11:00:00"),
+        ])
+        stats = InteractionStats(db)
+        assert stats.refresh().result() == 3
+        snapshot = stats.snapshot()
+        print(f"   {snapshot['command_types']} - {snapshot['unique_words']} palabras")
+        assert snapshot['total_interactions'] == 3
+        assert snapshot['command_types'] == {'time': 2, 'weather': 1}
+        # qué, hora, es, clima, hace, actual
+        assert snapshot['unique_words'] == 6
+        assert snapshot['hourly_activity'][10] == 2 and snapshot['hourly_activity'][11] == 1
+        db.close()
+
+
+def test_incremental_refresh():
+    """Solo se procesan las filas nuevas y el estado sobrevive a un reinicio"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'angie.db')
+        db = get_database(path)
+        rows = [(f"comando {i}", "ok", "chat", 0.5, "2025-01-01 09:00:00") for i in range(25)]
+        db.executemany(INSERT_INTERACTION, rows)
+        stats = InteractionStats(db, recent_size=5)
+        assert stats.refresh().result() == 25
+        assert stats.refresh().result() == 0
+        db.close()
+
+        db = get_database(path)
+        db.executemany(INSERT_INTERACTION, [("comando nuevo", "ok", "note", 0.5, "2025-01-01 09:05:00")])
+        stats = InteractionStats(db, recent_size=5)
+        assert stats.refresh().result() == 1
+        snapshot = stats.snapshot()
+        assert snapshot['total_interactions'] == 26
+        assert snapshot['unique_words'] == 27
+        recent = [entry['user_input'] for entry in snapshot['recent_activity']]
+        assert recent == ["comando 21", "comando 22", "comando 23", "comando 24", "comando nuevo"]
+        db.close()
+
+
+def test_logger_updates_stats():
+    """Cada lote escrito por el registro actualiza los resúmenes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        stats = InteractionStats(db)
+        logger = InteractionLogger(db, flush_interval=60, on_flush=stats.refresh)
+        for i in range(4):
+            logger.log(f"nota {i}", "guardada", "note")
+        logger.close()
+        # El refresco se encola detrás del lote; esta escritura espera a ambos
+        db.write(lambda conn: None).result()
+        assert stats.snapshot()['command_types'] == {'note': 4}
+        db.close()
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE ESTADÍSTICAS INCREMENTALES - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_aggregates()
+    test_incremental_refresh()
+    test_logger_updates_stats()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
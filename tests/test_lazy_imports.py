@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de las Importaciones Diferidas - Angie Advanced
+===================================================
+
+Este script prueba la carga diferida de dependencias y el informe de arranque.
+
+Funcionalidades probadas:
+- El módulo no se importa hasta el primer acceso a un atributo
+- Registro del coste de importación de cada módulo
+- Precarga que informa de las dependencias que faltan sin detenerse
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from lazy_imports import import_times, lazy_import, preload, startup_report, timed_import
+
+
+def test_import_on_first_use():
+    """La importación ocurre en el primer acceso y queda registrada"""
+    print("💤 Probando importación diferida...")
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'modulo_pesado_angie.py'), 'w', encoding='utf-8') as f:
+            f.write("VALOR = 42\n")
+        sys.path.insert(0, tmp)
+        try:
+            module = lazy_import('modulo_pesado_angie')
+            assert 'modulo_pesado_angie' not in sys.modules
+            assert not module._loaded
+            assert module.VALOR == 42
+            assert module._loaded and 'modulo_pesado_angie' in sys.modules
+        finally:
+            sys.path.remove(tmp)
+            sys.modules.pop('modulo_pesado_angie', None)
+    names = {name: deferred for name, _, deferred in import_times()}
+    assert names['modulo_pesado_angie'] is True
+
+
+def test_preload_and_report():
+    """Las dependencias que faltan se informan y el resto se carga igual"""
+    with timed_import('json'):
+        import json  # noqa: F401
+    failed = preload([lazy_import('modulo_que_no_existe_angie'), lazy_import('colorsys')])
+    assert list(failed) == ['modulo_que_no_existe_angie']
+    lines = startup_report({'ventana': 0.5})
+    for line in lines:
+        print(f"   {line}")
+    assert lines[0].startswith("⏱️ Arranque: ventana 0.50 s")
+    assert any('colorsys' in line and 'diferido' in line for line in lines)
+    assert any('json' in line and 'al arrancar' in line for line in lines)
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE IMPORTACIONES DIFERIDAS - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_import_on_first_use()
+    test_preload_and_report()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Clasificador TensorFlow Lite - Angie Advanced
+=====================================================
+
+Este script prueba el predictor ligero sin el runtime de TFLite (con un intérprete de prueba).
+
+Funcionalidades probadas:
+- Codificación idéntica a clean_text + texts_to_sequences + pad_sequences
+- Palabras desconocidas y fuera de num_words como <OOV>
+- Elección automática solo si existen el modelo y el vocabulario
+- Un solo invoke por lote, redimensionando la entrada solo cuando cambia el tamaño
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from lite_predictor import LiteBackend, lite_available
+from text_vectorizer import TextVectorizer
+
+VOCAB = {
+    'format': 1,
+    'max_len': 4,
+    'num_words': 6,
+    'oov_index': 1,
+    'filters': '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n',
+    'word_index': {'<OOV>': 1, 'qué': 2, 'hora': 3, 'es': 4, 'clima': 5},
+    'classes': ['time', 'weather'],
+}
+
+
+def test_encode_matches_keras_padding():
+    """Relleno y recorte por delante, como pad_sequences"""
+    print("⚡ Probando codificación del predictor ligero...")
+    vectorizer = TextVectorizer.from_dict(VOCAB)
+    encoded = vectorizer.encode(["¿Qué hora es?", "dime el clima en Madrid ahora"])
+    print(f"   {encoded.tolist()}")
+    assert encoded.tolist() == [[0, 2, 3, 4], [5, 1, 1, 1]]
+    assert vectorizer.encode(["clima"]).tolist() == [[0, 0, 0, 5]]
+    assert vectorizer.encode([""]).tolist() == [[0, 0, 0, 0]]
+
+
+def test_lite_available_needs_files():
+    """Sin .tflite y vocabulario no se elige el camino ligero"""
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, 'modelo')
+        assert not lite_available(prefix)
+        with open(f'{prefix}_vocab.json', 'w', encoding='utf-8') as f:
+            json.dump(VOCAB, f)
+        assert not lite_available(prefix)
+
+
+class FakeInterpreter:
+    """Intérprete de prueba con la interfaz de tflite: la clase 1 ('weather') si aparece 'clima'"""
+
+    def __init__(self, model_path=None, num_threads=1):
+        self.shape = [1, VOCAB['max_len']]
+        self.invokes = 0
+        self.allocations = 0
+        self.resizes = []
+
+    def get_input_details(self):
+        return [{'index': 0, 'shape': np.array(self.shape), 'dtype': np.float32}]
+
+    def get_output_details(self):
+        return [{'index': 1, 'quantization': (0.0, 0)}]
+
+    def resize_tensor_input(self, index, shape):
+        self.resizes.append(list(shape))
+        self.shape = list(shape)
+        self._input = None
+
+    def allocate_tensors(self):
+        self.allocations += 1
+
+    def set_tensor(self, index, value):
+        assert list(value.shape) == self.shape, "la entrada no coincide con el tensor reservado"
+        self._input = value
+
+    def invoke(self):
+        self.invokes += 1
+        weather = (self._input == VOCAB['word_index']['clima']).any(axis=1).astype(np.float32)
+        self._output = np.stack([1 - weather, weather], axis=1)
+
+    def get_tensor(self, index):
+        return self._output
+
+
+def test_batched_predict():
+    """Todo el lote en un invoke; mismo resultado que fila a fila"""
+    print("⚡ Probando predicción por lotes del predictor ligero...")
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, 'modelo')
+        with open(f'{prefix}_vocab.json', 'w', encoding='utf-8') as f:
+            json.dump(VOCAB, f)
+        backend = LiteBackend(prefix, interpreter_class=FakeInterpreter)
+        backend.load()
+        interpreter = backend.interpreter
+
+        texts = ["qué hora es", "el clima", "clima hoy", "hora"]
+        probs = backend.predict(backend.encode(texts))
+        assert probs.shape == (4, 2)
+        assert np.argmax(probs, axis=1).tolist() == [0, 1, 1, 0]
+        assert interpreter.invokes == 1
+        assert interpreter.resizes == [[4, VOCAB['max_len']]]
+
+        # Mismo tamaño: no se vuelve a reservar memoria
+        allocations = interpreter.allocations
+        backend.predict(backend.encode(texts))
+        assert interpreter.allocations == allocations
+        assert interpreter.invokes == 2
+
+        result = backend.predict_command_type("dime el clima")
+        assert result['command_type'] == 'weather'
+        assert interpreter.resizes[-1] == [1, VOCAB['max_len']]
+        print(f"   invokes: {interpreter.invokes}, redimensiones: {len(interpreter.resizes)}")
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL CLASIFICADOR TFLITE - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_encode_matches_keras_padding()
+    test_lite_available_needs_files()
+    test_batched_predict()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
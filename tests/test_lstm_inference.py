@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Servidor de Inferencia LSTM - Angie Advanced
+====================================================
+
+Este script prueba el servidor de inferencia con un backend NumPy que imita al modelo.
+
+Funcionalidades probadas:
+- Carga y calentamiento únicos al arrancar
+- Agrupación de peticiones concurrentes en micro-lotes
+- Entrega del resultado por callback y por Future
+- Errores de carga devueltos a quien pide la predicción
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from lstm_inference import LSTMInferenceServer
+
+
+class FakeBackend:
+    """Clasifica por la primera palabra; cada llamada a predict cuesta lo mismo sea cual sea el lote"""
+
+    classes = np.array(['clima', 'hora'])
+    max_len = 4
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.loads = 0
+        self.batch_sizes = []
+
+    def load(self):
+        self.loads += 1
+        if self.fail:
+            raise RuntimeError("modelo no encontrado")
+
+    def encode(self, texts):
+        return np.array([[1 if t.startswith('clima') else 2, 0, 0, 0] for t in texts])
+
+    def predict(self, batch):
+        self.batch_sizes.append(len(batch))
+        time.sleep(0.01)
+        is_hora = (batch[:, 0] == 2).astype(float)
+        return np.stack([0.9 - 0.8 * is_hora, 0.1 + 0.8 * is_hora], axis=1)
+
+
+def test_warm_start_and_callback():
+    """El modelo se carga y calienta una vez y el resultado llega por callback"""
+    print("🧠 Probando servidor de inferencia...")
+    backend = FakeBackend()
+    server = LSTMInferenceServer(backend, max_batch=8)
+    server.start()
+    assert server.ready.wait(2.0)
+    # Lote de 1 y lote completo de calentamiento
+    assert backend.batch_sizes == [1, 8]
+
+    received = []
+    done = threading.Event()
+    server.submit("clima en madrid", lambda result: (received.append(result), done.set()))
+    assert done.wait(2.0)
+    assert received[0]['command_type'] == 'clima' and received[0]['confidence'] == 0.9
+    assert server.predict("hora actual")['command_type'] == 'hora'
+    server.stop()
+    assert backend.loads == 1
+
+
+def test_micro_batching():
+    """Las peticiones concurrentes comparten llamadas a predict"""
+    backend = FakeBackend()
+    server = LSTMInferenceServer(backend, max_batch=16, max_wait=0.02)
+    server.start()
+    server.ready.wait(2.0)
+    futures = [server.submit(f"hora {i}") for i in range(40)]
+    results = [f.result(2.0) for f in futures]
+    server.stop()
+    assert all(r['command_type'] == 'hora' for r in results)
+    stats = server.stats()
+    print(f"   {server.summary()}")
+    assert stats['requests'] == 40
+    assert stats['batches'] < 10
+    assert stats['p99_ms'] >= stats['p50_ms'] > 0
+
+
+def test_load_error_reaches_caller():
+    """Si el modelo no carga, las predicciones fallan sin bloquear"""
+    server = LSTMInferenceServer(FakeBackend(fail=True))
+    server.start()
+    server.ready.wait(2.0)
+    received = []
+    server.submit("clima", received.append)
+    assert received == [None]
+    try:
+        server.predict("clima", timeout=1.0)
+        assert False, "se esperaba RuntimeError"
+    except RuntimeError:
+        pass
+    server.stop()
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL SERVIDOR DE INFERENCIA LSTM - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_warm_start_and_callback()
+    test_micro_batching()
+    test_load_error_reaches_caller()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la Caché de Noticias - Angie Advanced
+============================================
+
+Este script prueba la caché de titulares con una API de noticias falsa.
+
+Funcionalidades probadas:
+- Titulares servidos desde SQLite sin red mientras están frescos
+- Peticiones condicionales (ETag / 304)
+- Precarga por categoría con el primer país que tenga titulares
+- Precarga limitada a las categorías pedidas y parada ordenada
+- Categorías pedidas guardadas en la caché para las siguientes sesiones
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from news_cache import NewsCache, NewsPrefetcher
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+
+    def json(self):
+        return self._data
+
+
+class FakeNewsAPI:
+    """Solo 'gb' tiene titulares; responde 304 si el ETag coincide"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        self.calls.append((params['category'], params['country']))
+        etag = f"v-{params['category']}"
+        if (headers or {}).get('If-None-Match') == etag:
+            return FakeResponse(304)
+        if params['country'] != 'gb':
+            return FakeResponse(200, {'status': 'ok', 'articles': []})
+        articles = [{'title': f"{params['category']} {i}"} for i in range(3)]
+        return FakeResponse(200, {'status': 'ok', 'articles': articles}, {'ETag': etag})
+
+
+def test_cache_and_conditional_requests():
+    """Los titulares frescos no tocan la red y al caducar se revalidan con ETag"""
+    print("📰 Probando caché de titulares...")
+    api = FakeNewsAPI()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = NewsCache(os.path.join(tmp, 'news.db'), api, 'key', ttl=60)
+        status, data = cache.headlines('sports', 'gb')
+        assert status == 200 and len(data['articles']) == 3
+        assert cache.headlines('sports', 'gb')[1] == data
+        assert len(api.calls) == 1
+
+        status, revalidated = cache.fetch('sports', 'gb')
+        assert status == 304 and revalidated == data
+        assert cache.stats()['not_modified'] == 1
+        cache.close()
+
+
+def test_prefetch_all_categories():
+    """La precarga se queda con el primer país con titulares y no repite lo fresco"""
+    api = FakeNewsAPI()
+    categories = ['general', 'sports', 'technology']
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = NewsCache(os.path.join(tmp, 'news.db'), api, 'key')
+        prefetcher = NewsPrefetcher(cache, categories, ['us', 'gb', 'es'], interval=3600)
+        prefetcher.prefetch_once()
+        assert api.calls == [(c, country) for c in categories for country in ('us', 'gb')]
+        for category in categories:
+            assert cache.cached(category, 'gb') is not None
+            assert cache.cached(category, 'es') is None
+
+        prefetcher.prefetch_once()
+        # 'us' sigue sin titulares; 'gb' está fresco y no se vuelve a pedir
+        assert len(api.calls) == 9
+        print(f"   Estadísticas: {cache.stats()}")
+        cache.close()
+
+
+def test_prefetch_only_requested_categories():
+    """Sin categorías pedidas no se gasta cuota; stop() espera a la pasada en curso"""
+    api = FakeNewsAPI()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = NewsCache(os.path.join(tmp, 'news.db'), api, 'key')
+        prefetcher = NewsPrefetcher(cache, countries=['gb'], interval=3600)
+        prefetcher.prefetch_once()
+        assert api.calls == []
+        prefetcher.track('sports')
+        prefetcher.track('sports')
+        prefetcher.start()
+        assert prefetcher._stop.wait(0.2) is False
+        prefetcher.stop()
+        assert prefetcher._thread is None
+        assert api.calls == [('sports', 'gb')]
+        cache.close()
+
+        # En la siguiente sesión se sigue precargando lo que se pidió
+        cache = NewsCache(os.path.join(tmp, 'news.db'), api, 'key')
+        prefetcher = NewsPrefetcher(cache, categories=['general'], countries=['gb'], interval=3600)
+        prefetcher.track('science')
+        assert prefetcher.categories == ['general', 'sports', 'science']
+        assert cache.tracked_categories() == ['sports', 'science']
+        cache.close()
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE LA CACHÉ DE NOTICIAS - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_cache_and_conditional_requests()
+    test_prefetch_all_categories()
+    test_prefetch_only_requested_categories()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
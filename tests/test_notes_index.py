@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Índice de Texto Completo de Notas - Angie Advanced
+==========================================================
+
+Este script prueba el índice FTS5 de notas sobre una base de datos en memoria.
+
+Funcionalidades probadas:
+- Migración: indexado de notas ya existentes
+- Sincronización por triggers (insertar, editar, eliminar)
+- Búsqueda sin distinguir acentos, ranking y fragmentos
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from notes_index import ensure_notes_fts, fts_query, search_notes
+
+
+def notes_db():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('''
+        CREATE TABLE notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_date TEXT DEFAULT CURRENT_TIMESTAMP,
+            modified_date TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany('INSERT INTO notes (title, content) VALUES (?, ?)', [
+        ("Cita médica", "Cita con el médico el martes a las 10"),
+        ("Lista de compras", "Leche, pan y una visita al médico de cabecera"),
+        ("Proyecto", "Terminar el informe para el cliente"),
+    ])
+    conn.commit()
+    return conn
+
+
+def test_backfill_and_accents():
+    """Las notas previas se indexan y la búsqueda ignora acentos"""
+    print("🗂️ Probando índice de notas...")
+    conn = notes_db()
+    assert ensure_notes_fts(conn)
+    results = search_notes(conn, "medico")
+    titles = [row[1] for row in results]
+    print(f"   'medico' → {titles}; fragmento: {results[0][5]}")
+    # El título pesa más en el ranking
+    assert titles == ["Cita médica", "Lista de compras"]
+    assert "«médico»" in results[0][5]
+
+
+def test_triggers_keep_index_in_sync():
+    """Insertar, editar y eliminar notas actualiza el índice"""
+    conn = notes_db()
+    ensure_notes_fts(conn)
+    conn.execute("INSERT INTO notes (title, content) VALUES ('Receta', 'Bizcocho de limón')")
+    assert [row[1] for row in search_notes(conn, "limon")] == ["Receta"]
+    conn.execute("UPDATE notes SET content = 'Tarta de manzana' WHERE title = 'Receta'")
+    assert search_notes(conn, "limon") == []
+    assert len(search_notes(conn, "manz")) == 1
+    conn.execute("DELETE FROM notes WHERE title = 'Receta'")
+    assert search_notes(conn, "manzana") == []
+    # Volver a llamar no duplica el índice
+    ensure_notes_fts(conn)
+    assert len(search_notes(conn, "informe")) == 1
+
+
+def test_query_is_sanitized():
+    """La sintaxis de FTS5 del usuario no rompe la consulta"""
+    conn = notes_db()
+    ensure_notes_fts(conn)
+    assert fts_query('informe "cliente" OR*') == '"informe"* "cliente"* "OR"*'
+    assert len(search_notes(conn, 'informe "cliente" (')) == 1
+    assert search_notes(conn, '¿?') == []
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL ÍNDICE DE NOTAS - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_backfill_and_accents()
+    test_triggers_keep_index_in_sync()
+    test_query_is_sanitized()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
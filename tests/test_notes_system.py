@@ -19,8 +19,13 @@ Fecha: 2025
 
 import sqlite3
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from notes_index import ensure_notes_fts, search_notes
+
 def test_database_connection():
     """Prueba la conexión a la base de datos"""
     print("🔍 Probando conexión a la base de datos...")
@@ -109,18 +114,12 @@ def test_search_notes():
     
     try:
         conn = sqlite3.connect("angie_data.db")
-        cursor = conn.cursor()
+        ensure_notes_fts(conn)
         
         search_terms = ["compras", "proyecto", "médico", "cocina"]
         
         for term in search_terms:
-            cursor.execute('''
-                SELECT title, content 
-                FROM notes 
-                WHERE title LIKE ? OR content LIKE ?
-            ''', (f'%{term}%', f'%{term}%'))
-            
-            results = cursor.fetchall()
+            results = [row[1:3] for row in search_notes(conn, term)]
             print(f"🔍 Búsqueda '{term}': {len(results)} resultados encontrados")
             
             for title, content in results:
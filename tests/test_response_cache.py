@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la Caché de Respuestas - Angie Advanced
+==============================================
+
+Este script prueba la caché SQLite de respuestas de Gemini.
+
+Funcionalidades probadas:
+- Normalización de preguntas (acentos, mayúsculas, puntuación)
+- Coincidencia aproximada por trigramas (opcional, con las mismas palabras y números)
+- Preguntas que dependen del momento fuera de la caché
+- Caducidad (TTL) y expulsión LRU
+- Persistencia entre instancias y estadísticas
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from response_cache import ResponseCache, normalize_prompt
+
+
+def make_cache(tmp, **kwargs):
+    return ResponseCache(os.path.join(tmp, 'response_cache.db'), **kwargs)
+
+
+def test_normalize_prompt():
+    """Variantes de la misma pregunta comparten clave"""
+    print("🔑 Probando normalización de preguntas...")
+    assert normalize_prompt("¿Qué es Python?") == "que es python"
+    assert normalize_prompt("  cuéntame   un chiste!! ") == "cuentame un chiste"
+
+
+def test_exact_and_fuzzy_hits():
+    """Aciertos exactos y aproximados; preguntas distintas fallan"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, fuzzy=True)
+        cache.put("qué es python", "Python es un lenguaje de programación.")
+        assert cache.get("¿Qué es Python?") == "Python es un lenguaje de programación."
+        assert cache.get("que es el python") == "Python es un lenguaje de programación."
+        assert cache.get("qué es java") is None
+        stats = cache.stats()
+        print(f"   Estadísticas: {stats}")
+        assert (stats['hits'], stats['fuzzy_hits'], stats['misses']) == (1, 1, 1)
+        cache.close()
+
+
+def test_similar_but_different_questions():
+    """Preguntas casi iguales con otro número o palabra no comparten respuesta"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, fuzzy=True)
+        cache.put("cuánto es 2 más 2", "4")
+        cache.put("capital de austria", "Viena")
+        cache.put("chiste de perros", "Guau")
+        assert cache.get("cuánto es 2 más 3") is None
+        assert cache.get("capital de australia") is None
+        assert cache.get("chiste de gatos") is None
+        assert cache.get("capital de la austria") == "Viena"
+        cache.close()
+
+        # Sin fuzzy (por defecto) solo valen las claves exactas
+        cache = make_cache(tmp)
+        assert cache.get("capital de la austria") is None
+        assert cache.get("Capital de Austria") == "Viena"
+        cache.close()
+
+
+def test_time_sensitive_not_cached():
+    """Las preguntas que dependen del momento no se guardan"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        for prompt in ["qué pasó hoy", "últimas noticias de ciencia", "qué hace ahora el presidente"]:
+            cache.put(prompt, "respuesta")
+            assert cache.get(prompt) is None
+        assert cache.stats()['skipped'] == 3 and cache.stats()['entries'] == 0
+        cache.close()
+
+
+def test_ttl_expiration():
+    """Las respuestas caducadas no se sirven"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, ttl_hours=0.1 / 3600)
+        cache.put("cuéntame un chiste", "¿Por qué los programadores prefieren el frío?")
+        time.sleep(0.15)
+        assert cache.get("cuéntame un chiste") is None
+        assert cache.stats()['entries'] == 0
+        cache.close()
+
+
+def test_lru_eviction():
+    """Al superar el máximo se expulsa la menos usada"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, max_entries=2, fuzzy=False)
+        cache.put("pregunta uno", "uno")
+        cache.put("pregunta dos", "dos")
+        time.sleep(0.01)
+        assert cache.get("pregunta uno") == "uno"
+        cache.put("pregunta tres", "tres")
+        assert cache.get("pregunta dos") is None
+        assert cache.get("pregunta uno") == "uno"
+        assert cache.get("pregunta tres") == "tres"
+        assert cache.stats()['evictions'] == 1
+        cache.close()
+
+
+def test_persistence():
+    """La caché sobrevive a un reinicio"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        cache.put("capital de francia", "París")
+        cache.close()
+        reopened = make_cache(tmp)
+        assert reopened.get("Capital de Francia") == "París"
+        reopened.close()
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE LA CACHÉ DE RESPUESTAS - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_normalize_prompt()
+    test_exact_and_fuzzy_hits()
+    test_similar_but_different_questions()
+    test_time_sensitive_not_cached()
+    test_ttl_expiration()
+    test_lru_eviction()
+    test_persistence()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Motor de Respuestas RNN - Angie Advanced
+=================================================
+
+Este script prueba el decodificado por lotes del asistente RNN con un modelo falso.
+
+Funcionalidades probadas:
+- Vocabulario inverso construido una sola vez como array de NumPy
+- Decodificado hasta el primer relleno, sin <OOV> ni índices desconocidos
+- Varios comandos con una sola llamada al modelo
+- Importación del módulo sin cargar modelo ni vocabulario
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import asistente_rnn
+from asistente_rnn import RNNResponseEngine
+from text_vectorizer import TextVectorizer
+
+VOCAB = {'<OOV>': 1, 'hola': 2, 'qué': 3, 'tal': 4, 'son': 5, 'las': 6, 'tres': 7}
+
+
+class EchoModel:
+    """Devuelve como respuesta el propio comando codificado (one-hot por paso)"""
+
+    def __init__(self, vocab_size):
+        self.vocab_size = vocab_size
+        self.calls = 0
+
+    def predict_on_batch(self, X):
+        self.calls += 1
+        return np.eye(self.vocab_size, dtype=np.float32)[X]
+
+
+def make_engine():
+    vectorizer = TextVectorizer(VOCAB, max_len=6, clean=True, padding='post')
+    return RNNResponseEngine(model=EchoModel(vectorizer.vocab_size), vectorizer=vectorizer)
+
+
+def test_lazy_import():
+    """Importar el módulo no carga nada"""
+    assert asistente_rnn._engine is None
+    engine = RNNResponseEngine(model_path='no_existe.h5')
+    assert engine._model is None and engine._vectorizer is None
+
+
+def test_decode_batch():
+    """Se corta en el primer 0 y se omiten <OOV> e índices fuera del vocabulario"""
+    print("🧠 Probando decodificado por lotes...")
+    engine = make_engine()
+    decoded = engine.decode_batch(np.array([[2, 1, 4, 0, 3, 3], [5, 6, 7, 99, 0, 0], [0, 2, 2, 2, 2, 2]]))
+    print(f"   {decoded}")
+    assert decoded == ['hola tal', 'son las tres', '']
+    assert engine.words is engine.words
+
+
+def test_respond_batch_single_call():
+    """Varios comandos comparten una llamada al modelo"""
+    engine = make_engine()
+    answers = engine.respond_batch(["Hola, ¿qué tal?", "son las tres", "palabra rara hola"])
+    assert answers == ['hola qué tal', 'son las tres', 'hola']
+    assert engine.model.calls == 1
+    assert engine.respond("las tres") == 'las tres'
+    assert engine.respond_batch([]) == []
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL MOTOR DE RESPUESTAS RNN - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_lazy_import()
+    test_decode_batch()
+    test_respond_batch_single_call()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la Cola de Voz - Angie Advanced
+======================================
+
+Este script prueba el hilo único de síntesis de voz con un motor falso.
+
+Funcionalidades probadas:
+- Orden por prioridad (FIFO dentro de la misma prioridad)
+- Coalescencia de frases con la misma clave
+- Cola acotada y descarte de frases viejas
+- Respuestas en streaming acotadas por la cola, que solo se descartan enteras
+  (y sin decir después el resto de una respuesta descartada)
+- Barge-in (interrupción) sin perder ni cortar las frases urgentes, aunque empiecen justo entonces
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from speech_worker import SpeechWorker, URGENT, NORMAL, BACKGROUND
+
+
+class FakeEngine:
+    """Motor de voz falso: registra lo dicho y se bloquea hasta que se libera"""
+
+    def __init__(self):
+        self.said = []
+        self.stopped = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def say(self, text):
+        self.said.append(text)
+
+    def runAndWait(self):
+        self.gate.wait(2)
+
+    def stop(self):
+        self.stopped += 1
+        self.gate.set()
+
+
+def make_worker(**kwargs):
+    engine = FakeEngine()
+    worker = SpeechWorker(lambda: engine, **kwargs)
+    return worker, engine
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_priority_and_coalescing():
+    """Las urgentes van primero y las frases con la misma clave se fusionan"""
+    print("🔊 Probando prioridad y coalescencia...")
+    worker, engine = make_worker()
+    # Se encola todo antes de arrancar el hilo para que el orden sea determinista
+    worker.speak("noticias 1", priority=BACKGROUND, key="news")
+    worker.speak("hola")
+    worker.speak("noticias 2", priority=BACKGROUND, key="news")
+    worker.speak("recordatorio", priority=URGENT)
+    worker.speak("adiós", priority=NORMAL)
+    worker.start()
+    assert wait_until(lambda: worker.spoken == 4)
+    print(f"   Dicho: {engine.said}")
+    assert engine.said == ["recordatorio", "hola", "adiós", "noticias 2"]
+    assert worker.coalesced == 1
+    assert worker.metrics()['time_to_first_audio']['count'] == 4
+    worker.stop()
+
+
+def test_bounded_queue():
+    """Con la cola llena se descarta la frase menos importante"""
+    worker, engine = make_worker(max_queue=2)
+    worker.speak("fondo", priority=BACKGROUND)
+    worker.speak("normal")
+    worker.speak("urgente", priority=URGENT)
+    worker.speak("otro fondo", priority=BACKGROUND)
+    assert worker.dropped_full == 2
+    worker.start()
+    assert wait_until(lambda: worker.spoken == 2)
+    assert engine.said == ["urgente", "normal"]
+    worker.stop()
+
+
+def test_reply_group_not_split():
+    """Una respuesta larga no supera la cola: sus frases se unen y, si sobra, sale entera"""
+    worker, engine = make_worker(max_queue=3)
+    for i in range(10):
+        worker.speak(f"frase {i}", expires=False, group="respuesta")
+    assert worker.depth == 3 and worker.dropped_full == 0
+    worker.speak("otra", priority=URGENT)
+    assert worker.depth == 1 and worker.dropped_full == 3
+    # Las frases que lleguen después del descarte tampoco se dicen
+    worker.speak("frase 10", expires=False, group="respuesta")
+    assert worker.depth == 1
+    worker.start()
+    assert wait_until(lambda: worker.spoken == 1)
+    assert engine.said == ["otra"]
+    worker.stop()
+
+
+def test_reply_group_coalesced_in_order():
+    """Con la cola llena las frases del grupo se dicen todas, en orden, unidas a la anterior"""
+    worker, engine = make_worker(max_queue=3)
+    for i in range(6):
+        worker.speak(f"f{i}", expires=False, group="respuesta")
+    worker.start()
+    assert wait_until(lambda: worker.spoken == 3)
+    assert " ".join(engine.said) == "f0 f1 f2 f3 f4 f5"
+    worker.stop()
+
+
+def test_normal_does_not_evict_reply():
+    """Una frase normal no desplaza una respuesta de varias frases; sale la frase suelta"""
+    worker, engine = make_worker(max_queue=3)
+    worker.speak("a0", expires=False, group="A")
+    worker.speak("a1", expires=False, group="A")
+    worker.speak("suelta")
+    worker.speak("b0", expires=False, group="B")
+    worker.speak("a2", expires=False, group="A")
+    worker.speak("otra suelta")
+    assert worker.dropped_full == 2
+    worker.start()
+    assert wait_until(lambda: worker.spoken == 3)
+    assert engine.said == ["a0", "a1 a2", "b0"]
+    worker.stop()
+
+
+def test_drop_stale():
+    """Las frases que caducan en cola no se dicen"""
+    worker, engine = make_worker(max_age=0.05)
+    worker.speak("vieja")
+    worker.speak("sin caducidad", expires=False)
+    time.sleep(0.1)
+    worker.start()
+    assert wait_until(lambda: worker.spoken == 1)
+    assert engine.said == ["sin caducidad"]
+    assert worker.dropped_stale == 1
+    worker.stop()
+
+
+def test_barge_in():
+    """El barge-in vacía la cola y corta la frase en curso"""
+    worker, engine = make_worker()
+    engine.gate.clear()
+    worker.start()
+    worker.speak("frase larga", group="larga")
+    assert wait_until(lambda: engine.said == ["frase larga"])
+    worker.speak("pendiente 1")
+    worker.speak("pendiente 2")
+    worker.speak("respuesta nueva", barge_in=True)
+    assert engine.stopped == 1
+    # El resto de la respuesta interrumpida no se dice aunque llegue más tarde
+    worker.speak("final", expires=False, group="larga")
+    assert wait_until(lambda: "respuesta nueva" in engine.said)
+    assert "pendiente 1" not in engine.said and "pendiente 2" not in engine.said
+    assert "final" not in engine.said
+    worker.stop()
+
+
+def test_barge_in_keeps_urgent():
+    """El barge-in no descarta ni corta las frases urgentes"""
+    worker, engine = make_worker()
+    engine.gate.clear()
+    worker.start()
+    worker.speak("recordatorio", priority=URGENT, expires=False)
+    assert wait_until(lambda: engine.said == ["recordatorio"])
+    worker.speak("otro recordatorio", priority=URGENT, expires=False)
+    worker.speak("charla")
+    worker.interrupt()
+    assert engine.stopped == 0
+    engine.gate.set()
+    assert wait_until(lambda: worker.spoken == 2)
+    assert engine.said == ["recordatorio", "otro recordatorio"]
+    worker.stop()
+
+
+def test_interrupt_never_cuts_urgent():
+    """Si la frase en curso termina justo al interrumpir, el corte no cae en la urgente siguiente"""
+    class RacingEngine(FakeEngine):
+        """Al pedirle parar, la frase actual termina sola y se da tiempo a que empiece la siguiente"""
+
+        def __init__(self):
+            super().__init__()
+            self.current = None
+            self.cut = []
+
+        def say(self, text):
+            super().say(text)
+            self.current = text
+
+        def stop(self):
+            self.gate.set()
+            time.sleep(0.1)
+            self.cut.append(self.current)
+
+    engine = RacingEngine()
+    engine.gate.clear()
+    worker = SpeechWorker(lambda: engine)
+    worker.start()
+    worker.speak("charla")
+    assert wait_until(lambda: engine.said == ["charla"])
+    worker.speak("recordatorio", priority=URGENT, expires=False)
+    worker.interrupt()
+    print(f"   Cortada: {engine.cut}")
+    assert engine.cut == ["charla"]
+    assert wait_until(lambda: engine.said == ["charla", "recordatorio"])
+    worker.stop()
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE LA COLA DE VOZ - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_priority_and_coalescing()
+    test_bounded_queue()
+    test_reply_group_not_split()
+    test_reply_group_coalesced_in_order()
+    test_normal_does_not_evict_reply()
+    test_drop_stale()
+    test_barge_in()
+    test_barge_in_keeps_urgent()
+    test_interrupt_never_cuts_urgent()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
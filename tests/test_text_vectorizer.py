@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Vectorizador de Texto en NumPy - Angie Advanced
+=======================================================
+
+Este script prueba el tokenizador en NumPy que sustituye al de Keras en la inferencia.
+
+Funcionalidades probadas:
+- Vocabulario ordenado por frecuencia con <OOV> y límite num_words
+- Relleno y recorte 'pre' y 'post' en un lote
+- Guardado y carga del vocabulario en JSON
+- Paridad con Tokenizer + pad_sequences de Keras (si TensorFlow está instalado)
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from text_vectorizer import TextVectorizer, clean_text
+
+TEXTS = ["qué hora es", "dime la hora", "qué clima hace hoy", "hora de la reunión"]
+
+
+def test_fit_and_encode():
+    """Índices por frecuencia, <OOV> y num_words como en Keras"""
+    print("🔤 Probando vectorizador NumPy...")
+    vectorizer = TextVectorizer.fit(TEXTS, num_words=5, max_len=4)
+    # hora(3) > qué(2) = la(2) por orden de aparición
+    assert vectorizer.word_index['<OOV>'] == 1
+    assert [vectorizer.word_index[w] for w in ('hora', 'qué', 'la')] == [2, 3, 4]
+    encoded = vectorizer.encode(["Qué hora es", "xyz", "la hora de la reunión de hoy", ""])
+    print(f"   {encoded.tolist()}")
+    # 'es' tiene índice >= num_words y pasa a <OOV>
+    assert encoded.tolist() == [[0, 3, 2, 1], [0, 0, 0, 1], [4, 1, 1, 1], [0, 0, 0, 0]]
+
+
+def test_post_padding_and_roundtrip():
+    """Relleno por detrás y vocabulario guardado en JSON"""
+    vectorizer = TextVectorizer.fit(TEXTS, max_len=3, padding='post', truncating='post')
+    encoded = vectorizer.encode(["hora", "dime la hora de la reunión"])
+    assert encoded.tolist() == [[2, 0, 0], [6, 4, 2]]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'vocab.json')
+        vectorizer.save(path)
+        loaded = TextVectorizer.load(path)
+    assert (loaded.encode(TEXTS) == vectorizer.encode(TEXTS)).all()
+    assert loaded.decode([2, 1, 0]) == 'hora'
+
+
+def test_parity_with_keras():
+    """Mismas secuencias que Tokenizer.texts_to_sequences + pad_sequences"""
+    try:
+        from tensorflow.keras.preprocessing.sequence import pad_sequences
+        from tensorflow.keras.preprocessing.text import Tokenizer
+    except ImportError:
+        print("   ⚠️ TensorFlow no instalado: se omite la comparación con Keras")
+        return
+    sys.path.insert(0, os.path.join(ROOT, 'models'))
+    from angie_lstm_trainer import AngieLSTMTrainer
+
+    sample = AngieLSTMTrainer().generate_sample_data()['user_input'].tolist()
+    rng = random.Random(7)
+    noise = sample + [' '.join(rng.choices(sample, k=3)) + rng.choice(['!', '_x', ' ¿?', '']) for _ in range(200)]
+
+    for clean in (True, False):
+        prepared = [clean_text(t) for t in sample] if clean else sample
+        tokenizer = Tokenizer(num_words=20, oov_token='<OOV>')
+        tokenizer.fit_on_texts(prepared)
+        for padding in ('pre', 'post'):
+            inputs = [clean_text(t) for t in noise] if clean else noise
+            expected = pad_sequences(tokenizer.texts_to_sequences(inputs), maxlen=6,
+                                     padding=padding, truncating=padding)
+            vectorizer = TextVectorizer.from_keras(tokenizer, 6, clean=clean, padding=padding, truncating=padding)
+            assert (vectorizer.encode(noise) == expected).all(), (clean, padding)
+    fitted = TextVectorizer.fit([clean_text(t) for t in sample], oov_token='<OOV>')
+    assert fitted.word_index == tokenizer.word_index
+    print("   ✅ Paridad con Keras")
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL VECTORIZADOR NUMPY - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_fit_and_encode()
+    test_post_padding_and_roundtrip()
+    test_parity_with_keras()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
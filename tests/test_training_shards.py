@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de los Fragmentos de Entrenamiento - Angie Advanced
+=======================================================
+
+Este script prueba la canalización de datos por streaming sobre una base de datos temporal.
+
+Funcionalidades probadas:
+- Lectura de interactions por trozos y codificación en paralelo a fragmentos en disco
+- Reutilización de los fragmentos y codificación solo de las filas nuevas
+- Vocabulario guardado reutilizado: palabras nuevas a cubos OOV sin invalidar los fragmentos
+- Lotes por longitud con relleno dinámico, sin perder ni repetir ejemplos
+- Separación estable entre entrenamiento y validación
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from database import get_database
+from interaction_logger import INSERT_INTERACTION
+from text_vectorizer import TextVectorizer
+from training_shards import ShardCache, bucketed_batches
+
+COMMANDS = [("qué hora es", "time"), ("dime el clima de hoy en madrid por favor", "weather"),
+            ("pon música", "music"), ("reproduce la lista de canciones favoritas de la semana pasada", "music")]
+
+
+def fill(db, count, start=0):
+    rows = [(COMMANDS[i % 4][0] + f" {i}", "ok", COMMANDS[i % 4][1], 0.5, "2025-01-01 10:00:00")
+            for i in range(start, start + count)]
+    db.executemany(INSERT_INTERACTION, rows)
+
+
+def test_build_and_extend_shards():
+    """Los fragmentos se escriben por trozos y luego solo se añaden las filas nuevas"""
+    print("📦 Probando fragmentos de entrenamiento...")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        fill(db, 250)
+        vectorizer = TextVectorizer.fit([c for c, _ in COMMANDS], max_len=10, clean=True, oov_buckets=8)
+        classes = ['music', 'time', 'weather']
+        cache = ShardCache(os.path.join(tmp, 'cache'))
+        assert cache.build(db, vectorizer, classes, chunk_size=100, workers=2) == 250
+        assert len(cache.manifest['shards']) == 3
+
+        fill(db, 30, start=250)
+        cache = ShardCache(os.path.join(tmp, 'cache'))
+        assert cache.build(db, vectorizer, classes, chunk_size=100, workers=0) == 30
+        assert cache.rows == 280 and cache.manifest['last_id'] == 280
+        assert cache.manifest['label_counts'] == {'time': 70, 'weather': 70, 'music': 140}
+
+        train = list(cache.iter_examples('train'))
+        val = list(cache.iter_examples('val'))
+        print(f"   {len(train)} de entrenamiento, {len(val)} de validación")
+        assert len(train) + len(val) == 280 and len(val) == 56
+        db.close()
+
+
+def test_saved_vocabulary_keeps_shards():
+    """Con el vocabulario guardado la huella no cambia aunque lleguen palabras nuevas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(os.path.join(tmp, 'angie.db'))
+        fill(db, 100)
+        classes = ['music', 'time', 'weather']
+        vocab_path = os.path.join(tmp, 'modelo_vocab.json')
+        TextVectorizer.fit([c for c, _ in COMMANDS], max_len=10, clean=True, oov_buckets=8).save(vocab_path)
+        cache = ShardCache(os.path.join(tmp, 'cache'))
+        assert cache.build(db, TextVectorizer.load(vocab_path), classes, chunk_size=50, workers=0) == 100
+
+        db.executemany(INSERT_INTERACTION, [("abre el navegador", "ok", "time", 0.5, "2025-01-02 10:00:00")])
+        vectorizer = TextVectorizer.load(vocab_path)
+        cache = ShardCache(os.path.join(tmp, 'cache'))
+        assert cache.build(db, vectorizer, classes, chunk_size=50, workers=0) == 1
+        assert cache.rows == 101
+        assert (vectorizer.encode(["navegador"])[0, -1:] >= vectorizer.bucket_base).all()
+        db.close()
+
+
+def test_bucketed_batches():
+    """Cada ejemplo sale una vez, en lotes rellenos por delante solo hasta su cubo"""
+    examples = [([1] * (i % 12 + 1), i) for i in range(500)]
+    seen = []
+    for X, y in bucketed_batches(iter(examples), batch_size=16, boundaries=(4, 8), shuffle_buffer=50, seed=1):
+        lengths = (X > 0).sum(axis=1)
+        assert X.shape[1] == lengths.max()
+        assert (X[:, -1] == 1).all()
+        # Mismo cubo dentro de un lote
+        assert len({0 if l <= 4 else 1 if l <= 8 else 2 for l in lengths}) == 1
+        seen.extend(y.tolist())
+    assert sorted(seen) == list(range(500))
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE FRAGMENTOS DE ENTRENAMIENTO - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_build_and_extend_shards()
+    test_saved_vocabulary_keeps_shards()
+    test_bucketed_batches()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
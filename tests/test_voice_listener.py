@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la Escucha Continua - Angie Advanced
+===========================================
+
+Este script prueba PersistentListener con un reconocedor y un micrófono falsos.
+
+Funcionalidades probadas:
+- Calibración única al abrir el micrófono
+- Reajuste del umbral cuando el ruido deriva, sin leer de nuevo el micrófono
+- Energía RMS en NumPy (sin audioop)
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import speech_recognition as sr
+
+from voice_listener import PersistentListener, rms
+
+RATE = 16000
+
+
+def noise(level, seconds=1.0, seed=0):
+    """Audio de 16 bits con ruido de amplitud RMS aproximada level"""
+    rng = np.random.default_rng(seed)
+    samples = rng.normal(0, level, int(RATE * seconds)).clip(-32768, 32767).astype('<i2')
+    return sr.AudioData(samples.tobytes(), RATE, 2)
+
+
+class FakeRecognizer:
+    """Devuelve las frases preparadas; adjust_for_ambient_noise solo cuenta llamadas"""
+
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        self.energy_threshold = 300
+        self.dynamic_energy_ratio = 1.5
+        self.pause_threshold = 0.8
+        self.adjust_calls = 0
+
+    def adjust_for_ambient_noise(self, source, duration=1):
+        self.adjust_calls += 1
+        self.energy_threshold = 100 * self.dynamic_energy_ratio
+
+    def listen(self, source, timeout=None, phrase_time_limit=None):
+        return self.phrases.pop(0)
+
+
+def make_listener(phrases):
+    listener = PersistentListener(FakeRecognizer(phrases), smoothing=1.0)
+    # Micrófono falso: open() no crea sr.Microphone si ya hay source
+    listener.source = object()
+    return listener
+
+
+def test_rms_matches_formula():
+    """RMS de enteros con signo de 1, 2, 3 y 4 bytes"""
+    values = np.array([0, 1000, -1000, 3000, -3000], dtype=np.int64)
+    expected = int(np.sqrt(np.mean(values.astype(float) ** 2)))
+    assert rms(values.astype('<i2').tobytes(), 2) == expected
+    assert rms(values.astype('<i4').tobytes(), 4) == expected
+    assert rms(values.astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3].tobytes(), 3) == expected
+    assert rms(np.array([0, 100, -100], dtype=np.int8).tobytes(), 1) == 81
+    assert rms(b'', 2) == 0
+
+
+def test_calibrates_once_and_tracks_drift():
+    """El ruido estable no recalibra; el cambio de ruido reajusta el umbral sin leer audio"""
+    print("🎙️ Probando deriva del ruido...")
+    listener = make_listener([noise(100), noise(110, seed=1), noise(800, seed=2)])
+    listener.listen()
+    listener.listen()
+    assert listener.recognizer.adjust_calls == 1
+    assert listener.recalibrations == 0
+
+    listener.listen()
+    print(f"   umbral tras la deriva: {listener.recognizer.energy_threshold:.0f}")
+    assert listener.recognizer.adjust_calls == 1
+    assert listener.recalibrations == 1
+    assert 1000 < listener.recognizer.energy_threshold < 1400
+    assert not listener.needs_calibration
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE ESCUCHA CONTINUA - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_rms_matches_formula()
+    test_calibrates_once_and_tracks_drift()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
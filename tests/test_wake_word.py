@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Detector de Palabra de Activación - Angie Advanced
+==========================================================
+
+Este script prueba el detector local (sin conexión) con los audios de
+tests/fixtures/wake_word (generados por generate_fixtures.py).
+
+Funcionalidades probadas:
+- Detección de voz por energía
+- Enrolamiento de plantillas y umbral calibrado
+- Aceptación de la palabra de activación (sola y seguida de un comando)
+- Rechazo de otras frases y de ruido ambiente
+- Guardado y carga de plantillas
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import tempfile
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from wake_word import WakeWordDetector, audio_to_samples, speech_bounds
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'wake_word')
+
+
+def load_fixture(name):
+    """Leer un WAV de fixtures como (muestras, frecuencia de muestreo)"""
+    with wave.open(os.path.join(FIXTURES, f'{name}.wav'), 'rb') as wav:
+        frames = wav.readframes(wav.getnframes())
+        return audio_to_samples(frames, wav.getsampwidth()), wav.getframerate()
+
+
+def enrolled_detector():
+    detector = WakeWordDetector()
+    detector.enroll(*load_fixture('wake_1'))
+    detector.enroll(*load_fixture('wake_2'))
+    return detector
+
+
+def test_voice_activity():
+    """La VAD encuentra voz en las frases y nada en el ruido"""
+    print("🔊 Probando detección de voz por energía...")
+    assert speech_bounds(*load_fixture('wake_1')) is not None
+    assert speech_bounds(*load_fixture('silence')) is None
+
+
+def test_accepts_wake_word():
+    """La palabra de activación se acepta, también seguida de un comando"""
+    detector = enrolled_detector()
+    for name in ('wake_3', 'wake_command'):
+        score = detector.score(*load_fixture(name))
+        print(f"   {name}: distancia {score:.2f} (umbral {detector.threshold:.2f})")
+        assert detector.detect(*load_fixture(name))
+
+
+def test_rejects_other_speech():
+    """Otras frases y el ruido no llegan al reconocedor"""
+    detector = enrolled_detector()
+    for name in ('other_1', 'other_2', 'silence'):
+        assert not detector.detect(*load_fixture(name))
+    assert detector.rejections == 3
+
+
+def test_without_templates_passes_everything():
+    """Sin plantillas el detector no filtra (comportamiento anterior)"""
+    detector = WakeWordDetector()
+    assert detector.detect(*load_fixture('other_1'))
+
+
+def test_save_and_load():
+    """Las plantillas se guardan y cargan desde .npz"""
+    detector = enrolled_detector()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'plantillas.npz')
+        detector.save(path)
+        loaded = WakeWordDetector(path)
+        assert len(loaded.templates) == 2
+        assert abs(loaded.threshold - detector.threshold) < 1e-9
+        assert loaded.detect(*load_fixture('wake_3'))
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DEL DETECTOR DE PALABRA DE ACTIVACIÓN")
+    print("=" * 60)
+
+    test_voice_activity()
+    test_accepts_wake_word()
+    test_rejects_other_speech()
+    test_without_templates_passes_everything()
+    test_save_and_load()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la Caché del Clima - Angie Advanced
+==========================================
+
+Este script prueba la caché del clima con una función de consulta falsa.
+
+Funcionalidades probadas:
+- Alias de consultas que comparten la misma ubicación canónica
+- TTL y refresco en segundo plano (stale-while-revalidate)
+- Los errores de la API no se guardan en caché
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from weather_cache import WeatherCache, WeatherError
+
+
+class FakeWeatherAPI:
+    """Responde como WeatherAPI para Madrid y falla con cualquier otra ciudad"""
+
+    def __init__(self):
+        self.calls = []
+        self.temp = 20
+
+    def __call__(self, query):
+        self.calls.append(query)
+        if 'madrid' not in query.lower():
+            raise WeatherError('No matching location found.')
+        return {
+            'location': {'name': 'Madrid', 'region': 'Madrid', 'country': 'Spain'},
+            'current': {'temp_c': self.temp},
+        }
+
+
+def test_aliases_share_entry():
+    """Variantes de la misma ciudad usan una sola entrada"""
+    print("🌤️ Probando alias de ciudades...")
+    api = FakeWeatherAPI()
+    cache = WeatherCache(api, ttl=60)
+    cache.get('madrid españa')
+    for query in ('madrid', 'Madrid ', 'MADRID', 'madrid españa'):
+        assert cache.get(query)['location']['name'] == 'Madrid'
+    assert api.calls == ['madrid españa']
+    assert cache.stats()['locations'] == 1
+    print(f"   Estadísticas: {cache.stats()}")
+
+
+def test_stale_while_revalidate():
+    """Pasado el TTL se sirve el dato viejo y se refresca en segundo plano"""
+    api = FakeWeatherAPI()
+    cache = WeatherCache(api, ttl=0.05, stale_ttl=10)
+    assert cache.get('madrid')['current']['temp_c'] == 20
+    api.temp = 25
+    time.sleep(0.1)
+    assert cache.get('madrid')['current']['temp_c'] == 20
+    deadline = time.time() + 2
+    while cache.refreshes == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get('madrid')['current']['temp_c'] == 25
+    assert cache.stale_hits == 1
+
+
+def test_errors_not_cached():
+    """Una ciudad inexistente vuelve a consultarse"""
+    api = FakeWeatherAPI()
+    cache = WeatherCache(api)
+    for _ in range(2):
+        try:
+            cache.get('atlantis')
+            assert False, "se esperaba WeatherError"
+        except WeatherError:
+            pass
+    assert len(api.calls) == 2
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE LA CACHÉ DEL CLIMA - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_aliases_share_entry()
+    test_stale_while_revalidate()
+    test_errors_not_cached()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la Búsqueda en Wikipedia - Angie Advanced
+================================================
+
+Este script prueba la búsqueda en Wikipedia con respuestas grabadas de la API
+(tests/fixtures/wikipedia), sin conexión.
+
+Funcionalidades probadas:
+- Resumen y URL del primer resultado en una sola petición
+- Opciones de páginas de desambiguación con una segunda petición solo si hace falta
+- Caché en disco con TTL (corto para los "no encontrado")
+
+Autor: Asistente IA
+Fecha: 2025
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from wiki_lookup import WikiLookup
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'wikipedia')
+
+
+class RecordedResponse:
+    def __init__(self, data):
+        self.status_code = 200
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class RecordedWikipedia:
+    """Devuelve la respuesta grabada según la búsqueda; registra cada petición"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, **kwargs):
+        if 'titles' in params:
+            # Segunda petición: enlaces de una página de desambiguación
+            self.requests.append(('links', params['titles']))
+            name = f"{params['titles'].lower()}_links"
+        else:
+            assert 'links' not in params['prop']
+            self.requests.append(params['gsrsearch'])
+            name = {'python': 'python', 'mercurio': 'mercurio'}.get(params['gsrsearch'].lower().strip(),
+                                                                  'sin_resultados')
+        with open(os.path.join(FIXTURES, f'{name}.json'), encoding='utf-8') as f:
+            return RecordedResponse(json.load(f))
+
+
+def test_single_request_lookup():
+    """El resultado principal llega con resumen y URL en una sola petición"""
+    print("📖 Probando búsqueda en Wikipedia...")
+    api = RecordedWikipedia()
+    with tempfile.TemporaryDirectory() as tmp:
+        wiki = WikiLookup(api, os.path.join(tmp, 'wiki.db'))
+        result = wiki.lookup('python')
+        print(f"   {result['title']}: {result['summary'][:60]}...")
+        assert result['status'] == 'ok'
+        assert result['title'] == 'Python'
+        assert result['url'] == 'https://es.wikipedia.org/wiki/Python'
+        assert len(api.requests) == 1
+        assert wiki.lookup('sin resultados')['status'] == 'not_found'
+        wiki.close()
+
+
+def test_disambiguation_options():
+    """Las páginas de desambiguación devuelven hasta 5 opciones"""
+    with tempfile.TemporaryDirectory() as tmp:
+        api = RecordedWikipedia()
+        wiki = WikiLookup(api, os.path.join(tmp, 'wiki.db'))
+        result = wiki.lookup('mercurio')
+        assert result['status'] == 'disambiguation'
+        assert result['options'][:2] == ['Mercurio (elemento)', 'Mercurio (planeta)']
+        assert len(result['options']) == 5
+        # Los enlaces solo se piden para la página de desambiguación
+        assert api.requests == ['mercurio', ('links', 'Mercurio')]
+        wiki.close()
+
+
+def test_cache_and_ttl():
+    """Las consultas repetidas se responden desde disco hasta que caduca el TTL"""
+    api = RecordedWikipedia()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wiki.db')
+        wiki = WikiLookup(api, path)
+        first = wiki.lookup('Mercurio')
+        wiki.close()
+
+        reopened = WikiLookup(api, path)
+        assert reopened.lookup('mercurio ') == first
+        assert len(api.requests) == 2
+        reopened.close()
+
+        expired = WikiLookup(api, path, ttl_hours=0)
+        expired.lookup('mercurio')
+        assert len(api.requests) == 4
+        expired.close()
+
+
+def test_not_found_short_ttl():
+    """Los "no encontrado" caducan pronto aunque el TTL general sea largo"""
+    api = RecordedWikipedia()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wiki.db')
+        wiki = WikiLookup(api, path)
+        wiki.lookup('sin resultados')
+        wiki.lookup('sin resultados')
+        assert len(api.requests) == 1
+        wiki.close()
+
+        short = WikiLookup(api, path, not_found_ttl_minutes=0)
+        short.lookup('sin resultados')
+        assert len(api.requests) == 2
+        short.close()
+
+
+def main():
+    """Función principal del test"""
+    print("=" * 60)
+    print("🧪 TEST DE LA BÚSQUEDA EN WIKIPEDIA - ANGIE ADVANCED")
+    print("=" * 60)
+
+    test_single_request_lookup()
+    test_disambiguation_options()
+    test_cache_and_ttl()
+    test_not_found_short_ttl()
+
+    print("\n✅ TEST COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del enrutado de comandos
+Compara la cadena if/elif original de process_command con el IntentRouter compilado
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from intent_router import INTENT_TABLE, Intent, IntentRouter
+
+SAMPLE_COMMANDS = [
+    "reproduce despacito en spotify",
+    "qué hora es",
+    "dime el clima en barcelona",
+    "noticias de deportes",
+    "busca inteligencia artificial",
+    "crear nota lista de compras",
+    "buscar nota compras",
+    "cuántas notas tengo",
+    "captura de pantalla",
+    "información del sistema",
+    "agrega un recordatorio para mañana",
+    "agregar tarea lavar el coche",
+    "abre google.com",
+    "descansa",
+    "cuéntame un chiste",
+    "qué es python",
+]
+
+
+def legacy_route(command):
+    """Réplica de la cadena de substrings original (solo decide la intención)"""
+    if 'reproduce' in command:
+        return 'music'
+    elif "hora" in command:
+        return 'time'
+    elif "clima" in command or "tiempo" in command:
+        return 'weather'
+    elif "noticias" in command or "noticia" in command:
+        return 'news'
+    elif "busca" in command or "buscar" in command:
+        return 'search'
+    elif "crear nota" in command or "nueva nota" in command or "tomar nota" in command or "anota" in command:
+        return 'notes_create'
+    elif "ver notas" in command or "mostrar notas" in command or "mis notas" in command:
+        return 'notes_show'
+    elif "buscar nota" in command:
+        return 'notes_search'
+    elif "cuántas notas" in command or "resumen de notas" in command:
+        return 'notes_summary'
+    elif "leer notas" in command:
+        return 'notes_read'
+    elif "nota" in command:
+        return 'note'
+    elif "captura" in command or "screenshot" in command:
+        return 'screenshot'
+    elif "sistema" in command or "computadora" in command:
+        return 'system'
+    elif "recordatorio" in command or "recordar" in command:
+        return 'reminder'
+    elif "tarea" in command or "agregar tarea" in command:
+        return 'tasks'
+    elif "abre" in command or "navega" in command:
+        return 'navigation'
+    elif "descansa" in command or "adiós" in command or "bye" in command:
+        return 'goodbye'
+    elif "ayuda notas" in command or "ayuda de notas" in command:
+        return 'notes_help'
+    return None
+
+
+def bench(route, commands, rounds):
+    """Devolver comandos enrutados por segundo"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for command in commands:
+            route(command)
+    elapsed = time.perf_counter() - start
+    return (rounds * len(commands)) / elapsed
+
+
+def synthetic_intents(count, seed=42):
+    """Generar intenciones ficticias para simular el crecimiento de la tabla"""
+    rng = random.Random(seed)
+    intents = []
+    for i in range(count):
+        keyword = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+        intents.append(Intent(f'extra_{i}', 'chat', [keyword], 10))
+    return intents
+
+
+def bench_growth(commands, rounds):
+    """Comparar cómo escala cada enfoque al añadir intenciones"""
+    print("\n📈 Escalado al crecer la tabla de intenciones")
+    print(f"{'palabras clave':>15} | {'cadena in':>14} | {'router':>14}")
+    for extra in (0, 100, 1000):
+        router = IntentRouter(INTENT_TABLE + synthetic_intents(extra))
+        keywords = list(router._owners)
+
+        def chain(command, keywords=keywords):
+            # Equivalente a una cadena if/elif con una prueba "in" por palabra clave
+            for keyword in keywords:
+                if keyword in command:
+                    return keyword
+            return None
+
+        chain_rate = bench(chain, commands, rounds)
+        router_rate = bench(router.route, commands, rounds)
+        print(f"{len(keywords):>15} | {chain_rate:>12,.0f}/s | {router_rate:>12,.0f}/s")
+
+
+def main(rounds=20000):
+    """Función principal"""
+    router = IntentRouter()
+    print("⏱️  Benchmark de enrutado de comandos")
+    print("=" * 50)
+    print(f"📋 {len(SAMPLE_COMMANDS)} comandos x {rounds} rondas")
+
+    legacy_rate = bench(legacy_route, SAMPLE_COMMANDS, rounds)
+    router_rate = bench(router.route, SAMPLE_COMMANDS, rounds)
+
+    print(f"🐢 Cadena if/elif:   {legacy_rate:,.0f} comandos/s")
+    print(f"🚀 Router compilado: {router_rate:,.0f} comandos/s")
+    print(f"📊 Relación: {router_rate / legacy_rate:.2f}x")
+
+    # Peor caso de la cadena: comandos que caen hasta Gemini recorren todas las ramas
+    misses = [c for c in SAMPLE_COMMANDS if legacy_route(c) is None]
+    if misses:
+        print(f"\n🔎 Comandos sin palabra clave (recorren toda la cadena): {len(misses)}")
+        print(f"🐢 Cadena if/elif:   {bench(legacy_route, misses, rounds):,.0f} comandos/s")
+        print(f"🚀 Router compilado: {bench(router.route, misses, rounds):,.0f} comandos/s")
+
+    bench_growth(SAMPLE_COMMANDS, max(1, rounds // 20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark del clasificador de comandos: Keras frente a TensorFlow Lite
+Mide tiempo de importación, memoria residente máxima y latencia por llamada,
+cada camino en un proceso nuevo para que no se contaminen
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'models'))
+
+COMMANDS = [
+    "qué hora es",
+    "dime el clima en madrid",
+    "busca información sobre python",
+    "reproduce música de queen",
+    "toma una nota para mañana",
+    "muestra mis tareas pendientes",
+]
+
+
+def max_rss_mb():
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def measure_calls(predict, calls):
+    predict(COMMANDS[0])
+    start = time.perf_counter()
+    for i in range(calls):
+        predict(COMMANDS[i % len(COMMANDS)])
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def child(mode, model, calls):
+    """Un camino de inferencia completo en este proceso; imprime el resultado en JSON"""
+    start = time.perf_counter()
+    if mode == 'lite':
+        from lite_predictor import LiteBackend
+        import_s = time.perf_counter() - start
+        backend = LiteBackend(model)
+        backend.load()
+        predict = backend.predict_command_type
+    else:
+        from angie_lstm_trainer import AngieLSTMTrainer
+        import_s = time.perf_counter() - start
+        trainer = AngieLSTMTrainer()
+        if not trainer.load_model(model):
+            raise SystemExit(1)
+        if mode == 'keras':
+            predict = trainer.predict_command_type
+        else:
+            def predict(text):
+                return trainer.model.predict_on_batch(trainer.encode_texts([text]))
+    load_s = time.perf_counter() - start - import_s
+    ms = measure_calls(predict, calls)
+    print(json.dumps({'import_s': import_s, 'load_s': load_s, 'ms_per_call': ms, 'rss_mb': max_rss_mb()}))
+
+
+def run_child(mode, model, calls):
+    result = subprocess.run([sys.executable, __file__, '--child', mode, '--model', model, '--calls', str(calls)],
+                            capture_output=True, text=True)
+    lines = [l for l in result.stdout.splitlines() if l.startswith('{')]
+    if result.returncode != 0 or not lines:
+        print(f"   ❌ {mode}: {result.stderr.strip().splitlines()[-1:] or 'sin salida'}")
+        return None
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default=os.path.join(ROOT, 'angie_lstm_model'),
+                        help='prefijo de los archivos del modelo (sin extensión)')
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--child', choices=['keras', 'keras_batch', 'lite'])
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.model, args.calls)
+        return
+
+    if not os.path.exists(f'{args.model}.h5'):
+        print(f"❌ No existe {args.model}.h5; entrena primero con models/run_lstm_training.py")
+        return
+
+    labels = {
+        'keras': 'Keras model.predict',
+        'keras_batch': 'Keras predict_on_batch',
+        'lite': 'TensorFlow Lite',
+    }
+    print(f"{'Camino':<24}{'Import (s)':>12}{'Carga (s)':>12}{'ms/llamada':>12}{'RSS (MB)':>10}")
+    for mode, label in labels.items():
+        if mode == 'lite' and not os.path.exists(f'{args.model}.tflite'):
+            print(f"{label:<24}  sin {args.model}.tflite (AngieLSTMTrainer.export_tflite)")
+            continue
+        r = run_child(mode, args.model, args.calls)
+        if r:
+            print(f"{label:<24}{r['import_s']:>12.2f}{r['load_s']:>12.2f}{r['ms_per_call']:>12.2f}{r['rss_mb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la búsqueda de notas
+Compara LIKE '%x%' sobre la tabla notes con el índice FTS5 sobre notas sintéticas
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from notes_index import ensure_notes_fts, search_notes
+
+WORDS = ("compras leche pan huevos proyecto reunión cliente informe médico cita análisis "
+         "receta cocina horno viaje vuelo hotel maleta estudio examen matemáticas libro "
+         "película música concierto gimnasio correr bicicleta factura banco pago coche "
+         "taller jardín plantas regar cumpleaños regalo fiesta llamada mamá trabajo").split()
+
+QUERIES = ["compras", "médico", "medico", "proyecto cliente", "cumpleaños regalo", "xilófono"]
+
+
+def synthetic_vocabulary(rng, size=5000):
+    """Palabras inventadas a partir de sílabas, como relleno con frecuencia de Zipf"""
+    syllables = ['ba', 'ca', 'de', 'fi', 'go', 'lu', 'ma', 'ne', 'po', 'ra', 'si', 'to', 'ven', 'dor', 'cia']
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choices(syllables, k=rng.randint(2, 4))))
+    words = sorted(words)
+    weights = [1.0 / rank for rank in range(1, len(words) + 1)]
+    return words, weights
+
+
+def create_notes(conn, count, seed=42):
+    """Tabla notes como la de Angie con count notas aleatorias"""
+    rng = random.Random(seed)
+    filler, weights = synthetic_vocabulary(rng)
+    conn.execute('''
+        CREATE TABLE notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_date TEXT DEFAULT CURRENT_TIMESTAMP,
+            modified_date TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    def note():
+        # Cada nota trata de 1-2 temas reconocibles rodeados de texto de relleno
+        topics = rng.sample(WORDS, rng.randint(1, 2))
+        body = rng.choices(filler, weights, k=rng.randint(15, 60)) + rng.sample(WORDS, 2)
+        rng.shuffle(body)
+        return ' '.join(topics).capitalize(), ' '.join(body)
+
+    conn.executemany('INSERT INTO notes (title, content) VALUES (?, ?)', (note() for _ in range(count)))
+    conn.commit()
+
+
+def like_search(conn, term):
+    return conn.execute('''
+        SELECT id, title, content, created_date, modified_date
+        FROM notes
+        WHERE title LIKE ? OR content LIKE ?
+        ORDER BY modified_date DESC
+    ''', (f'%{term}%', f'%{term}%')).fetchall()
+
+
+def bench(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"   {label:<6} {elapsed * 1000:9.2f} ms  ({len(rows)} filas)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--notes', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'))
+        print(f"📝 Creando {args.notes} notas sintéticas...")
+        create_notes(conn, args.notes)
+
+        start = time.perf_counter()
+        ensure_notes_fts(conn)
+        print(f"🗂️  Índice FTS5 construido en {time.perf_counter() - start:.2f} s")
+
+        for query in QUERIES:
+            print(f"\n🔍 '{query}'")
+            # LIKE devuelve todas las coincidencias; FTS las 20 más relevantes, como en Angie
+            like = bench('LIKE', lambda: like_search(conn, query), args.repeat)
+            fts = bench('FTS5', lambda: search_notes(conn, query), args.repeat)
+            print(f"   → {like / fts:.1f}x más rápido con FTS5" if fts else "")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
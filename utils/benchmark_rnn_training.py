@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark del entrenamiento del RNN de respuestas: objetivos one-hot frente a enteros
+Genera un historial sintético en CSV y mide memoria residente máxima, tiempo total
+y tiempo por época, cada camino en un proceso nuevo para que no se contaminen
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'models'))
+
+
+def max_rss_mb():
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def write_history(path, rows, vocabulary=3000, seed=0):
+    """CSV con el formato de historial_comandos.csv (fecha, comando, respuesta)"""
+    rng = random.Random(seed)
+    words = [f'palabra{i}' for i in range(vocabulary)]
+    # Frecuencias tipo Zipf: pocas palabras muy comunes y una cola larga
+    weights = [1 / (i + 1) for i in range(vocabulary)]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        for _ in range(rows):
+            command = ' '.join(rng.choices(words, weights, k=rng.randint(2, 8)))
+            response = ' '.join(rng.choices(words, weights, k=rng.randint(4, 20)))
+            writer.writerow(['2025-01-01 10:00:00', command, response])
+
+
+def history_source(rnn, history):
+    """Entradas del CSV sintético (sin diario JSON Lines)"""
+    journal = os.path.join(os.path.dirname(os.path.abspath(history)), 'sin_diario.jsonl')
+    return lambda: rnn.entries(journal, history)
+
+
+def epoch_timer():
+    from tensorflow.keras.callbacks import Callback
+
+    class EpochTimer(Callback):
+        def on_train_begin(self, logs=None):
+            self.times = []
+
+        def on_epoch_begin(self, epoch, logs=None):
+            self._start = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            self.times.append(time.perf_counter() - self._start)
+
+    return EpochTimer()
+
+
+def dense_fit(rnn, history, epochs):
+    """Camino anterior: todo el historial en memoria y objetivos one-hot N×maxlen×num_palabras"""
+    import numpy as np
+    from sklearn.model_selection import train_test_split
+    from tensorflow.keras.utils import to_categorical
+
+    source = history_source(rnn, history)
+    _, vectorizer = rnn.fit_vectorizer(source())
+    parts = [(vectorizer.encode([e['command'] for e in b]), vectorizer.encode([e['response'] for e in b]))
+             for b in rnn.iter_batches(source())]
+    X = np.concatenate([p[0] for p in parts])
+    y = to_categorical(np.concatenate([p[1] for p in parts]), num_classes=rnn.num_palabras)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    model = rnn.build_model()
+    model.compile(loss='categorical_crossentropy', optimizer='adam', metrics=['accuracy'])
+    timer = epoch_timer()
+    model.fit(X_train, y_train, epochs=epochs, batch_size=rnn.batch_size,
+              validation_data=(X_test, y_test), verbose=0, callbacks=[timer])
+    return timer.times
+
+
+def sparse_fit(rnn, history, epochs):
+    """Camino nuevo: historial en streaming, objetivos enteros y relleno enmascarado"""
+    source = history_source(rnn, history)
+    _, vectorizer = rnn.fit_vectorizer(source())
+    model = rnn.build_model()
+    timer = epoch_timer()
+    model.fit(rnn.make_dataset(source, vectorizer, 'train'), epochs=epochs,
+              validation_data=rnn.make_dataset(source, vectorizer, 'val'), verbose=0, callbacks=[timer])
+    return timer.times
+
+
+def child(mode, history, epochs):
+    """Un camino de entrenamiento completo en este proceso; imprime el resultado en JSON"""
+    import entrenar_rnn as rnn
+    start = time.perf_counter()
+    epoch_s = (dense_fit if mode == 'dense' else sparse_fit)(rnn, history, epochs)
+    print(json.dumps({'total_s': time.perf_counter() - start, 'epoch_s': sum(epoch_s) / len(epoch_s),
+                      'rss_mb': max_rss_mb()}))
+
+
+def run_child(mode, history, epochs):
+    result = subprocess.run([sys.executable, __file__, '--child', mode, '--history', history,
+                             '--epochs', str(epochs)], capture_output=True, text=True)
+    lines = [l for l in result.stdout.splitlines() if l.startswith('{')]
+    if result.returncode != 0 or not lines:
+        # Con historiales grandes el camino one-hot suele acabar por falta de memoria (código -9)
+        reason = result.stderr.strip().splitlines()[-1:] or [f'código de salida {result.returncode}']
+        print(f"   ❌ {mode}: {reason[0]}")
+        return None
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000, help='filas del historial sintético')
+    parser.add_argument('--epochs', type=int, default=1)
+    parser.add_argument('--history', help='CSV de historial ya generado')
+    parser.add_argument('--child', choices=['dense', 'sparse'])
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.history, args.epochs)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = args.history or os.path.join(tmp, 'historial_comandos.csv')
+        if not args.history:
+            print(f"📝 Generando historial sintético de {args.rows} filas...")
+            write_history(history, args.rows)
+
+        import entrenar_rnn as rnn
+        one_hot_gb = args.rows * rnn.maxlen * rnn.num_palabras * 4 / 1024 ** 3
+        print(f"   Objetivos one-hot en memoria: {one_hot_gb:.1f} GB; enteros por lote: "
+              f"{rnn.batch_size * rnn.maxlen * 8 / 1024:.1f} KB")
+
+        labels = {'dense': 'One-hot (anterior)', 'sparse': 'Enteros + streaming'}
+        print(f"{'Camino':<24}{'Total (s)':>12}{'s/época':>12}{'RSS (MB)':>10}")
+        for mode, label in labels.items():
+            r = run_child(mode, history, args.epochs)
+            if r:
+                print(f"{label:<24}{r['total_s']:>12.2f}{r['epoch_s']:>12.1f}{r['rss_mb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
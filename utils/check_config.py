@@ -10,8 +10,12 @@ Uso: python check_config.py
 """
 
 import os
+import sys
 from dotenv import load_dotenv
-import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from http_client import get_http_client
 
 def check_configuration():
     """Verificar la configuración de API keys"""
@@ -38,12 +42,14 @@ def check_configuration():
     
     # Verificar API keys
     apis_status = {}
+    http = get_http_client()
     
     # NewsAPI
     news_api_key = os.getenv("NEWS_API_KEY")
     if news_api_key and news_api_key != "tu_news_api_key_aqui":
         try:
-            response = requests.get(f"https://newsapi.org/v2/top-headlines?country=es&apiKey={news_api_key}", timeout=5)
+            response = http.get("https://newsapi.org/v2/top-headlines",
+                                params={'country': 'es', 'apiKey': news_api_key}, timeout=(3.05, 5))
             if response.status_code == 200:
                 apis_status["NewsAPI"] = {"status": "✅", "message": "Configurada correctamente"}
             elif response.status_code == 401:
@@ -66,7 +72,8 @@ def check_configuration():
     weather_api_key = os.getenv("WEATHER_API_KEY")
     if weather_api_key and weather_api_key != "tu_weather_api_key_aqui":
         try:
-            response = requests.get(f"http://api.weatherapi.com/v1/current.json?key={weather_api_key}&q=Madrid", timeout=5)
+            response = http.get("http://api.weatherapi.com/v1/current.json",
+                                params={'key': weather_api_key, 'q': 'Madrid'}, timeout=(3.05, 5))
             if response.status_code == 200:
                 apis_status["WeatherAPI"] = {"status": "✅", "message": "Configurada correctamente"}
             elif response.status_code == 401:
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Grabar plantillas de la palabra de activación para el detector local
+Guarda las plantillas en data/wake_word_templates.npz
+"""
+
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+import speech_recognition as sr
+
+from wake_word import WakeWordDetector, audio_to_samples
+
+TEMPLATES_PATH = os.path.join(project_root, 'data', 'wake_word_templates.npz')
+
+
+def enroll(word='asistente', samples=3):
+    """Grabar varias repeticiones de la palabra y guardar las plantillas"""
+    print(f"🎤 Enrolamiento de la palabra de activación: '{word}'")
+    print(f"📝 Di '{word}' {samples} veces, una por grabación")
+    print("-" * 50)
+
+    recognizer = sr.Recognizer()
+    detector = WakeWordDetector()
+
+    with sr.Microphone() as source:
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        recorded = 0
+        while recorded < samples:
+            print(f"👂 Grabación {recorded + 1}/{samples}...")
+            try:
+                audio = recognizer.listen(source, timeout=5, phrase_time_limit=2)
+                detector.enroll(audio_to_samples(audio.frame_data, audio.sample_width),
+                                audio.sample_rate)
+                recorded += 1
+                print("✅ Plantilla guardada")
+            except sr.WaitTimeoutError:
+                print("❌ No se detectó voz, intenta de nuevo")
+            except ValueError as e:
+                print(f"❌ {e}")
+
+    detector.save(TEMPLATES_PATH)
+    print(f"\n💾 Plantillas guardadas en: {TEMPLATES_PATH}")
+    print(f"🎯 Umbral calibrado: {detector.threshold:.2f}")
+
+
+if __name__ == "__main__":
+    enroll()